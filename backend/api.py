@@ -1,36 +1,95 @@
 """FastAPI backend for SafeRx - AI Medication Interaction Review."""
 
+import asyncio
 import json
 import os
 import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Literal
 
+import numpy as np
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import StreamingResponse
 
-from src.database import init_db, get_db
+from src.database import (
+    init_db, get_db, write_transaction, request_db_scope, close_pool,
+    get_pool_stats, get_storage_stats,
+)
 from src.models import (
     Patient, PatientMedication, PatientSummary,
     PrescriptionCreate, Prescription, PrescriptionStatus,
+    BulkCheckMode, BulkPrescriptionCreate, BulkPrescriptionResult, BulkPrescriptionResponse,
     InteractionCheckResult, InteractionFound, MaskingComparison,
-    RawPayload, MaskedPayload,
-    ReviewCreate, PharmacistReview, QueueItem, ReviewDecision,
-    AnalyticsSummary, ThresholdSimulationResult, ThresholdSimulationResponse,
-    CostBreakdown, ROIAnalysis, CostProjection, DataSources, CostROIResponse,
+    RawPayload, MaskedPayload, CheckJob,
+    ReviewCreate, PharmacistReview, QueueItem, QueueItemSummary, ReviewDecision,
+    AnalyticsSummary, AnalyticsTimeseriesResponse, RollupGranularity, ExportFormat,
+    ReviewSearchResponse, SearchSource,
+    ThresholdSimulationResult, ThresholdSimulationResponse,
+    ThresholdSweepCell, ThresholdSweepResponse, RiskLevel,
+    CostBreakdown, ROIAnalysis, CostProjection, DataSources, PromptCacheCost,
+    CostROIResponse,
 )
-from src.masking import mask_patient_data
-from src.interaction_checker import check_interactions
-from src.router import route_prescription
-from src.audit import log_decision, update_audit_with_review, get_audit_log, get_audit_count, export_audit_csv
+from src.masking import MASKED_FIELDS, mask_patient_data, log_masking_event
+from src.interaction_checker import check_interactions_async
+from src.router import route_prescription, AUTO_APPROVE_CONFIDENCE_THRESHOLD, AUTO_APPROVE_MAX_RISK_LEVEL
+from src.analytics import bucket_count, summary_metrics, timeseries_metrics
+from src.constants import RISK_ORDER
+from src.audit import MAX_AUDIT_PAGE_SIZE, log_decision, update_audit_with_review, get_audit_log, get_audit_page, get_audit_count, gzip_chunks, iter_audit_columnar, iter_audit_csv
 from src.feedback import save_review, get_review_for_check
+from src.search import search_reviews
+from src.review_queue import DEFAULT_PAGE_SIZE, count_review_queue, load_review_queue_page, load_queue_item
+from src.llm_client import close_clients, get_connection_stats, get_usage_stats
+from src.result_cache import get_cache_stats
+from src.event_writer import get_event_writer_stats, start_event_writer, stop_event_writer
+from src.jobs import CheckJobQueue
+from src.historical import get_historical_dataset
 
 load_dotenv()
 
+# Max interaction checks run concurrently for one bulk submission
+BULK_CHECK_PARALLELISM = int(os.getenv("BULK_CHECK_PARALLELISM", "8"))
+
+# Max thresholds in one /api/analytics/threshold-sweep request
+MAX_SWEEP_THRESHOLDS = 10001
+
+# Max buckets in one /api/analytics/timeseries response (a leap year of hours fits)
+MAX_TIMESERIES_BUCKETS = 10000
+
+# Max hits in one /api/search response
+MAX_SEARCH_RESULTS = 100
+
+# Media type and file extension per /api/audit/export format
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: ("text/csv", "csv"),
+    ExportFormat.PARQUET: ("application/vnd.apache.parquet", "parquet"),
+    ExportFormat.ARROW: ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    start_event_writer()
+    await check_jobs.start()
+    yield
+    await check_jobs.stop()
+    # Write the audit and masking events still queued
+    stop_event_writer()
+    # Release pooled keep-alive connections to the Anthropic API
+    await close_clients()
+    close_pool()
+
+
 app = FastAPI(
     title="SafeRx - AI Medication Interaction Review",
     description="AI-powered medication interaction checker with human-in-the-loop pharmacist review.",
     version="0.1.0",
+    lifespan=lifespan,
+    # Nested get_db() calls within a request share one pooled connection
+    dependencies=[Depends(request_db_scope)],
 )
 
 # CORS configuration
@@ -50,11 +109,6 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-def startup():
-    init_db()
-
-
 # --- Health Check ---
 
 @app.get("/api/health")
@@ -62,6 +116,18 @@ def health_check():
     return {"status": "ok", "service": "saferx"}
 
 
+@app.get("/api/metrics")
+def get_metrics():
+    """Runtime metrics for monitoring (Anthropic and SQLite connection reuse, result cache, event writer)."""
+    return {
+        "llm_client": get_connection_stats(),
+        "db_pool": get_pool_stats(),
+        "db_storage": get_storage_stats(),
+        "result_cache": get_cache_stats(),
+        "event_writer": get_event_writer_stats(),
+    }
+
+
 # --- Patient Endpoints ---
 
 @app.get("/api/patients", response_model=list[PatientSummary])
@@ -167,32 +233,30 @@ def submit_prescription(rx: PrescriptionCreate):
     patient = db.execute(
         "SELECT id FROM patients WHERE id = ?", (rx.patient_id,)
     ).fetchone()
+    db.close()
 
     if not patient:
-        db.close()
         raise HTTPException(status_code=404, detail=f"Patient {rx.patient_id} not found")
 
     prescription_id = f"RX-{uuid.uuid4().hex[:8].upper()}"
 
-    db.execute(
-        """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?)""",
-        (
-            prescription_id,
-            rx.patient_id,
-            rx.medication_name,
-            rx.dosage,
-            rx.frequency,
-            rx.prescriber,
-            PrescriptionStatus.PENDING.value,
-        ),
-    )
-    db.commit()
-
-    row = db.execute(
-        "SELECT * FROM prescriptions WHERE id = ?", (prescription_id,)
-    ).fetchone()
-    db.close()
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                prescription_id,
+                rx.patient_id,
+                rx.medication_name,
+                rx.dosage,
+                rx.frequency,
+                rx.prescriber,
+                PrescriptionStatus.PENDING.value,
+            ),
+        )
+        row = db.execute(
+            "SELECT * FROM prescriptions WHERE id = ?", (prescription_id,)
+        ).fetchone()
 
     return Prescription(
         id=row["id"],
@@ -206,6 +270,107 @@ def submit_prescription(rx: PrescriptionCreate):
     )
 
 
+def _insert_prescriptions(batch: list[PrescriptionCreate]) -> list[Prescription | str]:
+    """Validate patients with one IN query and insert the batch in one transaction.
+
+    Returns:
+        One entry per input: the created Prescription, or an error message.
+    """
+    db = get_db()
+    patient_ids = sorted({rx.patient_id for rx in batch})
+    placeholders = ",".join("?" * len(patient_ids))
+    known = {
+        row["id"]
+        for row in db.execute(
+            f"SELECT id FROM patients WHERE id IN ({placeholders})", patient_ids
+        )
+    }
+    db.close()
+
+    results: list[Prescription | str] = []
+    rows = []
+    for rx in batch:
+        if rx.patient_id not in known:
+            results.append(f"Patient {rx.patient_id} not found")
+            continue
+        prescription_id = f"RX-{uuid.uuid4().hex[:8].upper()}"
+        rows.append((
+            prescription_id,
+            rx.patient_id,
+            rx.medication_name,
+            rx.dosage,
+            rx.frequency,
+            rx.prescriber,
+            PrescriptionStatus.PENDING.value,
+        ))
+        results.append(prescription_id)
+
+    created = {}
+    if rows:
+        inserted_ids = [row[0] for row in rows]
+        placeholders = ",".join("?" * len(inserted_ids))
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            created = {
+                row["id"]: Prescription(**dict(row))
+                for row in db.execute(
+                    f"SELECT * FROM prescriptions WHERE id IN ({placeholders})", inserted_ids
+                )
+            }
+
+    # Swap inserted ids for their rows; unknown-patient entries stay error strings
+    return [created.get(result, result) for result in results]
+
+
+@app.post("/api/prescriptions/bulk", response_model=BulkPrescriptionResponse)
+async def submit_prescriptions_bulk(bulk: BulkPrescriptionCreate):
+    """Submit a batch of prescriptions, optionally checking them all.
+
+    Patients are validated with a single query and all valid prescriptions
+    are inserted in one transaction. Items for unknown patients are reported
+    per item instead of failing the batch. check_mode controls checking:
+    "inline" fans the checks out with at most BULK_CHECK_PARALLELISM in
+    flight, "job" queues a background check job per prescription, and
+    "none" only inserts.
+    """
+    inserted = await asyncio.to_thread(_insert_prescriptions, bulk.prescriptions)
+    items = [
+        BulkPrescriptionResult(index=i, prescription=rx)
+        if isinstance(rx, Prescription)
+        else BulkPrescriptionResult(index=i, error=rx)
+        for i, rx in enumerate(inserted)
+    ]
+    pending = [item for item in items if item.prescription is not None]
+
+    if bulk.check_mode == BulkCheckMode.INLINE:
+        semaphore = asyncio.Semaphore(BULK_CHECK_PARALLELISM)
+
+        async def check(item: BulkPrescriptionResult):
+            async with semaphore:
+                try:
+                    item.interaction_check = await _run_check_pipeline(item.prescription.id)
+                except Exception as exc:
+                    item.error = str(getattr(exc, "detail", None) or exc)
+
+        await asyncio.gather(*(check(item) for item in pending))
+
+    elif bulk.check_mode == BulkCheckMode.JOB:
+        for item in pending:
+            job = await check_jobs.submit(item.prescription.id)
+            item.job_id = job["id"]
+
+    failed = sum(1 for item in items if item.error is not None)
+    return BulkPrescriptionResponse(
+        items=items,
+        submitted_count=len(pending),
+        failed_count=failed,
+    )
+
+
 @app.get("/api/prescriptions/{prescription_id}/masking", response_model=MaskingComparison)
 def get_masking_view(prescription_id: str):
     """Get the before/after masking comparison for the UI visualization."""
@@ -236,30 +401,17 @@ def get_masking_view(prescription_id: str):
     )
 
 
-@app.post("/api/prescriptions/{prescription_id}/check", response_model=InteractionCheckResult)
-def run_interaction_check(prescription_id: str):
-    """Run the full AI interaction check pipeline.
-
-    Flow: load patient -> mask PHI -> call Claude -> route decision -> save + audit.
-    """
+def _load_check_inputs(prescription_id: str) -> tuple[dict, dict]:
+    """Load the prescription and patient for an interaction check (read-only)."""
     db = get_db()
     rx_row = db.execute(
         "SELECT * FROM prescriptions WHERE id = ?", (prescription_id,)
     ).fetchone()
+    db.close()
 
     if not rx_row:
-        db.close()
         raise HTTPException(status_code=404, detail=f"Prescription {prescription_id} not found")
 
-    # Update status to checking
-    db.execute(
-        "UPDATE prescriptions SET status = ? WHERE id = ?",
-        (PrescriptionStatus.CHECKING.value, prescription_id),
-    )
-    db.commit()
-    db.close()
-
-    # Step 1: Load patient data
     patient = _get_patient_dict(rx_row["patient_id"])
     prescription = {
         "id": rx_row["id"],
@@ -268,70 +420,101 @@ def run_interaction_check(prescription_id: str):
         "frequency": rx_row["frequency"],
         "prescriber": rx_row["prescriber"],
     }
+    return patient, prescription
 
-    # Step 2: Mask PHI
-    masking_result = mask_patient_data(patient, prescription)
-    masked = masking_result["masked"]
-    raw = masking_result["raw"]
 
-    # Step 3: Call Claude for interaction analysis
-    ai_result = check_interactions(masked)
+def _start_check(prescription_id: str) -> tuple[dict, dict]:
+    """Load the check inputs and mark the prescription as checking.
 
-    # Step 4: Route based on confidence + risk
-    routing_decision = route_prescription(ai_result)
+    Background jobs mark it too, with their job state; this covers inline checks.
+    """
+    patient, prescription = _load_check_inputs(prescription_id)
+    with write_transaction() as db:
+        db.execute(
+            "UPDATE prescriptions SET status = ? WHERE id = ?",
+            (PrescriptionStatus.CHECKING.value, prescription_id),
+        )
+    return patient, prescription
 
-    # Step 5: Save interaction check to database
-    check_id = f"CHK-{uuid.uuid4().hex[:8].upper()}"
 
-    db = get_db()
-    db.execute(
-        """INSERT INTO interaction_checks
-        (id, prescription_id, risk_level, confidence_score, interactions_found,
-         recommendation, reasoning, masked_payload, raw_payload, routing_decision)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            check_id,
-            prescription_id,
-            ai_result["risk_level"],
-            ai_result["confidence_score"],
-            json.dumps(ai_result["interactions_found"]),
-            ai_result["recommendation"],
-            ai_result["reasoning"],
-            json.dumps(masking_result["masked"]),
-            json.dumps(masking_result["raw"]),
-            routing_decision,
-        ),
-    )
+def _abandon_check(prescription_id: str):
+    """Put a prescription whose check failed back to pending, as a failed job does."""
+    with write_transaction() as db:
+        db.execute(
+            "UPDATE prescriptions SET status = ? WHERE id = ? AND status = ?",
+            (PrescriptionStatus.PENDING.value, prescription_id, PrescriptionStatus.CHECKING.value),
+        )
+
+
+def _save_check(
+    prescription: dict,
+    masking_result: dict,
+    ai_result: dict,
+    routing_decision: str,
+) -> InteractionCheckResult:
+    """Persist the masking event, interaction check, prescription status and
+    audit entry as one unit of work: a single transaction and commit, so a
+    failure leaves no partial state behind.
+    """
+    prescription_id = prescription["id"]
+    check_id = f"CHK-{uuid.uuid4().hex[:8].upper()}"
 
-    # Step 6: Update prescription status based on routing
+    # Update prescription status based on routing
     if routing_decision == "auto_approved":
         new_status = PrescriptionStatus.APPROVED.value
     else:
         new_status = PrescriptionStatus.IN_REVIEW.value
 
-    db.execute(
-        "UPDATE prescriptions SET status = ? WHERE id = ?",
-        (new_status, prescription_id),
-    )
-    db.commit()
+    with write_transaction() as db:
+        # Nested log_* writes join this transaction on the writer lane
+        log_masking_event(
+            prescription_id=prescription_id,
+            event_type="mask",
+            fields_affected=MASKED_FIELDS,
+        )
+        db.execute(
+            """INSERT INTO interaction_checks
+            (id, prescription_id, risk_level, confidence_score, interactions_found,
+             recommendation, reasoning, masked_payload, raw_payload, routing_decision, engine)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                check_id,
+                prescription_id,
+                ai_result["risk_level"],
+                ai_result["confidence_score"],
+                json.dumps(ai_result["interactions_found"]),
+                ai_result["recommendation"],
+                ai_result["reasoning"],
+                json.dumps(masking_result["masked"]),
+                json.dumps(masking_result["raw"]),
+                routing_decision,
+                ai_result["engine"],
+            ),
+        )
+        db.execute(
+            "UPDATE prescriptions SET status = ? WHERE id = ?",
+            (new_status, prescription_id),
+        )
 
-    row = db.execute(
-        "SELECT * FROM interaction_checks WHERE id = ?", (check_id,)
-    ).fetchone()
-    db.close()
+        # Log to audit trail
+        log_decision(
+            patient_id_masked=masking_result["masked"]["patient_id"],
+            prescription_id=prescription_id,
+            medication_name=prescription["medication_name"],
+            ai_recommendation=ai_result["recommendation"],
+            ai_confidence=ai_result["confidence_score"],
+            ai_risk_level=ai_result["risk_level"],
+            final_status=new_status,
+        )
+        row = db.execute(
+            "SELECT * FROM interaction_checks WHERE id = ?", (check_id,)
+        ).fetchone()
+
+    return _check_result_from_row(row)
 
-    # Step 7: Log to audit trail
-    masked_patient_id = masked["patient_id"]
-    log_decision(
-        patient_id_masked=masked_patient_id,
-        prescription_id=prescription_id,
-        medication_name=rx_row["medication_name"],
-        ai_recommendation=ai_result["recommendation"],
-        ai_confidence=ai_result["confidence_score"],
-        ai_risk_level=ai_result["risk_level"],
-        final_status=new_status,
-    )
 
+def _check_result_from_row(row) -> InteractionCheckResult:
+    """Build the API model from an interaction_checks row."""
     return InteractionCheckResult(
         id=row["id"],
         prescription_id=row["prescription_id"],
@@ -344,210 +527,268 @@ def run_interaction_check(prescription_id: str):
         recommendation=row["recommendation"],
         reasoning=row["reasoning"],
         routing_decision=row["routing_decision"],
+        engine=row["engine"],
         masked_payload=MaskedPayload(**json.loads(row["masked_payload"])),
         raw_payload=RawPayload(**json.loads(row["raw_payload"])),
         created_at=row["created_at"],
     )
 
 
+async def _run_check_pipeline(prescription_id: str) -> InteractionCheckResult:
+    """Run the interaction check pipeline without blocking the event loop.
+
+    SQLite work is short and runs in worker threads; the Claude round trip,
+    which dominates latency, is awaited on the AsyncAnthropic client so it
+    does not hold a threadpool worker.
+    """
+    # Step 1: Load patient data and mark the prescription checking
+    patient, prescription = await asyncio.to_thread(_start_check, prescription_id)
+
+    try:
+        # Step 2: Mask PHI (the masking event is persisted with the result in step 5)
+        masking_result = mask_patient_data(patient, prescription, log_event=False)
+
+        # Step 3: Interaction analysis (local rule engine, result cache, else Claude)
+        ai_result = await check_interactions_async(masking_result["masked"])
+
+        # Step 4: Route based on confidence + risk
+        routing_decision = route_prescription(ai_result)
+
+        # Step 5: One transaction: masking event, check, prescription status, audit entry
+        return await asyncio.to_thread(
+            _save_check, prescription, masking_result, ai_result, routing_decision
+        )
+    except Exception:
+        await asyncio.to_thread(_abandon_check, prescription_id)
+        raise
+
+
+@app.post("/api/prescriptions/{prescription_id}/check", response_model=InteractionCheckResult)
+async def run_interaction_check(prescription_id: str):
+    """Run the full AI interaction check pipeline.
+
+    Flow: load patient -> mask PHI -> call Claude -> route decision -> save + audit.
+    """
+    return await _run_check_pipeline(prescription_id)
+
+
+# --- Background Check Jobs ---
+
+async def _run_check_job(prescription_id: str) -> str:
+    """Job runner: run the check pipeline and return the interaction check id."""
+    result = await _run_check_pipeline(prescription_id)
+    return result.id
+
+
+check_jobs = CheckJobQueue(runner=_run_check_job)
+
+
+def _get_interaction_check(check_id: str) -> InteractionCheckResult:
+    db = get_db()
+    row = db.execute(
+        "SELECT * FROM interaction_checks WHERE id = ?", (check_id,)
+    ).fetchone()
+    db.close()
+    return _check_result_from_row(row)
+
+
+async def _to_check_job(job: dict) -> CheckJob:
+    """Attach the interaction check result to a completed job snapshot."""
+    result = None
+    if job["interaction_check_id"]:
+        result = await asyncio.to_thread(_get_interaction_check, job["interaction_check_id"])
+    return CheckJob(**job, result=result)
+
+
+def _prescription_exists(prescription_id: str) -> bool:
+    db = get_db()
+    row = db.execute(
+        "SELECT id FROM prescriptions WHERE id = ?", (prescription_id,)
+    ).fetchone()
+    db.close()
+    return row is not None
+
+
+@app.post("/api/prescriptions/{prescription_id}/check-jobs", response_model=CheckJob, status_code=202)
+async def submit_check_job(prescription_id: str):
+    """Queue the interaction check pipeline and return a job id immediately.
+
+    Re-submitting while a job for the prescription is still queued or running
+    returns that job instead of starting a duplicate check.
+    """
+    if not await asyncio.to_thread(_prescription_exists, prescription_id):
+        raise HTTPException(status_code=404, detail=f"Prescription {prescription_id} not found")
+
+    job = await check_jobs.submit(prescription_id)
+    return await _to_check_job(job)
+
+
+@app.get("/api/jobs/{job_id}", response_model=CheckJob)
+async def get_check_job(job_id: str):
+    """Poll a check job. The result is included once the job has completed."""
+    job = await check_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return await _to_check_job(job)
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_check_job(job_id: str):
+    """Server-sent events stream of job snapshots until the job completes or fails."""
+    if not await check_jobs.get(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def event_stream():
+        async for job in check_jobs.events(job_id):
+            snapshot = await _to_check_job(job)
+            yield f"event: job\ndata: {snapshot.model_dump_json()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 # --- Audit Log Endpoints ---
 
 @app.get("/api/audit")
 def get_audit(
     risk_level: str | None = None,
     status: str | None = None,
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(default=100, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = None,
 ):
-    """Get audit log entries with optional filters."""
-    entries = get_audit_log(
-        risk_level=risk_level,
-        status=status,
-        limit=limit,
-        offset=offset,
-    )
+    """Get audit log entries with optional filters, newest first.
+
+    Pass next_cursor back as cursor to fetch the following page; keyset
+    pages cost the same at any depth. offset is kept for older clients.
+    total comes from the incrementally maintained counts.
+    """
+    next_cursor = None
+    if offset:
+        entries = get_audit_log(
+            risk_level=risk_level,
+            status=status,
+            limit=limit,
+            offset=offset,
+        )
+    else:
+        try:
+            entries, next_cursor = get_audit_page(
+                risk_level=risk_level, status=status, limit=limit, cursor=cursor
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
     total = get_audit_count(risk_level=risk_level, status=status)
-    return {"entries": entries, "total": total}
+    return {"entries": entries, "total": total, "next_cursor": next_cursor}
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC; naive ones are already UTC."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 @app.get("/api/audit/export")
-def export_audit():
-    """Export the full audit log as CSV."""
-    csv_content = export_audit_csv()
-    return PlainTextResponse(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=saferx_audit_log.csv"},
+def export_audit(
+    format: ExportFormat = ExportFormat.CSV,
+    gzip: bool = False,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    risk_level: str | None = None,
+    status: str | None = None,
+    medication: str | None = None,
+):
+    """Export the audit log, streamed in batches of rows, newest first.
+
+    Filters: entries with start <= timestamp < end (UTC), risk level,
+    final status and medication name. format=parquet or arrow writes a
+    Parquet / Arrow IPC file one row group at a time (needs pyarrow);
+    gzip=true compresses a CSV export (saferx_audit_log.csv.gz).
+    """
+    filters = {
+        "risk_level": risk_level,
+        "status": status,
+        "medication_name": medication,
+        "start": _naive_utc(start) if start else None,
+        "end": _naive_utc(end) if end else None,
+    }
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+    if format == ExportFormat.CSV:
+        chunks = iter_audit_csv(**filters)
+        if gzip:
+            chunks, media_type, extension = gzip_chunks(chunks), "application/gzip", "csv.gz"
+    elif gzip:
+        raise HTTPException(status_code=400, detail="gzip applies to CSV exports; Parquet and Arrow are binary")
+    else:
+        try:
+            chunks = iter_audit_columnar(format.value, **filters)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=501, detail=str(exc))
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=saferx_audit_log.{extension}"},
     )
 
 
-# --- Pharmacist Review Queue Endpoints ---
+# --- Search Endpoints ---
 
-@app.get("/api/queue")
-def get_review_queue():
-    """Get all prescriptions waiting for pharmacist review.
+@app.get("/api/search", response_model=ReviewSearchResponse)
+def search(q: str, source: SearchSource | None = None, limit: int = 20):
+    """Full-text search over pharmacist feedback and AI reasoning, best match first.
 
-    Returns combined view: prescription + patient + AI analysis for each item.
+    Matches entries containing every term in q (stemmed, so "bleed"
+    finds "bleeding"; end a term with * for a prefix search). source
+    limits the search to feedback (audit log) or reasoning (interaction
+    checks). Snippets mark matched terms with **. truncated is true when
+    q matched more than SEARCH_RANK_WINDOW entries and only the newest
+    of them were ranked.
     """
-    db = get_db()
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
+    try:
+        hits, truncated = search_reviews(q, source=source.value if source else None, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"query": q, "source": source, "hits": hits, "truncated": truncated}
 
-    # Get all interaction checks that were routed to pharmacist
-    # and whose prescriptions are still in_review
-    checks = db.execute("""
-        SELECT ic.*, p.status as rx_status
-        FROM interaction_checks ic
-        JOIN prescriptions p ON ic.prescription_id = p.id
-        WHERE ic.routing_decision = 'routed_to_pharmacist'
-        AND p.status = 'in_review'
-        ORDER BY ic.created_at DESC
-    """).fetchall()
 
-    queue_items = []
-    for check in checks:
-        # Get prescription
-        rx = db.execute(
-            "SELECT * FROM prescriptions WHERE id = ?",
-            (check["prescription_id"],),
-        ).fetchone()
+# --- Pharmacist Review Queue Endpoints ---
 
-        # Get patient
-        patient_row = db.execute(
-            "SELECT * FROM patients WHERE id = ?",
-            (rx["patient_id"],),
-        ).fetchone()
+@app.get("/api/queue")
+def get_review_queue(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    view: Literal["full", "summary"] = "full",
+):
+    """Get one page of prescriptions waiting for pharmacist review.
 
-        med_rows = db.execute(
-            "SELECT * FROM patient_medications WHERE patient_id = ? AND active = 1",
-            (rx["patient_id"],),
-        ).fetchall()
-
-        # Check if already reviewed
-        existing_review = get_review_for_check(check["id"])
-
-        queue_items.append({
-            "prescription": {
-                "id": rx["id"],
-                "patient_id": rx["patient_id"],
-                "medication_name": rx["medication_name"],
-                "dosage": rx["dosage"],
-                "frequency": rx["frequency"],
-                "prescriber": rx["prescriber"],
-                "status": rx["status"],
-                "created_at": rx["created_at"],
-            },
-            "patient": {
-                "id": patient_row["id"],
-                "name": patient_row["name"],
-                "date_of_birth": patient_row["date_of_birth"],
-                "weight_kg": patient_row["weight_kg"],
-                "allergies": json.loads(patient_row["allergies"]),
-                "medications": [
-                    {
-                        "id": med["id"],
-                        "medication_name": med["medication_name"],
-                        "dosage": med["dosage"],
-                        "frequency": med["frequency"],
-                        "prescriber": med["prescriber"],
-                        "start_date": med["start_date"],
-                    }
-                    for med in med_rows
-                ],
-            },
-            "interaction_check": {
-                "id": check["id"],
-                "prescription_id": check["prescription_id"],
-                "risk_level": check["risk_level"],
-                "confidence_score": check["confidence_score"],
-                "interactions_found": json.loads(check["interactions_found"]),
-                "recommendation": check["recommendation"],
-                "reasoning": check["reasoning"],
-                "routing_decision": check["routing_decision"],
-                "masked_payload": json.loads(check["masked_payload"]),
-                "raw_payload": json.loads(check["raw_payload"]),
-                "created_at": check["created_at"],
-            },
-            "review": existing_review,
-        })
+    Returns combined view: prescription + patient + AI analysis for each item,
+    or a lightweight QueueItemSummary per item with view=summary. Pass
+    next_cursor back as cursor to fetch the following page. count is the
+    page's length, total the number of items in the whole queue.
+    """
+    try:
+        queue_items, next_cursor = load_review_queue_page(
+            limit=limit, cursor=cursor, summary=view == "summary"
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    db.close()
-    return {"items": queue_items, "count": len(queue_items)}
+    if view == "summary":
+        queue_items = [QueueItemSummary(**item) for item in queue_items]
+    total = count_review_queue()
+    return {"items": queue_items, "count": len(queue_items), "total": total, "next_cursor": next_cursor}
 
 
 @app.get("/api/queue/{check_id}")
 def get_queue_item(check_id: str):
     """Get a single review queue item with full details."""
-    db = get_db()
-
-    check = db.execute(
-        "SELECT * FROM interaction_checks WHERE id = ?", (check_id,)
-    ).fetchone()
-
-    if not check:
-        db.close()
+    item = load_queue_item(check_id)
+    if not item:
         raise HTTPException(status_code=404, detail=f"Interaction check {check_id} not found")
-
-    rx = db.execute(
-        "SELECT * FROM prescriptions WHERE id = ?",
-        (check["prescription_id"],),
-    ).fetchone()
-
-    patient_row = db.execute(
-        "SELECT * FROM patients WHERE id = ?",
-        (rx["patient_id"],),
-    ).fetchone()
-
-    med_rows = db.execute(
-        "SELECT * FROM patient_medications WHERE patient_id = ? AND active = 1",
-        (rx["patient_id"],),
-    ).fetchall()
-    db.close()
-
-    existing_review = get_review_for_check(check_id)
-
-    return {
-        "prescription": {
-            "id": rx["id"],
-            "patient_id": rx["patient_id"],
-            "medication_name": rx["medication_name"],
-            "dosage": rx["dosage"],
-            "frequency": rx["frequency"],
-            "prescriber": rx["prescriber"],
-            "status": rx["status"],
-            "created_at": rx["created_at"],
-        },
-        "patient": {
-            "id": patient_row["id"],
-            "name": patient_row["name"],
-            "date_of_birth": patient_row["date_of_birth"],
-            "weight_kg": patient_row["weight_kg"],
-            "allergies": json.loads(patient_row["allergies"]),
-            "medications": [
-                {
-                    "id": med["id"],
-                    "medication_name": med["medication_name"],
-                    "dosage": med["dosage"],
-                    "frequency": med["frequency"],
-                    "prescriber": med["prescriber"],
-                    "start_date": med["start_date"],
-                }
-                for med in med_rows
-            ],
-        },
-        "interaction_check": {
-            "id": check["id"],
-            "prescription_id": check["prescription_id"],
-            "risk_level": check["risk_level"],
-            "confidence_score": check["confidence_score"],
-            "interactions_found": json.loads(check["interactions_found"]),
-            "recommendation": check["recommendation"],
-            "reasoning": check["reasoning"],
-            "routing_decision": check["routing_decision"],
-            "masked_payload": json.loads(check["masked_payload"]),
-            "raw_payload": json.loads(check["raw_payload"]),
-            "created_at": check["created_at"],
-        },
-        "review": existing_review,
-    }
+    return item
 
 
 @app.post("/api/reviews/{check_id}")
@@ -588,13 +829,11 @@ def submit_review(check_id: str, review: ReviewCreate):
     prescription_id = check["prescription_id"]
     new_status = review.decision  # approved, rejected, or escalated
 
-    db = get_db()
-    db.execute(
-        "UPDATE prescriptions SET status = ? WHERE id = ?",
-        (new_status, prescription_id),
-    )
-    db.commit()
-    db.close()
+    with write_transaction() as db:
+        db.execute(
+            "UPDATE prescriptions SET status = ? WHERE id = ?",
+            (new_status, prescription_id),
+        )
 
     # Determine if pharmacist agreed with AI
     # AI said reject/pharmacist_review -> pharmacist rejected = agreement
@@ -632,15 +871,13 @@ def get_analytics_summary():
     """Aggregate metrics from the audit log for the dashboard.
 
     Computes: total prescriptions, auto-approve rate, override rate,
-    average confidence, average review time, risk distribution.
+    average confidence, average review time, risk distribution. Served
+    from the trigger-maintained aggregates (see src/analytics.py).
     """
-    db = get_db()
-
-    # Total entries in the audit log
-    total = db.execute("SELECT COUNT(*) as cnt FROM audit_log").fetchone()["cnt"]
+    metrics = summary_metrics()
+    total = metrics["total"]
 
     if total == 0:
-        db.close()
         return AnalyticsSummary(
             total_prescriptions=0,
             auto_approved_count=0,
@@ -649,46 +886,18 @@ def get_analytics_summary():
             override_rate=0.0,
             average_confidence=0.0,
             average_time_to_decision_seconds=None,
-            risk_distribution={"low": 0, "medium": 0, "high": 0, "critical": 0},
+            risk_distribution=dict.fromkeys(RISK_ORDER, 0),
         )
 
-    # Count auto-approved (final_status = 'approved' AND no pharmacist decision)
-    auto_approved = db.execute(
-        "SELECT COUNT(*) as cnt FROM audit_log WHERE pharmacist_decision IS NULL AND final_status = 'approved'"
-    ).fetchone()["cnt"]
-
-    # Count pharmacist-reviewed (pharmacist_decision IS NOT NULL)
-    pharmacist_reviewed = db.execute(
-        "SELECT COUNT(*) as cnt FROM audit_log WHERE pharmacist_decision IS NOT NULL"
-    ).fetchone()["cnt"]
+    auto_approved = metrics["auto_approved"]
+    pharmacist_reviewed = metrics["pharmacist_reviewed"]
 
     # Override rate: pharmacist disagreed with AI / total pharmacist reviews
-    overrides = db.execute(
-        "SELECT COUNT(*) as cnt FROM audit_log WHERE ai_pharmacist_agreement = 0"
-    ).fetchone()["cnt"]
+    overrides = metrics["overrides"]
     override_rate = overrides / pharmacist_reviewed if pharmacist_reviewed > 0 else 0.0
 
-    # Average AI confidence
-    avg_conf = db.execute(
-        "SELECT AVG(ai_confidence) as avg_c FROM audit_log WHERE ai_confidence IS NOT NULL"
-    ).fetchone()["avg_c"] or 0.0
-
-    # Average time to decision (pharmacist reviews only)
-    avg_time_row = db.execute(
-        "SELECT AVG(time_to_decision_seconds) as avg_t FROM audit_log WHERE time_to_decision_seconds IS NOT NULL"
-    ).fetchone()
-    avg_time = avg_time_row["avg_t"]
-
-    # Risk distribution
-    risk_rows = db.execute(
-        "SELECT ai_risk_level, COUNT(*) as cnt FROM audit_log WHERE ai_risk_level IS NOT NULL GROUP BY ai_risk_level"
-    ).fetchall()
-
-    risk_dist = {"low": 0, "medium": 0, "high": 0, "critical": 0}
-    for row in risk_rows:
-        risk_dist[row["ai_risk_level"]] = row["cnt"]
-
-    db.close()
+    avg_conf = metrics["average_confidence"] or 0.0
+    avg_time = metrics["average_time_to_decision_seconds"]
 
     return AnalyticsSummary(
         total_prescriptions=total,
@@ -698,10 +907,69 @@ def get_analytics_summary():
         override_rate=override_rate,
         average_confidence=round(avg_conf, 3),
         average_time_to_decision_seconds=round(avg_time, 1) if avg_time else None,
-        risk_distribution=risk_dist,
+        risk_distribution=metrics["risk_distribution"],
     )
 
 
+@app.get("/api/analytics/timeseries", response_model=AnalyticsTimeseriesResponse)
+def get_analytics_timeseries(
+    granularity: RollupGranularity = RollupGranularity.DAY,
+    start: datetime | None = None,
+    end: datetime | None = None,
+):
+    """AnalyticsSummary metrics per hour or day, for trend charts.
+
+    Covers every bucket overlapping [start, end) - by default the last 30
+    days - with empty buckets zero-filled. Times without a UTC offset are
+    taken as UTC. Served from the trigger-maintained analytics_rollups,
+    so a year of buckets costs one index range read.
+    """
+    end = _naive_utc(end) if end else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = _naive_utc(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    count = bucket_count(granularity.value, start, end)
+    if count > MAX_TIMESERIES_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Window has {count} {granularity.value} buckets; the maximum is {MAX_TIMESERIES_BUCKETS}",
+        )
+
+    series = timeseries_metrics(granularity.value, start, end)
+    totals, reviewed = series["total"], series["pharmacist_reviewed"]
+
+    return AnalyticsTimeseriesResponse(
+        granularity=granularity,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        buckets=series["buckets"],
+        total_prescriptions=totals,
+        auto_approved_count=series["auto_approved"],
+        pharmacist_reviewed_count=reviewed,
+        auto_approve_rate=[
+            auto / total if total else 0.0 for auto, total in zip(series["auto_approved"], totals)
+        ],
+        override_rate=[
+            overrides / reviews if reviews else 0.0 for overrides, reviews in zip(series["overrides"], reviewed)
+        ],
+        average_confidence=[
+            round(total / count, 3) if count else None
+            for total, count in zip(series["confidence_sum"], series["confidence_count"])
+        ],
+        average_time_to_decision_seconds=[
+            round(total / count, 1) if count else None
+            for total, count in zip(series["decision_time_sum"], series["decision_time_count"])
+        ],
+        risk_distribution=series["risk_distribution"],
+    )
+
+
+@app.get("/api/analytics/cache")
+def get_result_cache_analytics():
+    """Interaction check result cache: hit rate and LLM latency saved by hits."""
+    return get_cache_stats()
+
+
 @app.get("/api/analytics/threshold-simulation", response_model=ThresholdSimulationResponse)
 def simulate_thresholds():
     """Simulate different confidence thresholds using historical data.
@@ -712,52 +980,23 @@ def simulate_thresholds():
     - Estimated false negatives (dangerous Rx that slip through)
     - Pharmacist hours/day (assuming 5 min per review, 50 Rx/day)
     """
-    # Load historical records
-    data_path = os.path.join(os.path.dirname(__file__), "data", "historical_records.json")
-    with open(data_path) as f:
-        records = json.load(f)
-
-    total = len(records)
     current_threshold = 0.95  # Our production threshold
 
     # Sweep thresholds from 0.80 to 0.99 in 0.01 steps
-    simulations = []
-    for pct in range(80, 100):
-        threshold = pct / 100.0
-
-        auto_approved = 0
-        false_negatives = 0
-
-        for rec in records:
-            # Apply routing logic: auto-approve if confidence >= threshold AND risk is low
-            would_auto_approve = (
-                rec["confidence_score"] >= threshold
-                and rec["risk_level"] == "low"
-            )
-
-            if would_auto_approve:
-                auto_approved += 1
-                # False negative: auto-approved but actually dangerous
-                if rec["ground_truth_dangerous"]:
-                    false_negatives += 1
+    thresholds = [pct / 100.0 for pct in range(80, 100)]
+    outcome = get_historical_dataset().simulator.simulate(thresholds)
 
-        routed = total - auto_approved
-        fn_rate = false_negatives / total if total > 0 else 0.0
-
-        # Pharmacist hours/day estimate:
-        # Assume ~50 prescriptions/day proportionally, 5 min per review
-        daily_proportion = 50 / total if total > 0 else 0
-        daily_routed = routed * daily_proportion
-        pharmacist_hours = (daily_routed * 5) / 60  # 5 min per review -> hours
-
-        simulations.append(ThresholdSimulationResult(
+    simulations = [
+        ThresholdSimulationResult(
             threshold=threshold,
-            auto_approved_count=auto_approved,
-            routed_to_pharmacist_count=routed,
-            estimated_false_negatives=false_negatives,
-            false_negative_rate=round(fn_rate, 4),
-            pharmacist_hours_per_day=round(pharmacist_hours, 2),
-        ))
+            auto_approved_count=int(outcome["auto_approved"][i]),
+            routed_to_pharmacist_count=int(outcome["routed"][i]),
+            estimated_false_negatives=int(outcome["false_negatives"][i]),
+            false_negative_rate=round(float(outcome["false_negative_rate"][i]), 4),
+            pharmacist_hours_per_day=round(float(outcome["pharmacist_hours_per_day"][i]), 2),
+        )
+        for i, threshold in enumerate(thresholds)
+    ]
 
     return ThresholdSimulationResponse(
         current_threshold=current_threshold,
@@ -765,6 +1004,58 @@ def simulate_thresholds():
     )
 
 
+@app.get("/api/analytics/threshold-sweep", response_model=ThresholdSweepResponse)
+def sweep_thresholds(
+    start: float = 0.80,
+    stop: float = 0.99,
+    step: float = 0.01,
+    max_risk_level: list[RiskLevel] = Query(default=[RiskLevel.LOW]),
+    require_ai_approval: list[bool] = Query(default=[False]),
+):
+    """Sweep confidence thresholds at any resolution, optionally as a grid.
+
+    Thresholds run from start to stop (inclusive) in `step` increments.
+    Repeat max_risk_level and/or require_ai_approval to sweep the other
+    route_prescription gates too; every combination becomes one cell.
+    """
+    if step <= 0 or not 0.0 <= start <= stop <= 1.0:
+        raise HTTPException(status_code=400, detail="Need 0 <= start <= stop <= 1 and step > 0")
+    count = int((stop - start) / step + 1e-9) + 1
+    if count > MAX_SWEEP_THRESHOLDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {count} thresholds; the maximum is {MAX_SWEEP_THRESHOLDS}",
+        )
+    thresholds = np.round(start + step * np.arange(count), 10)
+
+    simulator = get_historical_dataset().simulator
+
+    cells = [
+        ThresholdSweepCell(
+            max_risk_level=level,
+            require_ai_approval=require_ai,
+            auto_approved_count=outcome["auto_approved"].tolist(),
+            routed_to_pharmacist_count=outcome["routed"].tolist(),
+            estimated_false_negatives=outcome["false_negatives"].tolist(),
+            false_negative_rate=np.round(outcome["false_negative_rate"], 4).tolist(),
+            pharmacist_hours_per_day=np.round(outcome["pharmacist_hours_per_day"], 2).tolist(),
+        )
+        for level, require_ai, outcome in simulator.sweep(
+            thresholds,
+            [level.value for level in dict.fromkeys(max_risk_level)],
+            list(dict.fromkeys(require_ai_approval)),
+        )
+    ]
+
+    return ThresholdSweepResponse(
+        current_threshold=AUTO_APPROVE_CONFIDENCE_THRESHOLD,
+        current_max_risk_level=AUTO_APPROVE_MAX_RISK_LEVEL,
+        total_records=simulator.total,
+        thresholds=thresholds.tolist(),
+        cells=cells,
+    )
+
+
 # ── Cost & ROI ──────────────────────────────────────────────────────────
 
 
@@ -781,6 +1072,10 @@ def get_cost_roi():
     OUTPUT_PRICE_PER_MILLION = 15.00
     AVG_INPUT_TOKENS = 5750
     AVG_OUTPUT_TOKENS = 600
+    # Prompt caching: system prompt + KB are a cached prefix, the rest is per-check
+    CACHE_WRITE_PRICE_PER_MILLION = 3.75
+    CACHE_READ_PRICE_PER_MILLION = 0.30
+    AVG_CACHED_PREFIX_TOKENS = 5000
     PHARMACIST_HOURLY_RATE = 65.00
     AVG_REVIEW_MINUTES = 5.0
     PROJECTION_VOLUMES = [25, 50, 100, 200, 500]
@@ -793,28 +1088,16 @@ def get_cost_roi():
     pharmacist_cost_per_review = PHARMACIST_HOURLY_RATE * (AVG_REVIEW_MINUTES / 60)
 
     # --- Live data from audit_log ---
-    db = get_db()
-    cursor = db.cursor()
-
-    cursor.execute("SELECT COUNT(*) FROM audit_log")
-    live_total = cursor.fetchone()[0]
-
-    cursor.execute(
-        "SELECT COUNT(*) FROM audit_log WHERE final_status = 'approved' AND pharmacist_decision IS NULL"
-    )
-    live_auto_approved = cursor.fetchone()[0]
+    metrics = summary_metrics()
+    live_total = metrics["total"]
+    live_auto_approved = metrics["auto_approved"]
 
     live_pharmacist_reviewed = live_total - live_auto_approved
 
     # --- Historical data ---
-    data_path = os.path.join(os.path.dirname(__file__), "data", "historical_records.json")
-    with open(data_path) as f:
-        historical = json.load(f)
-
-    hist_total = len(historical)
-    hist_auto_approved = sum(
-        1 for r in historical if r["routing_decision"] == "auto_approved"
-    )
+    historical = get_historical_dataset()
+    hist_total = historical.size
+    hist_auto_approved = historical.auto_approved_count
 
     # --- Combined metrics ---
     combined_total = live_total + hist_total
@@ -863,7 +1146,57 @@ def get_cost_roi():
         pharmacist_hours_saved=hours_saved,
     )
 
-    # --- Section 3: Projections ---
+    # --- Section 3: Prompt cache hit vs. miss ---
+    uncached_input_tokens = AVG_INPUT_TOKENS - AVG_CACHED_PREFIX_TOKENS
+    base_cost = (
+        (uncached_input_tokens * INPUT_PRICE_PER_MILLION / 1_000_000)
+        + (AVG_OUTPUT_TOKENS * OUTPUT_PRICE_PER_MILLION / 1_000_000)
+    )
+    cost_per_cache_miss = base_cost + AVG_CACHED_PREFIX_TOKENS * CACHE_WRITE_PRICE_PER_MILLION / 1_000_000
+    cost_per_cache_hit = base_cost + AVG_CACHED_PREFIX_TOKENS * CACHE_READ_PRICE_PER_MILLION / 1_000_000
+
+    def _spend(usage: dict) -> float:
+        return (
+            usage["input_tokens"] * INPUT_PRICE_PER_MILLION
+            + usage["cache_creation_input_tokens"] * CACHE_WRITE_PRICE_PER_MILLION
+            + usage["cache_read_input_tokens"] * CACHE_READ_PRICE_PER_MILLION
+            + usage["output_tokens"] * OUTPUT_PRICE_PER_MILLION
+        ) / 1_000_000
+
+    def _spend_without_caching(usage: dict) -> float:
+        all_input = (
+            usage["input_tokens"]
+            + usage["cache_creation_input_tokens"]
+            + usage["cache_read_input_tokens"]
+        )
+        return (
+            all_input * INPUT_PRICE_PER_MILLION
+            + usage["output_tokens"] * OUTPUT_PRICE_PER_MILLION
+        ) / 1_000_000
+
+    usage = get_usage_stats()
+    hits, misses = usage["cache_hit"], usage["cache_miss"]
+    live_calls = hits["calls"] + misses["calls"]
+    live_spend = _spend(hits) + _spend(misses)
+    live_spend_uncached = _spend_without_caching(hits) + _spend_without_caching(misses)
+
+    prompt_cache = PromptCacheCost(
+        cached_prefix_tokens=AVG_CACHED_PREFIX_TOKENS,
+        uncached_input_tokens_per_check=uncached_input_tokens,
+        cache_write_price_per_million=CACHE_WRITE_PRICE_PER_MILLION,
+        cache_read_price_per_million=CACHE_READ_PRICE_PER_MILLION,
+        cost_per_check_without_caching=round(cost_per_check, 4),
+        cost_per_check_cache_miss=round(cost_per_cache_miss, 4),
+        cost_per_check_cache_hit=round(cost_per_cache_hit, 4),
+        live_cache_hits=hits["calls"],
+        live_cache_misses=misses["calls"],
+        live_cache_hit_rate=round(hits["calls"] / live_calls, 4) if live_calls > 0 else 0.0,
+        live_cache_hit_spend=round(_spend(hits), 4),
+        live_cache_miss_spend=round(_spend(misses), 4),
+        live_savings_vs_uncached=round(live_spend_uncached - live_spend, 4),
+    )
+
+    # --- Section 4: Projections ---
     projections = []
     for daily in PROJECTION_VOLUMES:
         monthly_rx = daily * 30
@@ -893,4 +1226,5 @@ def get_cost_roi():
             live_prescription_count=live_total,
             historical_record_count=hist_total,
         ),
+        prompt_cache=prompt_cache,
     )
@@ -0,0 +1,131 @@
+"""Benchmark: dashboard summary, seven queries vs. one scan vs. aggregates.
+
+Fills audit_log with synthetic rows and computes the analytics summary
+three ways: the seven separate queries get_analytics_summary() used to
+run, scan_summary_metrics()'s single conditional-aggregation pass, and
+summary_metrics() reading the trigger-maintained aggregates. All three
+must agree.
+
+Usage (from backend/):
+    python benchmarks/bench_analytics_summary.py --rows 1000000
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+
+import common
+
+from src.analytics import scan_summary_metrics, summary_metrics
+from src.database import get_db, init_db, write_transaction
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+
+
+def seven_queries() -> dict:
+    """The queries get_analytics_summary() ran before src/analytics.py."""
+    db = get_db()
+    total = db.execute("SELECT COUNT(*) as cnt FROM audit_log").fetchone()["cnt"]
+    auto_approved = db.execute(
+        "SELECT COUNT(*) as cnt FROM audit_log WHERE pharmacist_decision IS NULL AND final_status = 'approved'"
+    ).fetchone()["cnt"]
+    pharmacist_reviewed = db.execute(
+        "SELECT COUNT(*) as cnt FROM audit_log WHERE pharmacist_decision IS NOT NULL"
+    ).fetchone()["cnt"]
+    overrides = db.execute(
+        "SELECT COUNT(*) as cnt FROM audit_log WHERE ai_pharmacist_agreement = 0"
+    ).fetchone()["cnt"]
+    avg_conf = db.execute(
+        "SELECT AVG(ai_confidence) as avg_c FROM audit_log WHERE ai_confidence IS NOT NULL"
+    ).fetchone()["avg_c"]
+    avg_time = db.execute(
+        "SELECT AVG(time_to_decision_seconds) as avg_t FROM audit_log WHERE time_to_decision_seconds IS NOT NULL"
+    ).fetchone()["avg_t"]
+    risk_rows = db.execute(
+        "SELECT ai_risk_level, COUNT(*) as cnt FROM audit_log WHERE ai_risk_level IS NOT NULL GROUP BY ai_risk_level"
+    ).fetchall()
+    db.close()
+    risk_dist = dict.fromkeys(RISK_LEVELS, 0)
+    for row in risk_rows:
+        risk_dist[row["ai_risk_level"]] = row["cnt"]
+    return {
+        "total": total,
+        "auto_approved": auto_approved,
+        "pharmacist_reviewed": pharmacist_reviewed,
+        "overrides": overrides,
+        "average_confidence": avg_conf,
+        "average_time_to_decision_seconds": avg_time,
+        "risk_distribution": risk_dist,
+    }
+
+
+def fill_audit_log(rows: int, batch: int = 50_000):
+    rng = random.Random(7)
+    for start in range(0, rows, batch):
+        entries = []
+        for _ in range(min(batch, rows - start)):
+            reviewed = rng.random() < 0.7
+            entries.append((
+                str(uuid.uuid4()), "PATIENT_001", f"RX-{rng.randrange(10**8):08d}", "Benchmarkol",
+                rng.choice(["auto_approve", "pharmacist_review", "reject"]), rng.random(), rng.choice(RISK_LEVELS),
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else None,
+                rng.choice([0, 1]) if reviewed else None,
+                rng.randrange(10, 600) if reviewed else None,
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else rng.choice(["approved", "in_review"]),
+            ))
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO audit_log
+                (id, patient_id_masked, prescription_id, medication_name, ai_recommendation,
+                 ai_confidence, ai_risk_level, pharmacist_decision, ai_pharmacist_agreement,
+                 time_to_decision_seconds, final_status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                entries,
+            )
+
+
+def same_metrics(a: dict, b: dict) -> bool:
+    return all(
+        math.isclose(a[key], b[key], rel_tol=1e-9) if isinstance(a[key], float) else a[key] == b[key]
+        for key in a
+    )
+
+
+def mean_ms(fn, repeat: int) -> tuple[dict, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    fill_audit_log(args.rows)
+    print(f"Inserted {args.rows} audit rows in {time.perf_counter() - started:.1f}s (aggregate triggers on)")
+
+    baseline, seven_ms = mean_ms(seven_queries, args.repeat)
+    scanned, scan_ms = mean_ms(scan_summary_metrics, args.repeat)
+    aggregated, aggregates_ms = mean_ms(summary_metrics, args.repeat * 100)
+    assert same_metrics(baseline, scanned), (baseline, scanned)
+    assert same_metrics(baseline, aggregated), (baseline, aggregated)
+
+    common.print_table(
+        ["approach", "queries", "ms per summary", "vs seven queries"],
+        [
+            ["seven queries", 7, f"{seven_ms:.1f}", "1.0x"],
+            ["one conditional-aggregation scan", 1, f"{scan_ms:.1f}", f"{seven_ms / scan_ms:.1f}x"],
+            ["trigger-maintained aggregates", 1, f"{aggregates_ms:.3f}", f"{seven_ms / aggregates_ms:,.0f}x"],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
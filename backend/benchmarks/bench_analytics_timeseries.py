@@ -0,0 +1,118 @@
+"""Benchmark: dashboard time series, GROUP BY scan vs. rollups.
+
+Fills audit_log with a year of synthetic rows and reads hourly and daily
+series over several windows two ways: an on-demand GROUP BY over the
+audit rows in the window, and timeseries_metrics() reading the
+trigger-maintained analytics_rollups. Both must agree.
+
+Usage (from backend/):
+    python benchmarks/bench_analytics_timeseries.py --rows 1000000
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import common
+
+from src.analytics import bucket_keys, timeseries_metrics
+from src.database import ROLLUP_BUCKETS, ROLLUP_METRICS, get_db, init_db, rollup_select_sql, write_transaction
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+YEAR = timedelta(days=365)
+
+
+def fill_audit_log(rows: int, end: datetime, batch: int = 50_000):
+    rng = random.Random(7)
+    seconds = int(YEAR.total_seconds())
+    for start in range(0, rows, batch):
+        entries = []
+        for _ in range(min(batch, rows - start)):
+            reviewed = rng.random() < 0.7
+            entries.append((
+                str(uuid.uuid4()), "PATIENT_001", f"RX-{rng.randrange(10**8):08d}", "Benchmarkol",
+                rng.choice(["auto_approve", "pharmacist_review", "reject"]), rng.random(), rng.choice(RISK_LEVELS),
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else None,
+                rng.choice([0, 1]) if reviewed else None,
+                rng.randrange(10, 600) if reviewed else None,
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else rng.choice(["approved", "in_review"]),
+                (end - timedelta(seconds=rng.randrange(seconds))).strftime("%Y-%m-%d %H:%M:%S"),
+            ))
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO audit_log
+                (id, patient_id_masked, prescription_id, medication_name, ai_recommendation,
+                 ai_confidence, ai_risk_level, pharmacist_decision, ai_pharmacist_agreement,
+                 time_to_decision_seconds, final_status, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                entries,
+            )
+
+
+def scan_timeseries(granularity: str, start: datetime, end: datetime) -> dict[str, tuple]:
+    """Bucket -> metric values, grouped on demand from the audit rows in the window."""
+    db = get_db()
+    rows = db.execute(
+        rollup_select_sql(granularity).replace(
+            "WHERE a.timestamp IS NOT NULL", "WHERE a.timestamp >= ? AND a.timestamp < ?"
+        ),
+        (bucket_keys(granularity, start, end)[0], end.strftime("%Y-%m-%d %H:%M:%S")),
+    ).fetchall()
+    db.close()
+    return {row[1]: tuple(row)[2:] for row in rows}
+
+
+def rollup_timeseries(granularity: str, start: datetime, end: datetime) -> dict[str, tuple]:
+    """Bucket -> metric values from timeseries_metrics(), non-empty buckets only."""
+    series = timeseries_metrics(granularity, start, end)
+    columns = [
+        series[metric] if metric in series else series["risk_distribution"][metric.removeprefix("risk_")]
+        for metric in ROLLUP_METRICS
+    ]
+    return {bucket: values for bucket, *values in zip(series["buckets"], *columns) if values[0]}
+
+
+def same_series(a: dict[str, tuple], b: dict[str, tuple]) -> bool:
+    return a.keys() == b.keys() and all(
+        math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9) for bucket in a for x, y in zip(a[bucket], b[bucket])
+    )
+
+
+def mean_ms(fn, repeat: int, *args) -> tuple[dict, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    end = datetime.now(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    started = time.perf_counter()
+    fill_audit_log(args.rows, end)
+    print(f"Inserted {args.rows} audit rows over a year in {time.perf_counter() - started:.1f}s (rollup triggers on)")
+
+    rows = []
+    for window_name, window in [("7 days", timedelta(days=7)), ("90 days", timedelta(days=90)), ("1 year", YEAR)]:
+        for granularity in ROLLUP_BUCKETS:
+            start = end - window
+            scanned, scan_ms = mean_ms(scan_timeseries, args.repeat, granularity, start, end)
+            rolled, rollup_ms = mean_ms(rollup_timeseries, args.repeat * 10, granularity, start, end)
+            assert same_series(scanned, rolled), (granularity, window_name)
+            rows.append([
+                window_name, granularity, len(rolled), f"{scan_ms:.1f}", f"{rollup_ms:.2f}", f"{scan_ms / rollup_ms:.0f}x",
+            ])
+
+    common.print_table(["window", "granularity", "buckets", "GROUP BY scan ms", "rollups ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Benchmark: audit log exports - buffered vs. streamed, CSV vs. columnar.
+
+Fills audit_log with synthetic rows, then exports it in a fresh process
+per approach and reports its peak memory growth: the old export (fetchall()
+into one CSV string, as /api/audit/export returned before it streamed),
+iter_audit_csv() streamed chunk by chunk, the same stream gzipped, and
+iter_audit_columnar() writing Parquet and Arrow IPC a row group at a
+time. It then times loading each exported file back the way a
+downstream tool would, with pyarrow's readers.
+
+Usage (from backend/):
+    python benchmarks/bench_audit_export.py --rows 100000 1000000
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import common
+
+from src.audit import gzip_chunks, iter_audit_columnar, iter_audit_csv, pa
+from src.database import get_db, init_db, write_transaction
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+
+# Approach -> (file extension, chunk stream); None is the old buffered export
+EXPORTS = {
+    "buffered csv": ("csv", None),
+    "csv": ("csv", lambda: iter_audit_csv()),
+    "csv gzip": ("csv.gz", lambda: gzip_chunks(iter_audit_csv())),
+}
+if pa is not None:
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    EXPORTS["parquet"] = ("parquet", lambda: iter_audit_columnar("parquet"))
+    EXPORTS["arrow"] = ("arrow", lambda: iter_audit_columnar("arrow"))
+
+    LOADERS = {
+        "csv": pyarrow.csv.read_csv,
+        "parquet": pyarrow.parquet.read_table,
+        "arrow": lambda path: pa.ipc.open_file(pa.memory_map(str(path))).read_all(),
+    }
+
+
+def fill_audit_log(rows: int, batch: int = 50_000):
+    rng = random.Random(7)
+    for start in range(0, rows, batch):
+        entries = []
+        for _ in range(min(batch, rows - start)):
+            reviewed = rng.random() < 0.7
+            entries.append((
+                str(uuid.uuid4()), "PATIENT_001", f"RX-{rng.randrange(10**8):08d}", "Benchmarkol",
+                rng.choice(["auto_approve", "pharmacist_review", "reject"]), rng.random(), rng.choice(RISK_LEVELS),
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else None,
+                "Checked against the patient's current medication list." if reviewed else None,
+                rng.choice([0, 1]) if reviewed else None,
+                rng.randrange(10, 600) if reviewed else None,
+                rng.choice(["approved", "rejected", "escalated"]) if reviewed else rng.choice(["approved", "in_review"]),
+            ))
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO audit_log
+                (id, patient_id_masked, prescription_id, medication_name, ai_recommendation,
+                 ai_confidence, ai_risk_level, pharmacist_decision, pharmacist_feedback,
+                 ai_pharmacist_agreement, time_to_decision_seconds, final_status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                entries,
+            )
+
+
+def rss_kb() -> dict[str, int]:
+    """Resident memory, total and anonymous (Linux)."""
+    fields = {}
+    for line in Path("/proc/self/status").read_text().splitlines():
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "RssAnon"):
+            fields[key] = int(value.split()[0])
+    return fields
+
+
+def buffered_export(output: Path, sample) -> int:
+    """What /api/audit/export did before: the whole log in one CSV string."""
+    db = get_db()
+    rows = db.execute("SELECT * FROM audit_log ORDER BY timestamp DESC").fetchall()
+    db.close()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=rows[0].keys())
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(dict(row))
+    content = buffer.getvalue().encode()
+    sample()
+    output.write_bytes(content)
+    return len(content)
+
+
+def streamed_export(chunks, output: Path, sample) -> int:
+    size = 0
+    with output.open("wb") as f:
+        for chunk in chunks:
+            data = chunk.encode() if isinstance(chunk, str) else chunk
+            f.write(data)
+            size += len(data)
+            sample()
+    return size
+
+
+def run_export(approach: str, output: Path) -> dict:
+    """Export the audit log to `output` in this process; time and peak memory growth."""
+    before = rss_kb()
+    peak = dict(before)
+
+    def sample():
+        for key, value in rss_kb().items():
+            peak[key] = max(peak[key], value)
+
+    started = time.perf_counter()
+    _, chunks = EXPORTS[approach]
+    size = buffered_export(output, sample) if chunks is None else streamed_export(chunks(), output, sample)
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": round(seconds, 2),
+        "mb": round(size / 2**20, 1),
+        "peak_rss_mb": round((peak["VmRSS"] - before["VmRSS"]) / 1024, 1),
+        "peak_anon_mb": round((peak["RssAnon"] - before["RssAnon"]) / 1024, 1),
+    }
+
+
+def load_ms(approach: str, path: Path, repeat: int = 3) -> str:
+    """Best time to read an exported file into an Arrow table."""
+    extension, _ = EXPORTS[approach]
+    if pa is None or extension not in LOADERS:
+        return "-"
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        LOADERS[extension](path)
+        best = min(best, time.perf_counter() - started)
+    return f"{best * 1000:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--run-export", choices=list(EXPORTS), help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_export:
+        print(json.dumps(run_export(args.run_export, args.output)))
+        return
+
+    init_db()
+    workdir = Path(tempfile.mkdtemp())
+    rows = []
+    filled = 0
+    for n in sorted(args.rows):
+        fill_audit_log(n - filled)
+        filled = n
+        for approach, (extension, _) in EXPORTS.items():
+            output = workdir / f"audit.{extension}"
+            result = common.run_isolated(
+                __file__, ["--run-export", approach, "--output", str(output)],
+                DATABASE_PATH=common.DATABASE_PATH,
+            )
+            rows.append([n, approach, *result.values(), load_ms(approach, output)])
+            output.unlink()
+
+    # Total RSS includes database pages read through SQLite's mmap (file-backed,
+    # reclaimable, capped by mmap_size). Streamed anonymous memory levels off at
+    # SQLite's page cache (cache_size) plus one chunk.
+    common.print_table(
+        ["rows", "approach", "export s", "output MB", "peak RSS +MB", "peak anon RSS +MB", "load ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark: audit log paging - OFFSET vs. keyset cursors, COUNT(*) vs. cached counts.
+
+Fills audit_log with synthetic rows, then times loading one page at
+several depths two ways: get_audit_log() with OFFSET, which reads and
+discards every row before the page, and get_audit_page() seeking to the
+(timestamp, id) cursor of the row just before it. Both must return the
+same page. It then times the page total per filter combination:
+COUNT(*) over audit_log against get_audit_count() reading the
+trigger-maintained counts.
+
+Usage (from backend/):
+    python benchmarks/bench_audit_paging.py --rows 1000000 --depths 0 100000 999900
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import common
+
+from src.audit import get_audit_count, get_audit_log, get_audit_page
+from src.database import get_db, init_db, write_transaction
+from src.review_queue import encode_cursor
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+STATUSES = ["approved", "rejected", "escalated", "in_review"]
+PAGE_SIZE = 20
+
+
+def fill_audit_log(rows: int, batch: int = 50_000):
+    rng = random.Random(7)
+    end = datetime(2025, 1, 1)
+    for start in range(0, rows, batch):
+        entries = []
+        for _ in range(min(batch, rows - start)):
+            entries.append((
+                str(uuid.uuid4()), "PATIENT_001", f"RX-{rng.randrange(10**8):08d}", "Benchmarkol",
+                rng.choice(["auto_approve", "pharmacist_review", "reject"]), rng.random(), rng.choice(RISK_LEVELS),
+                rng.choice(STATUSES),
+                # Second resolution, so many rows share a timestamp and id breaks the ties
+                (end - timedelta(seconds=rng.randrange(rows // 4 + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            ))
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO audit_log
+                (id, patient_id_masked, prescription_id, medication_name, ai_recommendation,
+                 ai_confidence, ai_risk_level, final_status, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                entries,
+            )
+
+
+def cursor_at(depth: int, risk_level: str | None) -> str | None:
+    """Cursor for the page starting at `depth` (what the client got from the page before)."""
+    if depth == 0:
+        return None
+    where, params = ("WHERE ai_risk_level = ?", [risk_level]) if risk_level else ("", [])
+    db = get_db()
+    row = db.execute(
+        f"SELECT timestamp, id FROM audit_log {where} ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET ?",
+        [*params, depth - 1],
+    ).fetchone()
+    db.close()
+    return encode_cursor(row["timestamp"], row["id"])
+
+
+def scan_count(risk_level: str | None, status: str | None) -> int:
+    clauses = [f"{column} = ?" for column, value in (("ai_risk_level", risk_level), ("final_status", status)) if value]
+    db = get_db()
+    count = db.execute(
+        f"SELECT COUNT(*) FROM audit_log {'WHERE ' + ' AND '.join(clauses) if clauses else ''}",
+        [value for value in (risk_level, status) if value],
+    ).fetchone()[0]
+    db.close()
+    return count
+
+
+def mean_ms(fn, repeat: int, *args, **kwargs):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 100_000, 999_900])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    fill_audit_log(args.rows)
+    print(f"Inserted {args.rows} audit rows in {time.perf_counter() - started:.1f}s")
+
+    rows = []
+    for risk_level in [None, "high"]:
+        # Filtered pages run out sooner; clamp to the last page
+        last_page = get_audit_count(risk_level=risk_level) - PAGE_SIZE
+        for depth in sorted({max(0, min(depth, last_page)) for depth in args.depths}):
+            cursor = cursor_at(depth, risk_level)
+            by_offset, offset_ms = mean_ms(
+                get_audit_log, args.repeat, risk_level=risk_level, limit=PAGE_SIZE, offset=depth
+            )
+            (by_cursor, _), keyset_ms = mean_ms(
+                get_audit_page, args.repeat * 10, risk_level=risk_level, limit=PAGE_SIZE, cursor=cursor
+            )
+            assert by_offset == by_cursor, (risk_level, depth)
+            rows.append([risk_level or "all", depth, f"{offset_ms:.2f}", f"{keyset_ms:.2f}"])
+    common.print_table(["risk filter", "depth", "OFFSET ms", "keyset ms"], rows)
+
+    rows = []
+    for risk_level, status in [(None, None), ("high", None), (None, "escalated"), ("high", "escalated")]:
+        scanned, scan_ms = mean_ms(scan_count, args.repeat, risk_level, status)
+        cached, cached_ms = mean_ms(get_audit_count, args.repeat * 10, risk_level=risk_level, status=status)
+        assert scanned == cached, (risk_level, status)
+        rows.append([risk_level or "all", status or "all", scanned, f"{scan_ms:.2f}", f"{cached_ms:.3f}"])
+    common.print_table(["risk filter", "status filter", "count", "COUNT(*) ms", "cached ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
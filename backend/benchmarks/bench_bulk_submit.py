@@ -0,0 +1,83 @@
+"""Benchmark: bulk prescription submission vs. N single submit + check calls.
+
+The interaction checker is stubbed with a fixed delay standing in for the
+Claude round trip, so this runs offline and measures the API + SQLite path.
+
+Usage (from backend/):
+    python benchmarks/bench_bulk_submit.py --count 200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+import common
+
+import httpx
+
+import api
+import seed
+from src.database import init_db
+
+
+def _payload(i: int) -> dict:
+    return {
+        "patient_id": f"PAT-{i % 10 + 1:03d}",
+        "medication_name": f"Benchmarkol {i}",
+        "dosage": "10mg",
+        "frequency": "once daily",
+        "prescriber": "Dr. Bench",
+    }
+
+
+async def run(count: int, latency: float, parallelism: int):
+    async def stub_check(masked_payload: dict) -> dict:
+        await asyncio.sleep(latency)
+        return common.fake_ai_result()
+
+    api.check_interactions_async = stub_check
+    api.BULK_CHECK_PARALLELISM = parallelism
+
+    async with api.lifespan(api.app):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            for i in range(count):
+                rx = (await client.post("/api/prescriptions", json=_payload(i))).json()
+                response = await client.post(f"/api/prescriptions/{rx['id']}/check")
+                response.raise_for_status()
+            single_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/prescriptions/bulk",
+                json={"prescriptions": [_payload(i) for i in range(count)], "check_mode": "inline"},
+            )
+            response.raise_for_status()
+            bulk_seconds = time.perf_counter() - started
+            assert response.json()["failed_count"] == 0
+
+    common.print_table(
+        ["path", "prescriptions", "seconds", "rx/second"],
+        [
+            ["N single calls", count, f"{single_seconds:.2f}", f"{count / single_seconds:.1f}"],
+            [f"bulk (parallelism={parallelism})", count, f"{bulk_seconds:.2f}", f"{count / bulk_seconds:.1f}"],
+        ],
+    )
+    print(f"speedup: {single_seconds / bulk_seconds:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="stubbed AI latency in seconds")
+    parser.add_argument("--parallelism", type=int, default=api.BULK_CHECK_PARALLELISM)
+    args = parser.parse_args()
+
+    init_db()
+    seed.seed_patients()
+    asyncio.run(run(args.count, args.latency, args.parallelism))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark: check pipeline persistence, four commits vs. one unit of work.
+
+Persists the result of already-computed interaction checks both ways:
+the previous sequence (status -> checking, masking event, check row +
+status, audit entry; one commit each) and the current _save_check(),
+which writes the same rows in a single transaction. Each storage
+profile runs in its own process, with an untimed warm-up round first
+and the two approaches alternating over --rounds.
+
+The unit of work saves commits, so the gain tracks what a commit costs:
+large under the rollback journal, which syncs the database and journal
+on every commit, and small under wal (synchronous=NORMAL), where a
+commit is an append to the WAL with no fsync. Pass --synchronous FULL to
+compare every profile at the same durability.
+
+Usage (from backend/):
+    python benchmarks/bench_check_persistence.py --count 500
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+import common
+
+
+def legacy_save_check(prescription: dict, masking_result: dict, ai_result: dict, routing_decision: str):
+    """The writes the check pipeline made before the unit of work, one commit each."""
+    from api import _check_result_from_row
+    from src.audit import log_decision
+    from src.database import write_transaction
+    from src.masking import MASKED_FIELDS, log_masking_event
+
+    prescription_id = prescription["id"]
+    check_id = f"CHK-{uuid.uuid4().hex[:8].upper()}"
+    with write_transaction() as db:
+        db.execute("UPDATE prescriptions SET status = 'checking' WHERE id = ?", (prescription_id,))
+
+    log_masking_event(prescription_id=prescription_id, event_type="mask", fields_affected=MASKED_FIELDS)
+
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO interaction_checks
+            (id, prescription_id, risk_level, confidence_score, interactions_found,
+             recommendation, reasoning, masked_payload, raw_payload, routing_decision, engine)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                check_id,
+                prescription_id,
+                ai_result["risk_level"],
+                ai_result["confidence_score"],
+                json.dumps(ai_result["interactions_found"]),
+                ai_result["recommendation"],
+                ai_result["reasoning"],
+                json.dumps(masking_result["masked"]),
+                json.dumps(masking_result["raw"]),
+                routing_decision,
+                ai_result["engine"],
+            ),
+        )
+        db.execute("UPDATE prescriptions SET status = 'in_review' WHERE id = ?", (prescription_id,))
+        row = db.execute("SELECT * FROM interaction_checks WHERE id = ?", (check_id,)).fetchone()
+
+    log_decision(
+        patient_id_masked=masking_result["masked"]["patient_id"],
+        prescription_id=prescription_id,
+        medication_name=prescription["medication_name"],
+        ai_recommendation=ai_result["recommendation"],
+        ai_confidence=ai_result["confidence_score"],
+        ai_risk_level=ai_result["risk_level"],
+        final_status="in_review",
+    )
+    return _check_result_from_row(row)
+
+
+def run_profile(count: int, rounds: int) -> dict:
+    """Persist `count` checks each way per round in this process and return checks per second."""
+    import api
+    import seed
+    from src.database import STORAGE_PROFILE, get_storage_stats, init_db, storage_pragmas, write_transaction
+    from src.masking import mask_patient_data
+
+    init_db()
+    seed.seed_patients()
+
+    def prepare() -> list[tuple[dict, dict]]:
+        ids = [f"RX-{uuid.uuid4().hex[:8].upper()}" for _ in range(count)]
+        with write_transaction() as db:
+            db.executemany(
+                """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+                VALUES (?, ?, 'Benchmarkol', '10mg', 'daily', 'Dr. Bench', 'pending')""",
+                [(rx_id, f"PAT-{i % 10 + 1:03d}") for i, rx_id in enumerate(ids)],
+            )
+        inputs = []
+        for rx_id in ids:
+            patient, prescription = api._load_check_inputs(rx_id)
+            inputs.append((prescription, mask_patient_data(patient, prescription, log_event=False)))
+        return inputs
+
+    def measure(save) -> tuple[float, int]:
+        inputs = prepare()
+        before = get_storage_stats()["writer"]["transactions"]
+        started = time.perf_counter()
+        for prescription, masking_result in inputs:
+            save(prescription, masking_result, common.fake_ai_result(), "routed_to_pharmacist")
+        elapsed = time.perf_counter() - started
+        commits = get_storage_stats()["writer"]["transactions"] - before
+        return elapsed, commits // count
+
+    # One untimed round each warms the page cache and grows the journal
+    # files, then the approaches alternate so neither always runs on the
+    # larger database
+    for save in (legacy_save_check, api._save_check):
+        measure(save)
+    legacy_elapsed = unit_elapsed = 0.0
+    for _ in range(rounds):
+        elapsed, legacy_commits = measure(legacy_save_check)
+        legacy_elapsed += elapsed
+        elapsed, unit_commits = measure(api._save_check)
+        unit_elapsed += elapsed
+    legacy_rate = count * rounds / legacy_elapsed
+    unit_rate = count * rounds / unit_elapsed
+    return {
+        "profile": STORAGE_PROFILE,
+        "synchronous": storage_pragmas()["synchronous"],
+        "4-commit checks/s": round(legacy_rate),
+        "commits/check (before)": legacy_commits,
+        "unit-of-work checks/s": round(unit_rate),
+        "commits/check (after)": unit_commits,
+        "speedup": f"{unit_rate / legacy_rate:.1f}x",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["wal_durable", "wal", "rollback"])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--synchronous", default="profile",
+                        help="PRAGMA synchronous for every profile, or 'profile' to keep each profile's own")
+    parser.add_argument("--run-profile", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_profile:
+        print(json.dumps(run_profile(args.count, args.rounds)))
+        return
+
+    env = {} if args.synchronous == "profile" else {"DB_SYNCHRONOUS": args.synchronous}
+    results = [
+        common.run_isolated(__file__, [
+            "--run-profile", "--count", str(args.count), "--rounds", str(args.rounds),
+        ], DB_STORAGE_PROFILE=profile, **env)
+        for profile in args.profiles
+    ]
+    print(f"{args.count} checks persisted per approach x {args.rounds} rounds, after a warm-up round")
+    common.print_table(list(results[0]), [list(r.values()) for r in results])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark: audit trail writes - synchronous commits vs. the write-behind event writer.
+
+Several threads log a masking event and audit entry per check outside
+any write transaction, which is what the writer queues: first with it
+stopped (each log_* call commits its own transaction on the writer
+lane), then with it running (each call only queues its row). It reports the
+per-check cost on the request path, throughput to the last row written,
+and the writer's batch, flush-latency and back-pressure statistics. A
+run with a small queue shows producers waiting for room instead of
+dropping events. Each configuration runs in its own process.
+
+Usage (from backend/):
+    python benchmarks/bench_event_writer.py --checks 20000 --threads 8
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import uuid
+
+import common
+
+# (label, write-behind, extra env)
+CONFIGS = [
+    ("synchronous", False, {}),
+    ("write-behind", True, {}),
+    ("write-behind, queue 100", True, {"EVENT_WRITER_QUEUE_SIZE": "100"}),
+]
+
+
+def run_config(checks: int, threads: int, write_behind: bool) -> dict:
+    """Log `checks` checks' events from `threads` threads and return latency and writer stats."""
+    from src.audit import log_decision
+    from src.database import get_db, init_db
+    from src.event_writer import get_event_writer_stats, start_event_writer, stop_event_writer
+    from src.masking import MASKED_FIELDS, log_masking_event
+
+    init_db()
+    if write_behind:
+        start_event_writer()
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+
+    def log_checks(worker: int):
+        for _ in range(checks // threads):
+            prescription_id = f"RX-{uuid.uuid4().hex[:8].upper()}"
+            started = time.perf_counter()
+            log_masking_event(prescription_id=prescription_id, event_type="mask", fields_affected=MASKED_FIELDS)
+            log_decision(
+                patient_id_masked="PATIENT_001",
+                prescription_id=prescription_id,
+                medication_name="Benchmarkol",
+                ai_recommendation="pharmacist_review",
+                ai_confidence=0.8,
+                ai_risk_level="medium",
+                final_status="in_review",
+            )
+            latencies[worker].append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=log_checks, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    queued_seconds = time.perf_counter() - started
+    # Drains the queue; a no-op when synchronous
+    stop_event_writer()
+    written_seconds = time.perf_counter() - started
+    # After the drain, so the batches it wrote are counted
+    stats = get_event_writer_stats()
+
+    db = get_db()
+    rows = db.execute("SELECT (SELECT COUNT(*) FROM audit_log) + (SELECT COUNT(*) FROM masking_events)").fetchone()[0]
+    db.close()
+    per_check = sorted(ms * 1000 for worker in latencies for ms in worker)
+    done = len(per_check)
+    assert rows == 2 * done, (rows, done)
+    return {
+        "p50 ms": f"{statistics.median(per_check):.3f}",
+        "p99 ms": f"{per_check[int(done * 0.99) - 1]:.3f}",
+        "queued checks/s": round(done / queued_seconds),
+        "written checks/s": round(done / written_seconds),
+        "batches": stats["batches"],
+        "avg batch": stats["avg_batch_rows"],
+        "avg flush ms": stats["avg_flush_latency_ms"],
+        "max lag ms": stats["max_event_lag_ms"],
+        "peak depth": stats["peak_queue_depth"],
+        "waits": stats["backpressure_waits"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--config", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config is not None:
+        print(json.dumps(run_config(args.checks, args.threads, CONFIGS[args.config][1])))
+        return
+
+    rows = []
+    for i, (label, _, env) in enumerate(CONFIGS):
+        result = common.run_isolated(
+            __file__, ["--config", str(i), "--checks", str(args.checks), "--threads", str(args.threads)], **env
+        )
+        rows.append({"writer": label, **result})
+    print(f"{args.checks} checks (2 audit trail rows each) from {args.threads} threads")
+    common.print_table(list(rows[0]), [list(row.values()) for row in rows])
+
+
+if __name__ == "__main__":
+    main()
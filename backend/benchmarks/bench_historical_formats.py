@@ -0,0 +1,146 @@
+"""Benchmark: historical records served from JSON, a .npy bundle and Arrow.
+
+Writes one synthetic dataset per size in each format and, in a fresh
+process per file, loads it through get_historical_dataset() and serves
+the analytics read (20-threshold simulation plus the cost/ROI counts).
+Reports load time, warm request time and the resident memory the load
+added: anonymous (private heap) vs. file-backed (mapped pages, shared
+and reclaimable by the OS). JSON is skipped above --json-max records and
+Arrow when pyarrow is not installed.
+
+Usage (from backend/):
+    python benchmarks/bench_historical_formats.py --records 100000 1000000 10000000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import common
+
+import numpy as np
+
+from src import historical
+from src.threshold_simulator import RISK_ORDER
+
+THRESHOLDS = [pct / 100.0 for pct in range(80, 100)]
+
+
+def synthetic_dataset(n: int, seed: int = 7) -> historical.HistoricalDataset:
+    rng = np.random.default_rng(seed)
+    risk_code = rng.choice(4, n, p=[0.5, 0.3, 0.15, 0.05]).astype(np.int8)
+    confidence = rng.beta(8, 2, n).round(3)
+    auto_approved = (risk_code == 0) & (confidence >= 0.95)
+    return historical.HistoricalDataset(
+        confidence=confidence,
+        risk_code=risk_code,
+        recommendation_code=np.where(risk_code == 0, 0, 1).astype(np.int8),
+        auto_approved=auto_approved,
+        dangerous=rng.random(n) < 0.04,
+        decision_seconds=np.where(auto_approved, np.nan, rng.integers(20, 600, n)).astype(np.float32),
+    )
+
+
+def write_json(dataset: historical.HistoricalDataset, path: Path):
+    seconds = dataset.decision_seconds.tolist()
+    with open(path, "w") as f:
+        json.dump(
+            [
+                {
+                    "id": f"HIST-{i:08d}",
+                    "risk_level": RISK_ORDER[risk],
+                    "confidence_score": confidence,
+                    "recommendation": historical.RECOMMENDATIONS[recommendation],
+                    "routing_decision": "auto_approved" if auto else "routed_to_pharmacist",
+                    "time_to_decision_seconds": None if seconds[i] != seconds[i] else int(seconds[i]),
+                    "ground_truth_dangerous": dangerous,
+                }
+                for i, (confidence, risk, recommendation, auto, dangerous) in enumerate(zip(
+                    dataset.confidence.tolist(), dataset.risk_code.tolist(),
+                    dataset.recommendation_code.tolist(), dataset.auto_approved.tolist(),
+                    dataset.dangerous.tolist(),
+                ))
+            ],
+            f,
+        )
+
+
+def rss_kb() -> dict[str, int]:
+    """Resident memory split into anonymous and file-backed pages (Linux)."""
+    fields = {}
+    for line in Path("/proc/self/status").read_text().splitlines():
+        key, _, value = line.partition(":")
+        if key in ("RssAnon", "RssFile"):
+            fields[key] = int(value.split()[0])
+    return fields
+
+
+def serve() -> int:
+    dataset = historical.get_historical_dataset()
+    dataset.simulator.simulate(THRESHOLDS)
+    return dataset.auto_approved_count
+
+
+def run_file(repeat: int) -> dict:
+    """Load HISTORICAL_RECORDS_PATH in this process and return its measurements."""
+    before = rss_kb()
+    started = time.perf_counter()
+    serve()
+    load_ms = (time.perf_counter() - started) * 1000
+    after = rss_kb()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serve()
+    warm_ms = (time.perf_counter() - started) * 1000 / repeat
+    return {
+        "load_ms": round(load_ms, 1),
+        "warm_ms": round(warm_ms, 3),
+        "anon_mb": round((after["RssAnon"] - before["RssAnon"]) / 1024, 1),
+        "file_mb": round((after["RssFile"] - before["RssFile"]) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--json-max", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--run-file", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_file:
+        print(json.dumps(run_file(args.repeat)))
+        return
+
+    workdir = Path(tempfile.mkdtemp())
+    rows = []
+    for n in args.records:
+        dataset = synthetic_dataset(n)
+        files = {"npy": workdir / f"h{n}{historical.BUNDLE_SUFFIX}"}
+        historical.save_historical_dataset(dataset, files["npy"])
+        if historical.pa is not None:
+            files["arrow"] = workdir / f"h{n}{historical.ARROW_SUFFIX}"
+            historical.save_historical_dataset(dataset, files["arrow"])
+        if n <= args.json_max:
+            files = {"json": workdir / f"h{n}.json", **files}
+            write_json(dataset, files["json"])
+        del dataset
+
+        for fmt, path in files.items():
+            result = common.run_isolated(
+                __file__, ["--run-file", "--repeat", str(args.repeat)],
+                HISTORICAL_RECORDS_PATH=str(path),
+            )
+            rows.append([n, fmt, *result.values()])
+
+    common.print_table(
+        ["records", "format", "load ms", "warm request ms", "anon RSS +MB", "file RSS +MB"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark: historical records, JSON per request vs. cached columns.
+
+Writes synthetic historical_records.json files and serves the analytics
+read (20-threshold simulation plus the cost/ROI counts) both ways: the
+previous json.load on every request, and src.historical's parsed-once
+columnar dataset. Memory is what each approach holds while serving, as
+traced by tracemalloc: the list of record dicts vs. the typed columns
+plus the simulator's sorted index. --records 300 measures the bundled
+file as-is.
+
+Usage (from backend/):
+    python benchmarks/bench_historical_loading.py --records 300 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import common
+
+import numpy as np
+
+from src import historical
+from src.threshold_simulator import RISK_ORDER, ThresholdSimulator
+
+THRESHOLDS = [pct / 100.0 for pct in range(80, 100)]
+
+
+def write_synthetic_records(path: Path, n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    risk = rng.choice(4, n, p=[0.5, 0.3, 0.15, 0.05])
+    confidence = rng.beta(8, 2, n).round(3)
+    auto = (risk == 0) & (confidence >= 0.95)
+    seconds = rng.integers(20, 600, n)
+    records = [
+        {
+            "id": f"HIST-{i:07d}",
+            "timestamp": "2025-01-01T00:00:00",
+            "medication_name": "Benchmarkol",
+            "risk_level": RISK_ORDER[risk[i]],
+            "confidence_score": float(confidence[i]),
+            "recommendation": "auto_approve" if risk[i] == 0 else "pharmacist_review",
+            "routing_decision": "auto_approved" if auto[i] else "routed_to_pharmacist",
+            "pharmacist_decision": None if auto[i] else "approved",
+            "time_to_decision_seconds": None if auto[i] else int(seconds[i]),
+            "ground_truth_dangerous": bool(rng.random() < 0.04),
+            "ai_pharmacist_agreement": True,
+        }
+        for i in range(n)
+    ]
+    path.write_text(json.dumps(records, indent=2))
+
+
+def json_per_request(path: Path):
+    """What the analytics endpoints did on every request before the cache."""
+    with open(path) as f:
+        records = json.load(f)
+    ThresholdSimulator.from_records(records).simulate(THRESHOLDS)
+    sum(1 for r in records if r["routing_decision"] == "auto_approved")
+    return records
+
+
+def cached_columns():
+    dataset = historical.get_historical_dataset()
+    dataset.simulator.simulate(THRESHOLDS)
+    dataset.auto_approved_count
+    return dataset
+
+
+def held_bytes(fn) -> int:
+    """Bytes still allocated after one call, with its result kept alive."""
+    tracemalloc.start()
+    result = fn()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def mean_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[300, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5, help="requests timed per approach")
+    args = parser.parse_args()
+
+    bundled = historical.HISTORICAL_RECORDS_PATH
+    workdir = Path(tempfile.mkdtemp())
+    rows = []
+    for n in args.records:
+        if n == 300:
+            path = bundled
+        else:
+            path = workdir / f"historical_{n}.json"
+            write_synthetic_records(path, n)
+        historical.HISTORICAL_RECORDS_PATH = path
+
+        json_bytes = held_bytes(lambda: json_per_request(path))
+        json_ms = mean_ms(lambda: json_per_request(path), args.repeat)
+
+        historical._snapshot = None
+        column_bytes = held_bytes(cached_columns)
+        historical._snapshot = None
+        cold_ms = mean_ms(cached_columns, 1)
+        warm_ms = mean_ms(cached_columns, max(args.repeat, 100))
+
+        rows.append([
+            n, f"{os.path.getsize(path) / 1e6:.1f}",
+            f"{json_ms:.1f}", f"{json_bytes / 1e6:.1f}",
+            f"{cold_ms:.1f}", f"{warm_ms:.3f}", f"{column_bytes / 1e6:.2f}",
+            f"{json_ms / warm_ms:,.0f}x",
+        ])
+
+    common.print_table(
+        [
+            "records", "file MB", "JSON/request ms", "JSON held MB",
+            "columns cold ms", "columns warm ms", "columns held MB", "speedup",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark: review queue loading, N+1 per-item queries vs. set-based loader.
+
+Seeds the queue at several depths and reports the number of SQL
+statements and the latency of each approach. The N+1 baseline is the
+loop /api/queue used before src/review_queue.py.
+
+Usage (from backend/):
+    python benchmarks/bench_review_queue.py --depths 10 100 500 1000
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+import common
+
+import seed
+from src import database, feedback, review_queue
+from src.database import init_db
+
+
+class QueryCounter:
+    """Counts SQL statements on every connection handed out by get_db()."""
+
+    def __init__(self):
+        self.count = 0
+
+    def get_db(self):
+        conn = database.get_db()
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def _trace(self, statement: str):
+        if not statement.startswith("PRAGMA"):
+            self.count += 1
+
+
+def seed_queue(depth: int):
+    """Replace the queue with `depth` in-review checks spread over the patients."""
+    db = database.get_db()
+    db.execute("DELETE FROM pharmacist_reviews")
+    db.execute("DELETE FROM interaction_checks")
+    db.execute("DELETE FROM prescriptions")
+    for i in range(depth):
+        rx_id = f"RX-{uuid.uuid4().hex[:8].upper()}"
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+            VALUES (?, ?, 'Benchmarkol', '10mg', 'daily', 'Dr. Bench', 'in_review')""",
+            (rx_id, f"PAT-{i % 10 + 1:03d}"),
+        )
+        db.execute(
+            """INSERT INTO interaction_checks
+            (id, prescription_id, risk_level, confidence_score, interactions_found,
+             recommendation, reasoning, masked_payload, raw_payload, routing_decision)
+            VALUES (?, ?, 'medium', 0.8, '[]', 'pharmacist_review', ?, '{}', '{}', 'routed_to_pharmacist')""",
+            (f"CHK-{uuid.uuid4().hex[:8].upper()}", rx_id, "Benchmark reasoning. " * 20),
+        )
+    db.commit()
+    db.close()
+
+
+def legacy_load_queue(get_db) -> list[dict]:
+    """The original N+1 queue loader: 4 extra queries (and a connection) per item."""
+    db = get_db()
+    checks = db.execute("""
+        SELECT ic.*, p.status as rx_status
+        FROM interaction_checks ic
+        JOIN prescriptions p ON ic.prescription_id = p.id
+        WHERE ic.routing_decision = 'routed_to_pharmacist'
+        AND p.status = 'in_review'
+        ORDER BY ic.created_at DESC
+    """).fetchall()
+
+    items = []
+    for check in checks:
+        rx = db.execute("SELECT * FROM prescriptions WHERE id = ?", (check["prescription_id"],)).fetchone()
+        patient = db.execute("SELECT * FROM patients WHERE id = ?", (rx["patient_id"],)).fetchone()
+        meds = db.execute(
+            "SELECT * FROM patient_medications WHERE patient_id = ? AND active = 1",
+            (rx["patient_id"],),
+        ).fetchall()
+        review = feedback.get_review_for_check(check["id"])
+        items.append({
+            "prescription": dict(rx),
+            "patient": {**dict(patient), "allergies": json.loads(patient["allergies"])},
+            "medications": [dict(m) for m in meds],
+            "interaction_check": dict(check),
+            "review": review,
+        })
+    db.close()
+    return items
+
+
+def measure(load, counter: QueryCounter, repeat: int) -> tuple[int, float]:
+    """Return (queries per load, median milliseconds per load)."""
+    timings = []
+    for _ in range(repeat):
+        counter.count = 0
+        started = time.perf_counter()
+        load()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return counter.count, timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    seed.seed_patients()
+
+    counter = QueryCounter()
+    feedback.get_db = counter.get_db
+    review_queue.get_db = counter.get_db
+
+    rows = []
+    for depth in args.depths:
+        seed_queue(depth)
+        legacy_queries, legacy_ms = measure(lambda: legacy_load_queue(counter.get_db), counter, args.repeat)
+        new_queries, new_ms = measure(review_queue.load_review_queue, counter, args.repeat)
+        assert len(review_queue.load_review_queue()) == depth
+        rows.append([depth, legacy_queries, f"{legacy_ms:.1f}", new_queries, f"{new_ms:.1f}"])
+
+    common.print_table(
+        ["queue depth", "N+1 queries", "N+1 ms", "set-based queries", "set-based ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
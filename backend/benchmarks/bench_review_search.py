@@ -0,0 +1,172 @@
+"""Benchmark: review text search - LIKE scan vs. the FTS5 index.
+
+Fills audit_log with synthetic pharmacist feedback (and a share of
+interaction checks with AI reasoning), then runs keyword searches from
+rare to common terms two ways: a LIKE '%term%' scan over both text
+columns for every match, the only option before the index, and
+search_reviews() against the trigger-maintained review_search index,
+top 20 by bm25 with snippets. truncated marks queries with more matches
+than SEARCH_RANK_WINDOW, ranked over the newest of them only; run with
+SEARCH_RANK_WINDOW=0 to rank every match. It also reports insert
+throughput with the search triggers on.
+
+Usage (from backend/):
+    python benchmarks/bench_review_search.py --rows 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+import common
+
+from src.database import get_db, init_db, write_transaction
+from src.search import match_expression, search_reviews
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+
+# Synthetic drug names, so a drug term matches a small share of entries
+DRUGS = [f"{stem}{suffix}" for stem in ("warfa", "clopi", "metfo", "lisino", "atorva", "sertra", "amiodo", "digo",
+                                        "levo", "predni", "tramo", "fluco") for suffix in ("rin", "dol", "pril", "zole",
+                                                                                           "statin", "xine", "pam",
+                                                                                           "mab", "cillin", "done")]
+
+REASONS = [
+    "bleeding risk is elevated", "QT prolongation on the last ECG", "renal function has declined",
+    "serotonin syndrome risk", "duplicate therapy with the current list", "dose exceeds the weight-based maximum",
+    "hepatic impairment noted in the chart", "patient reports a prior rash", "interaction is clinically minor",
+    "monitoring plan agreed with the prescriber", "hypotension when combined", "hypoglycaemia reported previously",
+]
+
+OPENERS = [
+    "Overrode the AI:", "Agree with the AI;", "Escalated to the prescriber because", "Rejected -",
+    "Approved after checking labs;", "Called the patient:", "Discussed with the attending;",
+]
+
+# (label, query, source)
+QUERIES = [
+    ("one drug", "warfarin", None),
+    ("two drugs", "warfarin digoxine", None),
+    ("drug + reason", "clopidol bleeding", None),
+    ("stemmed reason", "prolong", None),
+    ("prefix", "lisino*", None),
+    ("common word", "patient", None),
+    ("feedback only", "rash", "feedback"),
+    ("reasoning only", "hypotension", "reasoning"),
+]
+
+
+def review_text(rng: random.Random) -> str:
+    first, second = rng.sample(DRUGS, 2)
+    return f"{rng.choice(OPENERS)} {first} with {second}, {rng.choice(REASONS)}. {rng.choice(REASONS).capitalize()}."
+
+
+def fill(rows: int, checks: int, batch: int = 50_000):
+    """Insert audit entries and interaction checks, interleaved in time like live traffic."""
+    rng = random.Random(7)
+    with write_transaction() as db:
+        db.execute(
+            "INSERT OR IGNORE INTO patients (id, name, date_of_birth, weight_kg) "
+            "VALUES ('PATIENT_001', 'Benchmark', '1950-01-01', 70)"
+        )
+    batches = max(1, -(-rows // batch))
+    checks_done = 0
+    for i in range(batches):
+        audit_count = min(batch, rows - i * batch)
+        check_count = checks * (i + 1) // batches - checks_done
+        prescriptions = [f"RX-{checks_done + j:08d}" for j in range(check_count)]
+        checks_done += check_count
+        with write_transaction() as db:
+            db.executemany(
+                "INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber) "
+                "VALUES (?, 'PATIENT_001', ?, '5 mg', 'daily', 'Dr. Bench')",
+                [(rx, rng.choice(DRUGS)) for rx in prescriptions],
+            )
+            db.executemany(
+                """INSERT INTO interaction_checks
+                (id, prescription_id, risk_level, confidence_score, interactions_found, recommendation,
+                 reasoning, masked_payload, raw_payload, routing_decision)
+                VALUES (?, ?, ?, ?, '[]', 'pharmacist_review', ?, '{}', '{}', 'routed_to_pharmacist')""",
+                [(str(uuid.uuid4()), rx, rng.choice(RISK_LEVELS), rng.random(), review_text(rng))
+                 for rx in prescriptions],
+            )
+            db.executemany(
+                """INSERT INTO audit_log
+                (id, patient_id_masked, prescription_id, medication_name, ai_recommendation, ai_confidence,
+                 ai_risk_level, pharmacist_decision, pharmacist_feedback, final_status)
+                VALUES (?, 'PATIENT_001', ?, ?, 'pharmacist_review', ?, ?, ?, ?, ?)""",
+                [(
+                    str(uuid.uuid4()), f"RX-{rng.randrange(10**8):08d}", rng.choice(DRUGS), rng.random(),
+                    rng.choice(RISK_LEVELS), decision, review_text(rng), decision,
+                ) for decision in (rng.choice(["approved", "rejected", "escalated"]) for _ in range(audit_count))],
+            )
+
+
+def like_scan(query: str, source: str | None) -> int:
+    """Entries containing every term, by LIKE over the text columns.
+
+    Every match is needed before any ranking, so there is no LIMIT.
+    """
+    terms = [term.rstrip("*") for term in query.split()]
+    selects = []
+    if source in (None, "feedback"):
+        selects.append(("SELECT id FROM audit_log WHERE ", "pharmacist_feedback"))
+    if source in (None, "reasoning"):
+        selects.append(("SELECT id FROM interaction_checks WHERE ", "reasoning"))
+    sql = " UNION ALL ".join(
+        select + " AND ".join(f"{column} LIKE ?" for _ in terms) for select, column in selects
+    )
+    db = get_db()
+    rows = db.execute(sql, [f"%{term}%" for _ in selects for term in terms]).fetchall()
+    db.close()
+    return len(rows)
+
+
+def median_ms(fn, repeat: int, *args):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - started)
+    return result, statistics.median(times) * 1000
+
+
+def match_count(query: str, source: str | None) -> int:
+    db = get_db()
+    count = db.execute(
+        "SELECT COUNT(*) FROM review_search WHERE review_search MATCH ?", (match_expression(query, source),)
+    ).fetchone()[0]
+    db.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="audit entries with pharmacist feedback")
+    parser.add_argument("--checks", type=int, default=None, help="interaction checks (default rows / 10)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    checks = args.checks if args.checks is not None else args.rows // 10
+
+    init_db()
+    started = time.perf_counter()
+    fill(args.rows, checks)
+    seconds = time.perf_counter() - started
+    print(f"Inserted {args.rows} audit entries and {checks} checks in {seconds:.1f}s "
+          f"({(args.rows + checks) / seconds:,.0f} rows/s with the search triggers on)")
+
+    rows = []
+    for label, query, source in QUERIES:
+        _, like_ms = median_ms(like_scan, max(1, args.repeat // 10), query, source)
+        (hits, truncated), fts_ms = median_ms(search_reviews, args.repeat, query, source)
+        rows.append([label, query, source or "both", match_count(query, source), len(hits),
+                     "yes" if truncated else "no", f"{like_ms:.1f}", f"{fts_ms:.2f}"])
+    common.print_table(
+        ["query", "terms", "source", "matches", "hits", "truncated", "LIKE scan ms", "FTS5 median ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Benchmark: concurrent readers and writers under each SQLite storage profile.
+
+Reader threads page through the review queue and count audit rows while
+writer threads save interaction checks (check + prescription status +
+audit entry) through the single-writer lane. With the rollback journal
+readers stall behind every commit; with WAL they do not.
+
+The workload runs for --warmup seconds before anything is recorded, and
+every profile runs with the same PRAGMA synchronous (--synchronous, FULL
+by default), so commits make the same fsyncs under every profile. Pass --synchronous profile to keep each profile's own setting
+instead.
+
+WAL's win here is for readers: they keep running during commits instead
+of stalling behind them (compare read_p99_ms and read_max_ms), and on
+its own a commit costs less than under the rollback journal (run with
+--readers 0). writes_per_s with many readers is not a storage number.
+Every thread shares one GIL, and closed-loop readers that never block
+take CPU time from the writers. Under the rollback journal the readers
+are blocked for much of the run, so the writers get more of it.
+
+Each profile runs in a fresh subprocess with its own database, because
+the profile is applied when src.database is imported.
+
+Usage (from backend/):
+    python benchmarks/bench_sqlite_concurrency.py --readers 8 --writers 4 --seconds 5
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+
+import common
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def run_profile(readers: int, writers: int, seconds: float, warmup: float, queue_depth: int) -> dict:
+    """Run the stress workload in this process and return its measurements."""
+    import seed
+    from src import review_queue
+    from src.database import get_db, init_db, storage_pragmas, write_transaction, STORAGE_PROFILE
+
+    init_db()
+    seed.seed_patients()
+    with write_transaction() as db:
+        for i in range(queue_depth):
+            save_check(db, i)
+
+    stop = threading.Event()
+    recording = threading.Event()
+    read_ms: list[float] = []
+    write_ms: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                review_queue.load_review_queue_page(limit=50, summary=True)
+                db = get_db()
+                db.execute("SELECT COUNT(*) FROM audit_log").fetchone()
+                db.close()
+            except Exception as exc:
+                with lock:
+                    errors.append(f"read: {exc}")
+                continue
+            if recording.is_set():
+                with lock:
+                    read_ms.append((time.perf_counter() - started) * 1000)
+
+    def writer(worker: int):
+        n = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with write_transaction() as db:
+                    save_check(db, worker * 1_000_000 + n)
+            except Exception as exc:
+                with lock:
+                    errors.append(f"write: {exc}")
+                continue
+            n += 1
+            if recording.is_set():
+                with lock:
+                    write_ms.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(warmup)
+    recording.set()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "profile": STORAGE_PROFILE,
+        "journal_mode": storage_pragmas()["journal_mode"],
+        "synchronous": storage_pragmas()["synchronous"],
+        "reads_per_s": round(len(read_ms) / seconds),
+        "read_p50_ms": round(percentile(read_ms, 0.50), 2),
+        "read_p99_ms": round(percentile(read_ms, 0.99), 2),
+        "read_max_ms": round(max(read_ms, default=0.0), 1),
+        "writes_per_s": round(len(write_ms) / seconds),
+        "write_p99_ms": round(percentile(write_ms, 0.99), 2),
+        "errors": len(errors),
+    }
+
+
+def save_check(db, n: int):
+    """The writes _save_check() makes for one interaction check."""
+    rx_id = f"RX-{uuid.uuid4().hex[:8].upper()}"
+    check_id = f"CHK-{uuid.uuid4().hex[:8].upper()}"
+    db.execute(
+        """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+        VALUES (?, ?, 'Benchmarkol', '10mg', 'daily', 'Dr. Bench', 'in_review')""",
+        (rx_id, f"PAT-{n % 10 + 1:03d}"),
+    )
+    db.execute(
+        """INSERT INTO interaction_checks
+        (id, prescription_id, risk_level, confidence_score, interactions_found,
+         recommendation, reasoning, masked_payload, raw_payload, routing_decision)
+        VALUES (?, ?, 'medium', 0.8, '[]', 'pharmacist_review', ?, '{}', '{}', 'routed_to_pharmacist')""",
+        (check_id, rx_id, "Benchmark reasoning. " * 20),
+    )
+    db.execute(
+        """INSERT INTO audit_log
+        (id, patient_id_masked, prescription_id, medication_name,
+         ai_recommendation, ai_confidence, ai_risk_level, final_status)
+        VALUES (?, ?, ?, 'Benchmarkol', 'pharmacist_review', 0.8, 'medium', 'in_review')""",
+        (str(uuid.uuid4()), f"PATIENT_{n % 10 + 1:03d}", rx_id),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["rollback", "wal"])
+    parser.add_argument("--synchronous", default="FULL",
+                        help="PRAGMA synchronous for every profile, or 'profile' to keep each profile's own")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--queue-depth", type=int, default=500)
+    parser.add_argument("--run-profile", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_profile:
+        result = run_profile(args.readers, args.writers, args.seconds, args.warmup, args.queue_depth)
+        print(json.dumps(result))
+        return
+
+    env = {} if args.synchronous == "profile" else {"DB_SYNCHRONOUS": args.synchronous}
+    rows = []
+    for profile in args.profiles:
+        result = common.run_isolated(__file__, [
+            "--run-profile",
+            "--readers", str(args.readers),
+            "--writers", str(args.writers),
+            "--seconds", str(args.seconds),
+            "--warmup", str(args.warmup),
+            "--queue-depth", str(args.queue_depth),
+        ], DB_STORAGE_PROFILE=profile, **env)
+        rows.append(list(result.values()))
+        headers = list(result)
+
+    print(
+        f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per profile "
+        f"after {args.warmup:g}s warm-up, synchronous={args.synchronous}"
+    )
+    common.print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: threshold simulation, nested Python loop vs. ThresholdSimulator.
+
+Generates synthetic historical records and times the 20-threshold sweep
+the analytics endpoint used to run as a loop over every record, the same
+sweep on ThresholdSimulator, a dense sweep of many thresholds, and a
+1000-threshold x 4 max-risk x 2 AI-gate grid. The loop baseline is
+skipped above --loop-max records.
+
+Usage (from backend/):
+    python benchmarks/bench_threshold_simulation.py --records 300 100000 5000000
+"""
+
+import argparse
+import time
+
+import common
+
+import numpy as np
+
+from src.threshold_simulator import RISK_ORDER, ThresholdSimulator
+
+RISK_LEVELS = np.array(RISK_ORDER)
+
+
+def synthetic_records(n: int, seed: int = 7) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    risk_code = rng.choice(4, n, p=[0.5, 0.3, 0.15, 0.05]).astype(np.int8)
+    return {
+        "confidence": rng.beta(8, 2, n),
+        "risk_code": risk_code,
+        "risk_level": RISK_LEVELS[risk_code],
+        "ai_approves": (risk_code == 0) & (rng.random(n) < 0.8),
+        "dangerous": rng.random(n) < 0.04,
+    }
+
+
+def loop_sweep(records: list[dict], thresholds: list[float]) -> list[tuple[int, int]]:
+    """The per-record loop previously inlined in simulate_thresholds()."""
+    results = []
+    for threshold in thresholds:
+        auto_approved = 0
+        false_negatives = 0
+        for rec in records:
+            if rec["confidence_score"] >= threshold and rec["risk_level"] == "low":
+                auto_approved += 1
+                if rec["ground_truth_dangerous"]:
+                    false_negatives += 1
+        results.append((auto_approved, false_negatives))
+    return results
+
+
+def timed(fn) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[300, 100_000, 5_000_000])
+    parser.add_argument("--dense", type=int, default=10_000, help="thresholds in the dense sweep")
+    parser.add_argument("--loop-max", type=int, default=200_000)
+    args = parser.parse_args()
+
+    thresholds = [pct / 100.0 for pct in range(80, 100)]
+    dense = np.linspace(0.0, 1.0, args.dense)
+    grid = np.linspace(0.5, 1.0, 1000)
+
+    rows = []
+    for n in args.records:
+        data = synthetic_records(n)
+        simulator, build_ms = timed(
+            lambda: ThresholdSimulator(data["confidence"], data["risk_code"], data["ai_approves"], data["dangerous"])
+        )
+        outcome, sweep_ms = timed(lambda: simulator.simulate(thresholds))
+        _, dense_ms = timed(lambda: simulator.simulate(dense))
+        _, grid_ms = timed(lambda: simulator.sweep(grid, list(RISK_ORDER), [False, True]))
+
+        loop_ms = "skipped"
+        if n <= args.loop_max:
+            records = [
+                {"confidence_score": c, "risk_level": r, "ground_truth_dangerous": d}
+                for c, r, d in zip(data["confidence"].tolist(), data["risk_level"].tolist(), data["dangerous"].tolist())
+            ]
+            expected, elapsed = timed(lambda: loop_sweep(records, thresholds))
+            assert expected == list(zip(outcome["auto_approved"].tolist(), outcome["false_negatives"].tolist()))
+            loop_ms = f"{elapsed:.1f}"
+
+        rows.append([
+            n, loop_ms, f"{build_ms:.1f}", f"{sweep_ms:.3f}", f"{dense_ms:.2f}",
+            f"{grid_ms:.2f}",
+        ])
+
+    common.print_table(
+        [
+            "records", "loop 20 thr ms", "build ms", "vectorized 20 thr ms",
+            f"vectorized {args.dense} thr ms", "grid 1000x4x2 ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Shared setup for the SafeRx benchmarks.
+
+Import this module first: it puts the backend on sys.path and points
+DATABASE_PATH at a throwaway SQLite file before any src module reads it.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("DATABASE_PATH", str(Path(tempfile.mkdtemp()) / "bench.db"))
+DATABASE_PATH = os.environ["DATABASE_PATH"]
+
+
+def fake_ai_result(risk_level: str = "medium") -> dict:
+    """A canned interaction check result, as returned by check_interactions_async()."""
+    return {
+        "risk_level": risk_level,
+        "confidence_score": 0.8,
+        "interactions_found": [],
+        "recommendation": "pharmacist_review",
+        "reasoning": "Benchmark stub - no AI call made.",
+        "engine": "llm",
+    }
+
+
+def print_table(headers: list[str], rows: list[list]):
+    """Print rows as a fixed-width table."""
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)
+    ]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def run_with_profile(script: str, profile: str, args: list[str]) -> dict:
+    """Run `script --run-profile ...` under a storage profile with a fresh database.
+
+    The storage profile is applied when src.database is imported, so each
+    profile needs its own process.
+    """
+    return run_isolated(script, ["--run-profile", *args], DB_STORAGE_PROFILE=profile)
+
+
+def run_isolated(script: str, args: list[str], **env: str) -> dict:
+    """Run `script ...` in a new process with a fresh database and extra env vars.
+
+    Pass DATABASE_PATH to run against an existing database instead. The
+    script prints its result as JSON on the last line of stdout.
+    """
+    env = {**os.environ, "DATABASE_PATH": str(Path(tempfile.mkdtemp()) / "bench.db"), **env}
+    output = subprocess.run(
+        [sys.executable, script, *args],
+        env=env, cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
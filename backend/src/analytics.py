@@ -0,0 +1,154 @@
+"""Dashboard metrics over the audit log.
+
+summary_metrics() backs /api/analytics/summary and the live part of
+/api/analytics/cost-roi. It reads the trigger-maintained
+analytics_aggregates table, and falls back to scan_summary_metrics() -
+every metric in one pass over audit_log with conditional aggregation -
+when that table hasn't been built.
+
+timeseries_metrics() backs /api/analytics/timeseries: the same counts
+per hour or day, read from the trigger-maintained analytics_rollups.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+from src.analytics_aggregates import group_counts, load_aggregates
+from src.constants import RISK_ORDER
+from src.database import ROLLUP_METRICS, get_db
+
+# One scan of audit_log. COUNT(col) and FILTER clauses keep the per-row
+# work down; they measure faster than SUM(<boolean>) over large logs.
+SUMMARY_SCAN_SQL = f"""SELECT
+    COUNT(*) AS total,
+    COUNT(*) FILTER (WHERE pharmacist_decision IS NULL AND final_status = 'approved') AS auto_approved,
+    COUNT(pharmacist_decision) AS pharmacist_reviewed,
+    COUNT(*) FILTER (WHERE ai_pharmacist_agreement = 0) AS overrides,
+    AVG(ai_confidence) AS average_confidence,
+    AVG(time_to_decision_seconds) AS average_time_to_decision_seconds,
+    {", ".join(f"COUNT(*) FILTER (WHERE ai_risk_level = '{level}') AS risk_{level}" for level in RISK_ORDER)}
+FROM audit_log"""
+
+
+def scan_summary_metrics() -> dict:
+    """Compute the dashboard metrics with a single scan of audit_log."""
+    db = get_db()
+    row = db.execute(SUMMARY_SCAN_SQL).fetchone()
+    db.close()
+    return {
+        "total": row["total"],
+        "auto_approved": row["auto_approved"],
+        "pharmacist_reviewed": row["pharmacist_reviewed"],
+        "overrides": row["overrides"],
+        "average_confidence": row["average_confidence"],
+        "average_time_to_decision_seconds": row["average_time_to_decision_seconds"],
+        "risk_distribution": {level: row[f"risk_{level}"] for level in RISK_ORDER},
+    }
+
+
+def _metrics_from_aggregates(aggregates: dict[str, float]) -> dict:
+    confidence_count = aggregates.get("confidence_count", 0)
+    decision_time_count = aggregates.get("decision_time_count", 0)
+    risk_distribution = dict.fromkeys(RISK_ORDER, 0)
+    risk_distribution.update(group_counts(aggregates, "risk"))
+    return {
+        "total": int(aggregates.get("total", 0)),
+        "auto_approved": int(aggregates.get("auto_approved", 0)),
+        "pharmacist_reviewed": int(aggregates.get("pharmacist_reviewed", 0)),
+        "overrides": int(aggregates.get("overrides", 0)),
+        "average_confidence": (
+            aggregates.get("confidence_sum", 0.0) / confidence_count if confidence_count else None
+        ),
+        "average_time_to_decision_seconds": (
+            aggregates.get("decision_time_sum", 0) / decision_time_count if decision_time_count else None
+        ),
+        "risk_distribution": risk_distribution,
+    }
+
+
+def summary_metrics() -> dict:
+    """Dashboard metrics over the audit log.
+
+    Returns:
+        total, auto_approved, pharmacist_reviewed, overrides (counts);
+        average_confidence, average_time_to_decision_seconds (None when
+        no rows have a value); risk_distribution (count per risk level).
+    """
+    aggregates = load_aggregates()
+    if aggregates is None:
+        return scan_summary_metrics()
+    return _metrics_from_aggregates(aggregates)
+
+
+# Length of each analytics_rollups bucket (keys as written by ROLLUP_BUCKETS)
+ROLLUP_STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+_HOUR_SUFFIXES = [f" {hour:02d}:00:00" for hour in range(24)]
+
+# Rollup metrics that are sums of values rather than counts of rows
+_SUM_METRICS = ("confidence_sum", "decision_time_sum")
+
+
+def bucket_floor(moment: datetime, granularity: str) -> datetime:
+    """Start of the hour or day bucket containing `moment` (naive UTC)."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if granularity == "day" else moment
+
+
+def bucket_count(granularity: str, start: datetime, end: datetime) -> int:
+    """Number of buckets overlapping [start, end)."""
+    return max(0, math.ceil((end - bucket_floor(start, granularity)) / ROLLUP_STEPS[granularity]))
+
+
+def bucket_keys(granularity: str, start: datetime, end: datetime) -> list[str]:
+    """analytics_rollups bucket keys for every bucket overlapping [start, end)."""
+    first = bucket_floor(start, granularity)
+    count = bucket_count(granularity, start, end)
+    if granularity == "day":
+        return [f"{first + timedelta(days=i):%Y-%m-%d}" for i in range(count)]
+    # Format each day once and append the hours; strftime per hour is the slow part
+    days = math.ceil((first.hour + count) / 24)
+    keys = []
+    for i in range(days):
+        day = f"{first + timedelta(days=i):%Y-%m-%d}"
+        keys.extend(day + suffix for suffix in _HOUR_SUFFIXES)
+    return keys[first.hour:first.hour + count]
+
+
+def timeseries_metrics(granularity: str, start: datetime, end: datetime) -> dict:
+    """Dashboard counts per bucket for every bucket overlapping [start, end).
+
+    Times are naive UTC, like audit_log.timestamp. Buckets without audit
+    rows are zero-filled, so every list has one entry per bucket.
+
+    Returns:
+        buckets (bucket start times, "YYYY-MM-DD[ HH:00:00]"), then lists
+        aligned with them: total, auto_approved, pharmacist_reviewed,
+        overrides, confidence_sum/_count, decision_time_sum/_count, and
+        risk_distribution (list per risk level).
+    """
+    buckets = bucket_keys(granularity, start, end)
+    stored = {}
+    if buckets:
+        columns = ", ".join(
+            metric if metric in _SUM_METRICS else f"CAST({metric} AS INTEGER)" for metric in ROLLUP_METRICS
+        )
+        db = get_db()
+        cursor = db.cursor()
+        cursor.row_factory = None  # plain tuples; a year of hourly rows is ~9k
+        rows = cursor.execute(
+            f"SELECT bucket, {columns} FROM analytics_rollups "
+            "WHERE granularity = ? AND bucket >= ? AND bucket <= ?",
+            (granularity, buckets[0], buckets[-1]),
+        ).fetchall()
+        db.close()
+        stored = {row[0]: row[1:] for row in rows}
+
+    zeros = (0,) * len(ROLLUP_METRICS)
+    columns = zip(*(stored.get(bucket, zeros) for bucket in buckets)) if buckets else [()] * len(ROLLUP_METRICS)
+    series = {metric: list(values) for metric, values in zip(ROLLUP_METRICS, columns)}
+
+    return {
+        "buckets": buckets,
+        **{metric: series[metric] for metric in ROLLUP_METRICS if not metric.startswith("risk_")},
+        "risk_distribution": {level: series[f"risk_{level}"] for level in RISK_ORDER},
+    }
@@ -0,0 +1,132 @@
+"""Dashboard aggregates read from analytics_aggregates, plus a consistency check.
+
+The audit_log triggers installed by init_db() keep analytics_aggregates
+(all-time totals) and analytics_rollups (hourly and daily buckets) up
+to date in the same transaction as each audit write, so reading the
+dashboard totals is a lookup of a few rows instead of a scan of the
+audit log. check_aggregates() recomputes every metric and bucket from
+audit_log and reports drift; rebuild() replaces both tables with the
+recomputed values.
+
+Usage (from backend/):
+    python -m src.analytics_aggregates            # check
+    python -m src.analytics_aggregates --rebuild  # check, then rebuild if anything drifted
+"""
+
+import argparse
+import math
+import sys
+
+from src.database import (
+    ROLLUP_BUCKETS, ROLLUP_METRICS, compute_aggregates, get_db, rebuild_aggregates,
+    rollup_select_sql, write_transaction,
+)
+
+# Confidence sums are REAL and pick up rounding error as rows are updated
+SUM_TOLERANCE = 1e-6
+
+
+def _stored_aggregates(db) -> dict[str, float]:
+    rows = db.execute("SELECT metric, value FROM analytics_aggregates").fetchall()
+    return {row["metric"]: row["value"] for row in rows}
+
+
+def load_aggregates() -> dict[str, float] | None:
+    """Current aggregate values: metric -> value (missing metrics are zero).
+
+    Returns None if the table hasn't been built (init_db() not run yet).
+    """
+    db = get_db()
+    aggregates = _stored_aggregates(db)
+    db.close()
+    if aggregates.pop("aggregates_version", None) is None:
+        return None
+    return aggregates
+
+
+def load_count(metric: str) -> int | None:
+    """One count metric, e.g. "risk:high" (0 when no rows have it).
+
+    Returns None if the table hasn't been built (init_db() not run yet).
+    """
+    db = get_db()
+    rows = db.execute(
+        "SELECT metric, value FROM analytics_aggregates WHERE metric IN ('aggregates_version', ?)",
+        (metric,),
+    ).fetchall()
+    db.close()
+    values = {row["metric"]: row["value"] for row in rows}
+    if "aggregates_version" not in values:
+        return None
+    return int(values.get(metric, 0))
+
+
+def group_counts(aggregates: dict[str, float], prefix: str) -> dict[str, int]:
+    """Counts per value for one of AUDIT_AGGREGATE_GROUPS, e.g. group_counts(agg, "risk")."""
+    return {
+        metric.split(":", 1)[1]: int(value)
+        for metric, value in aggregates.items()
+        if metric.startswith(f"{prefix}:") and value
+    }
+
+
+def check_aggregates() -> list[str]:
+    """Return one message per metric whose stored value differs from audit_log (empty if consistent)."""
+    db = get_db()
+    # One read transaction, so both sides see the same snapshot under concurrent writes
+    db.execute("BEGIN")
+    try:
+        expected = compute_aggregates(db)
+        stored = _stored_aggregates(db)
+        stored.pop("aggregates_version", None)
+        for granularity in ROLLUP_BUCKETS:
+            for row in db.execute(rollup_select_sql(granularity)):
+                expected.update(_rollup_metrics(row))
+            for row in db.execute(
+                f"SELECT granularity, bucket, {', '.join(ROLLUP_METRICS)} FROM analytics_rollups "
+                "WHERE granularity = ?",
+                (granularity,),
+            ):
+                stored.update(_rollup_metrics(row))
+    finally:
+        db.rollback()
+        db.close()
+
+    failures = []
+    for metric in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(metric, 0), stored.get(metric, 0)
+        if not math.isclose(want, have, rel_tol=SUM_TOLERANCE, abs_tol=SUM_TOLERANCE):
+            failures.append(f"{metric}: stored {have:g}, audit_log has {want:g}")
+    return failures
+
+
+def _rollup_metrics(row) -> dict[str, float]:
+    """One rollup row as "<granularity> <bucket> <metric>" -> value."""
+    granularity, bucket, *values = row
+    return {f"{granularity} {bucket} {metric}": value for metric, value in zip(ROLLUP_METRICS, values)}
+
+
+def rebuild():
+    """Recompute analytics_aggregates and analytics_rollups from audit_log."""
+    with write_transaction() as db:
+        rebuild_aggregates(db)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the analytics aggregates against audit_log.")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the aggregates if they drifted")
+    args = parser.parse_args()
+
+    failures = check_aggregates()
+    for failure in failures:
+        print(f"DRIFT {failure}")
+    if failures and args.rebuild:
+        rebuild()
+        print("Rebuilt analytics_aggregates from audit_log")
+        return 0 if not check_aggregates() else 1
+    print("Aggregates match audit_log" if not failures else f"{len(failures)} metrics drifted")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
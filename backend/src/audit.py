@@ -7,9 +7,58 @@ compliance, analytics, and feedback loop analysis.
 import csv
 import io
 import json
+import os
 import uuid
-
-from src.database import get_db
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from src.analytics_aggregates import load_count
+from src.database import get_db, write_transaction
+from src.event_writer import enqueue_event, flush_events, sqlite_now
+from src.review_queue import decode_cursor, encode_cursor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow exports are optional; CSV needs only the stdlib
+    pa = pq = None
+
+# audit_log.timestamp as written by SQLite's datetime('now')
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Audit rows formatted per chunk of a streamed export
+EXPORT_CHUNK_ROWS = int(os.getenv("AUDIT_EXPORT_CHUNK_ROWS", "5000"))
+
+# Audit rows per Parquet row group / Arrow record batch in a columnar export
+EXPORT_ROW_GROUP_ROWS = int(os.getenv("AUDIT_EXPORT_ROW_GROUP_ROWS", "65536"))
+
+# zlib level for gzipped exports; 6 is gzip's default speed/size trade-off
+EXPORT_GZIP_LEVEL = 6
+
+EXPORT_PARQUET_COMPRESSION = "zstd"
+
+# Largest page get_audit_page() returns; /api/audit rejects larger limits
+MAX_AUDIT_PAGE_SIZE = 1000
+
+# Arrow column types for audit_log, in table order
+if pa is not None:
+    AUDIT_ARROW_TYPES = {
+        "id": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "patient_id_masked": pa.string(),
+        "prescription_id": pa.string(),
+        "medication_name": pa.string(),
+        "ai_recommendation": pa.string(),
+        "ai_confidence": pa.float64(),
+        "ai_risk_level": pa.string(),
+        "pharmacist_decision": pa.string(),
+        "pharmacist_feedback": pa.string(),
+        "ai_pharmacist_agreement": pa.bool_(),
+        "time_to_decision_seconds": pa.int64(),
+        "final_status": pa.string(),
+    }
+    AUDIT_ARROW_SCHEMA = pa.schema(list(AUDIT_ARROW_TYPES.items()))
 
 
 def log_decision(
@@ -24,17 +73,17 @@ def log_decision(
     """Create an audit log entry when the AI makes a recommendation.
 
     Called after the interaction check completes and routing decision is made.
+    The entry is queued for the event writer (see src/event_writer.py).
 
     Returns:
         The audit log entry ID.
     """
     entry_id = str(uuid.uuid4())
-    db = get_db()
-    db.execute(
+    enqueue_event(
         """INSERT INTO audit_log
         (id, patient_id_masked, prescription_id, medication_name,
-         ai_recommendation, ai_confidence, ai_risk_level, final_status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+         ai_recommendation, ai_confidence, ai_risk_level, final_status, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (
             entry_id,
             patient_id_masked,
@@ -44,10 +93,9 @@ def log_decision(
             ai_confidence,
             ai_risk_level,
             final_status,
+            sqlite_now(),
         ),
     )
-    db.commit()
-    db.close()
     return entry_id
 
 
@@ -64,30 +112,68 @@ def update_audit_with_review(
     Adds the human decision alongside the AI recommendation so we can
     calculate override rates and agreement metrics.
     """
-    db = get_db()
     agreement_int = None
     if ai_pharmacist_agreement is not None:
         agreement_int = 1 if ai_pharmacist_agreement else 0
 
-    db.execute(
-        """UPDATE audit_log SET
-        pharmacist_decision = ?,
-        pharmacist_feedback = ?,
-        ai_pharmacist_agreement = ?,
-        time_to_decision_seconds = ?,
-        final_status = ?
-        WHERE prescription_id = ?""",
-        (
-            pharmacist_decision,
-            pharmacist_feedback,
-            agreement_int,
-            time_to_decision_seconds,
-            final_status,
-            prescription_id,
-        ),
-    )
-    db.commit()
-    db.close()
+    # The entry from log_decision may still be queued
+    flush_events()
+    with write_transaction() as db:
+        db.execute(
+            """UPDATE audit_log SET
+            pharmacist_decision = ?,
+            pharmacist_feedback = ?,
+            ai_pharmacist_agreement = ?,
+            time_to_decision_seconds = ?,
+            final_status = ?
+            WHERE prescription_id = ?""",
+            (
+                pharmacist_decision,
+                pharmacist_feedback,
+                agreement_int,
+                time_to_decision_seconds,
+                final_status,
+                prescription_id,
+            ),
+        )
+
+
+def audit_filters(
+    risk_level: str | None = None,
+    status: str | None = None,
+    medication_name: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> tuple[str, list]:
+    """WHERE clause and parameters selecting the audit entries that match.
+
+    start/end bound the entry timestamp (naive UTC) as [start, end);
+    medication_name matches case-insensitively.
+    """
+    where = "WHERE 1=1"
+    params: list = []
+
+    if risk_level:
+        where += " AND ai_risk_level = ?"
+        params.append(risk_level)
+
+    if status:
+        where += " AND final_status = ?"
+        params.append(status)
+
+    if medication_name:
+        where += " AND medication_name = ? COLLATE NOCASE"
+        params.append(medication_name)
+
+    if start:
+        where += " AND timestamp >= ?"
+        params.append(start.strftime(TIMESTAMP_FORMAT))
+
+    if end:
+        where += " AND timestamp < ?"
+        params.append(end.strftime(TIMESTAMP_FORMAT))
+
+    return where, params
 
 
 def get_audit_log(
@@ -98,6 +184,9 @@ def get_audit_log(
 ) -> list[dict]:
     """Query audit log entries with optional filters.
 
+    OFFSET paging reads and discards every skipped row; get_audit_page()
+    costs the same at any depth.
+
     Args:
         risk_level: Filter by AI risk level (low/medium/high/critical).
         status: Filter by final status (approved/rejected/escalated/pending).
@@ -109,18 +198,8 @@ def get_audit_log(
     """
     db = get_db()
 
-    query = "SELECT * FROM audit_log WHERE 1=1"
-    params: list = []
-
-    if risk_level:
-        query += " AND ai_risk_level = ?"
-        params.append(risk_level)
-
-    if status:
-        query += " AND final_status = ?"
-        params.append(status)
-
-    query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    where, params = audit_filters(risk_level=risk_level, status=status)
+    query = f"SELECT * FROM audit_log {where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
 
     rows = db.execute(query, params).fetchall()
@@ -129,46 +208,215 @@ def get_audit_log(
     return [dict(row) for row in rows]
 
 
-def get_audit_count(
+def get_audit_page(
     risk_level: str | None = None,
     status: str | None = None,
-) -> int:
-    """Get total count of audit entries matching filters (for pagination)."""
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Load one page of audit entries, newest first, with a keyset cursor.
+
+    Pages are keyed on (timestamp, id), which the audit indexes cover for
+    each filter, so a page deep in the log costs the same as the first.
+
+    Args:
+        risk_level: Filter by AI risk level (low/medium/high/critical).
+        status: Filter by final status (approved/rejected/escalated/pending).
+        limit: Max rows to return, clamped to 1..MAX_AUDIT_PAGE_SIZE.
+        cursor: next_cursor from the previous page, or None for the first page.
+
+    Returns:
+        (entries, next_cursor) - next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_AUDIT_PAGE_SIZE))
+    where, params = audit_filters(risk_level=risk_level, status=status)
+    if cursor:
+        where += " AND (timestamp, id) < (?, ?)"
+        params.extend(decode_cursor(cursor))
+
     db = get_db()
+    # Fetch one extra row to learn whether another page exists
+    rows = db.execute(
+        f"SELECT * FROM audit_log {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+        [*params, limit + 1],
+    ).fetchall()
+    db.close()
 
-    query = "SELECT COUNT(*) as count FROM audit_log WHERE 1=1"
-    params: list = []
+    entries = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if entries and len(rows) > limit:
+        next_cursor = encode_cursor(entries[-1]["timestamp"], entries[-1]["id"])
+    return entries, next_cursor
 
-    if risk_level:
-        query += " AND ai_risk_level = ?"
-        params.append(risk_level)
 
+def _count_metric(risk_level: str | None, status: str | None) -> str:
+    """analytics_aggregates metric counting the entries that match the filters."""
+    if risk_level and status:
+        return f"risk_status:{risk_level}|{status}"
+    if risk_level:
+        return f"risk:{risk_level}"
     if status:
-        query += " AND final_status = ?"
-        params.append(status)
+        return f"status:{status}"
+    return "total"
+
+
+def get_audit_count(
+    risk_level: str | None = None,
+    status: str | None = None,
+) -> int:
+    """Get total count of audit entries matching filters (for pagination).
+
+    Every risk/status combination is a counter the audit_log triggers
+    keep exact (see AUDIT_AGGREGATE_GROUPS), so this is one key lookup;
+    it falls back to COUNT(*) before the aggregates are built.
+    """
+    count = load_count(_count_metric(risk_level, status))
+    if count is not None:
+        return count
+
+    db = get_db()
+
+    where, params = audit_filters(risk_level=risk_level, status=status)
+    query = f"SELECT COUNT(*) as count FROM audit_log {where}"
 
     count = db.execute(query, params).fetchone()["count"]
     db.close()
     return count
 
 
-def export_audit_csv() -> str:
-    """Export the full audit log as CSV string.
+def _export_rows(columns: str, chunk_rows: int, filters: dict) -> Iterator[tuple[list[str], list[tuple]]]:
+    """(column names, rows) per chunk of the filtered audit log, newest first.
 
-    Returns:
-        CSV-formatted string of all audit entries.
+    One SQLite cursor is stepped `chunk_rows` at a time, so only one
+    chunk of rows is ever in memory.
     """
+    where, params = audit_filters(**filters)
     db = get_db()
-    rows = db.execute("SELECT * FROM audit_log ORDER BY timestamp DESC").fetchall()
-    db.close()
-
-    if not rows:
-        return ""
-
+    try:
+        cursor = db.cursor()
+        cursor.row_factory = None  # the writers only need the values
+        cursor.execute(f"SELECT {columns} FROM audit_log {where} ORDER BY timestamp DESC, id DESC", params)
+        names = [column[0] for column in cursor.description]
+        while rows := cursor.fetchmany(chunk_rows):
+            yield names, rows
+    finally:
+        db.close()
+
+
+def iter_audit_csv(chunk_rows: int = EXPORT_CHUNK_ROWS, **filters) -> Iterator[str]:
+    """Stream the audit log as CSV text, newest first.
+
+    Each chunk of rows is yielded as soon as it is formatted, so memory
+    stays flat however large the log is. Yields nothing when no entries
+    match. Keyword arguments are audit_filters().
+    """
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=rows[0].keys())
-    writer.writeheader()
-    for row in rows:
-        writer.writerow(dict(row))
+    writer = csv.writer(output)
+    for chunk, (columns, rows) in enumerate(_export_rows("*", chunk_rows, filters)):
+        if chunk == 0:
+            writer.writerow(columns)
+        writer.writerows(rows)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks incrementally."""
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk.encode()):
+            yield data
+    yield compressor.flush()
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file for the pyarrow writers whose output is drained per batch.
+
+    tell() keeps counting across drains, which the Parquet writer relies
+    on for its column chunk offsets.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _record_batch(rows: list[tuple]):
+    arrays = []
+    for (name, arrow_type), values in zip(AUDIT_ARROW_TYPES.items(), zip(*rows)):
+        if name == "timestamp":
+            # Parsed from SQLite's text timestamps, which are UTC
+            array = pa.array(values, pa.string()).cast(pa.timestamp("us")).cast(arrow_type)
+        elif arrow_type == pa.bool_():
+            array = pa.array(values, pa.int8()).cast(arrow_type)  # stored as 0/1
+        else:
+            array = pa.array(values, arrow_type)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=AUDIT_ARROW_SCHEMA)
+
+
+def iter_audit_columnar(
+    fmt: str,
+    row_group_rows: int = EXPORT_ROW_GROUP_ROWS,
+    **filters,
+) -> Iterator[bytes]:
+    """Stream the audit log as a Parquet or Arrow IPC file, newest first.
+
+    Rows are written `row_group_rows` at a time - one Parquet row group
+    or Arrow record batch each - and the bytes are yielded after every
+    row group, so memory is bounded by one row group of Arrow data.
+    Keyword arguments are audit_filters().
 
-    return output.getvalue()
+    Args:
+        fmt: "parquet" or "arrow".
+    """
+    if pa is None:
+        raise RuntimeError("Parquet and Arrow exports need pyarrow (pip install pyarrow)")
+    if fmt not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown columnar export format: {fmt}")
+    return _write_columnar(fmt, row_group_rows, filters)
+
+
+def _write_columnar(fmt: str, row_group_rows: int, filters: dict) -> Iterator[bytes]:
+    sink = _StreamSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, AUDIT_ARROW_SCHEMA, compression=EXPORT_PARQUET_COMPRESSION)
+    else:
+        writer = pa.ipc.new_file(sink, AUDIT_ARROW_SCHEMA)
+
+    def write(table):
+        # One Parquet row group / Arrow record batch
+        writer.write_table(table.combine_chunks(), row_group_rows)
+
+    # Rows come out of SQLite a chunk at a time as compact Arrow batches;
+    # Python row tuples never outnumber one chunk
+    with writer:
+        pending = AUDIT_ARROW_SCHEMA.empty_table()
+        for _, rows in _export_rows(", ".join(AUDIT_ARROW_TYPES), EXPORT_CHUNK_ROWS, filters):
+            pending = pa.concat_tables([pending, pa.Table.from_batches([_record_batch(rows)])])
+            while pending.num_rows >= row_group_rows:
+                write(pending.slice(0, row_group_rows))
+                pending = pending.slice(row_group_rows)
+                yield sink.drain()
+        if pending.num_rows:
+            write(pending)
+    # The rest of the data and the footer (the schema alone for an empty export)
+    yield sink.drain()
@@ -0,0 +1,4 @@
+"""Domain constants shared across SafeRx modules."""
+
+# Risk levels from least to most severe; a max-risk gate passes this level and below
+RISK_ORDER = ("low", "medium", "high", "critical")
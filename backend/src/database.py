@@ -1,11 +1,91 @@
-"""SQLite database initialization and connection management."""
+"""SQLite database initialization and connection management.
+
+Connections come from a process-wide pool instead of being opened (and
+configured) on every get_db() call. Callers keep the usual
+get_db() ... db.close() pattern: close() hands the connection back to
+the pool, rolling back anything left uncommitted.
+
+Within an HTTP request, request_db_scope() makes nested get_db() calls
+(endpoint, masking log, audit log) share one connection. A connection
+is only ever used by one thread at a time: if the request's connection
+is held by another thread (e.g. concurrent checks in a bulk submission),
+get_db() checks out a separate one from the pool.
+
+Every connection is configured by a storage profile (WAL by default),
+so readers never block on a commit. Writes go through
+write_transaction(), a single-writer lane that serializes write
+transactions in the process while reads run in parallel.
+"""
 
 import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 
+from src.constants import RISK_ORDER
+
 DATABASE_PATH = os.getenv("DATABASE_PATH", "./saferx.db")
 
+# Idle connections kept open for reuse; extra connections are closed on release
+POOL_MAX_IDLE = int(os.getenv("DB_POOL_MAX_IDLE", "8"))
+
+# Storage profiles: PRAGMAs applied to every new connection.
+# cache_size is in KiB when negative (SQLite convention).
+STORAGE_PROFILES = {
+    # Readers run alongside the writer; commits skip the fsync per transaction
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -32000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    # WAL, but fsync on every commit
+    "wal_durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -32000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    # SQLite defaults: rollback journal, readers block on commits
+    "rollback": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+}
+
+STORAGE_PROFILE = os.getenv("DB_STORAGE_PROFILE", "wal")
+
+# Individual PRAGMA overrides on top of the profile
+_PRAGMA_OVERRIDES = {
+    "journal_mode": os.getenv("DB_JOURNAL_MODE"),
+    "synchronous": os.getenv("DB_SYNCHRONOUS"),
+    "busy_timeout": os.getenv("DB_BUSY_TIMEOUT_MS"),
+    "cache_size": os.getenv("DB_CACHE_SIZE"),
+    "mmap_size": os.getenv("DB_MMAP_SIZE_BYTES"),
+}
+
+
+def storage_pragmas(profile: str = STORAGE_PROFILE) -> dict:
+    """PRAGMAs for a storage profile, with any DB_* environment overrides applied."""
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown DB_STORAGE_PROFILE '{profile}'; expected one of {sorted(STORAGE_PROFILES)}"
+        )
+    pragmas = dict(STORAGE_PROFILES[profile])
+    pragmas.update({name: value for name, value in _PRAGMA_OVERRIDES.items() if value})
+    return pragmas
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS patients (
     id TEXT PRIMARY KEY,
@@ -49,6 +129,8 @@ CREATE TABLE IF NOT EXISTS interaction_checks (
     masked_payload TEXT NOT NULL,
     raw_payload TEXT NOT NULL,
     routing_decision TEXT NOT NULL,
+    engine TEXT NOT NULL DEFAULT 'llm',
+    in_review_queue INTEGER NOT NULL DEFAULT 0,
     created_at TEXT DEFAULT (datetime('now'))
 );
 
@@ -85,20 +167,682 @@ CREATE TABLE IF NOT EXISTS audit_log (
     time_to_decision_seconds INTEGER,
     final_status TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS check_jobs (
+    id TEXT PRIMARY KEY,
+    prescription_id TEXT NOT NULL REFERENCES prescriptions(id),
+    status TEXT NOT NULL DEFAULT 'queued',
+    interaction_check_id TEXT REFERENCES interaction_checks(id),
+    error TEXT,
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS interaction_result_cache (
+    key TEXT PRIMARY KEY,
+    kb_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    source_patient_id TEXT NOT NULL,
+    latency_seconds REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analytics_aggregates (
+    metric TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
 """
 
+# Secondary indexes for the hot query predicates. Bump INDEX_VERSION when
+# the set changes; an index whose definition changes gets a new name and
+# the old one goes in RETIRED_INDEXES. Mirrored in the Supabase migrations.
+# tests/test_query_plans.py checks that the hot queries actually use them.
+INDEX_VERSION = 4
+
+INDEXES = {
+    # Active medications per patient; covers the medication count in /api/patients
+    "idx_patient_medications_active": """CREATE INDEX IF NOT EXISTS idx_patient_medications_active
+        ON patient_medications(patient_id, id) WHERE active = 1""",
+    # Review queue pages seek to the cursor and read `limit` open checks in
+    # (created_at, id) order; only checks in the queue are in the index
+    "idx_interaction_checks_review_queue": """CREATE INDEX IF NOT EXISTS idx_interaction_checks_review_queue
+        ON interaction_checks(created_at, id) WHERE in_review_queue = 1""",
+    # Checks of a prescription, for the review queue triggers
+    "idx_interaction_checks_prescription": """CREATE INDEX IF NOT EXISTS idx_interaction_checks_prescription
+        ON interaction_checks(prescription_id, routing_decision, created_at, id)""",
+    "idx_pharmacist_reviews_check": """CREATE INDEX IF NOT EXISTS idx_pharmacist_reviews_check
+        ON pharmacist_reviews(interaction_check_id)""",
+    # update_audit_with_review()
+    "idx_audit_log_prescription": """CREATE INDEX IF NOT EXISTS idx_audit_log_prescription
+        ON audit_log(prescription_id)""",
+    # Audit keyset paging on (timestamp, id), unfiltered and with each filter
+    "idx_audit_log_timestamp_id": """CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp_id
+        ON audit_log(timestamp, id)""",
+    "idx_audit_log_risk_timestamp_id": """CREATE INDEX IF NOT EXISTS idx_audit_log_risk_timestamp_id
+        ON audit_log(ai_risk_level, timestamp, id)""",
+    "idx_audit_log_status_timestamp_id": """CREATE INDEX IF NOT EXISTS idx_audit_log_status_timestamp_id
+        ON audit_log(final_status, timestamp, id)""",
+    # Only queued/running jobs are looked up; finished ones are history
+    "idx_check_jobs_active": """CREATE INDEX IF NOT EXISTS idx_check_jobs_active
+        ON check_jobs(prescription_id) WHERE status IN ('queued', 'running')""",
+    "idx_check_jobs_unfinished": """CREATE INDEX IF NOT EXISTS idx_check_jobs_unfinished
+        ON check_jobs(created_at) WHERE status IN ('queued', 'running')""",
+    # Result cache LRU pruning
+    "idx_result_cache_created": """CREATE INDEX IF NOT EXISTS idx_result_cache_created
+        ON interaction_result_cache(created_at)""",
+}
+
+RETIRED_INDEXES: list[str] = [
+    # INDEX_VERSION 2: the audit indexes gained id for keyset paging
+    "idx_audit_log_timestamp",
+    "idx_audit_log_risk_timestamp",
+    "idx_audit_log_status_timestamp",
+    # INDEX_VERSION 3: queue pages are driven by idx_prescriptions_in_review
+    "idx_interaction_checks_queue",
+    # INDEX_VERSION 4: queue pages are driven by idx_interaction_checks_review_queue
+    "idx_prescriptions_in_review",
+]
+
+# Dashboard aggregates over audit_log, kept in analytics_aggregates by
+# triggers so every audit write updates them in its own transaction.
+# Each metric is the SUM over audit_log of a per-row SQL expression
+# ({row} is NEW, OLD or the table); the triggers add a new row's
+# contribution and subtract an old one's. Bump AGGREGATES_VERSION when
+# the metrics change: init_db() then recreates the triggers and rebuilds
+# the tables. src/analytics_aggregates.py checks them against audit_log.
+AGGREGATES_VERSION = 3
+
+AUDIT_AGGREGATES = {
+    "total": "1",
+    "auto_approved": "{row}.pharmacist_decision IS NULL AND {row}.final_status = 'approved'",
+    "pharmacist_reviewed": "{row}.pharmacist_decision IS NOT NULL",
+    "overrides": "{row}.ai_pharmacist_agreement = 0",
+    "confidence_sum": "{row}.ai_confidence",
+    "confidence_count": "{row}.ai_confidence IS NOT NULL",
+    "decision_time_sum": "{row}.time_to_decision_seconds",
+    "decision_time_count": "{row}.time_to_decision_seconds IS NOT NULL",
+}
+
+# Row counts per value of one or more columns, stored as "<prefix>:<value>"
+# ("<prefix>:<value>|<value>" for several). These also answer the audit
+# page counts for each filter combination.
+AUDIT_AGGREGATE_GROUPS = {
+    "risk": ("ai_risk_level",),
+    "status": ("final_status",),
+    "risk_status": ("ai_risk_level", "final_status"),
+}
+
+# Hourly and daily copies of the metrics for trend charts, one
+# analytics_rollups row per (granularity, bucket) with a column per
+# metric. A row counts in the bucket of its audit timestamp (UTC, as
+# written by SQLite); {ts} is that timestamp.
+ROLLUP_BUCKETS = {
+    "hour": "strftime('%Y-%m-%d %H:00:00', {ts})",
+    "day": "date({ts})",
+}
+
+ROLLUP_METRICS = {
+    **AUDIT_AGGREGATES,
+    **{
+        f"risk_{level}": f"{{row}}.ai_risk_level = '{level}'"
+        for level in RISK_ORDER
+    },
+}
+
+# Every audit_log column the metrics read; updates to other columns skip the trigger
+AUDIT_AGGREGATE_COLUMNS = [
+    "timestamp", "ai_confidence", "ai_risk_level", "pharmacist_decision",
+    "ai_pharmacist_agreement", "time_to_decision_seconds", "final_status",
+]
+
+AGGREGATE_TRIGGERS = ["audit_log_aggregates_insert", "audit_log_aggregates_update", "audit_log_aggregates_delete"]
+
+# Full-text search over review text: source -> (table, text column).
+# Each non-empty text is a row of review_search_docs, with the text in
+# the column named after its source, indexed by the external-content
+# FTS5 table review_search (one FTS column per source, so a source
+# filter is a column filter inside the index). Triggers on the source
+# tables keep the documents in step with every insert, update and
+# delete; triggers on review_search_docs keep the index in step with
+# the documents. init_db() builds them from existing rows on first run.
+SEARCH_SOURCES = {
+    "feedback": ("audit_log", "pharmacist_feedback"),
+    "reasoning": ("interaction_checks", "reasoning"),
+}
+
+# Porter stemming, so "bleed" finds "bleeding"
+SEARCH_TOKENIZER = "porter unicode61 remove_diacritics 2"
+
+# Review queue membership, denormalised onto interaction_checks so the
+# queue filter and the (created_at, id) page order share one partial
+# index. A check is in the queue while it is routed to a pharmacist and
+# its prescription is in review; triggers on both tables keep
+# in_review_queue in step in the writing transaction. init_db() sets it
+# for existing rows on first run.
+REVIEW_QUEUE_MEMBERSHIP = """{check}.routing_decision = 'routed_to_pharmacist' AND EXISTS (
+    SELECT 1 FROM prescriptions WHERE id = {check}.prescription_id AND status = 'in_review'
+)"""
+
+REVIEW_QUEUE_TRIGGERS = ["review_queue_check_insert", "review_queue_check_update", "review_queue_prescription_update"]
+
+# Columns added after the initial schema, applied to existing databases
+# by init_db(): (table, column, column definition)
+COLUMN_MIGRATIONS = [
+    ("interaction_checks", "engine", "TEXT NOT NULL DEFAULT 'llm'"),
+    ("interaction_checks", "in_review_queue", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to the pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool: "ConnectionPool | None" = None
+        self.holds = 0
+        self.owner: int | None = None
+        self.scoped = False
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def close_connection(self):
+        """Really close the underlying SQLite connection."""
+        super().close()
+
+
+class _RequestScope:
+    """Connection shared by the get_db() calls of one request."""
+
+    def __init__(self):
+        self.conn: PooledConnection | None = None
+        self.claimed = False
+        self.active = True
+
+
+_request_scope: ContextVar[_RequestScope | None] = ContextVar("db_request_scope", default=None)
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections with usage statistics."""
+
+    def __init__(self, path: str, max_idle: int, pragmas: dict):
+        self.path = path
+        self.max_idle = max_idle
+        self.pragmas = pragmas
+        self._lock = threading.Lock()
+        self._idle: list[PooledConnection] = []
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._created = 0
+        self._checkouts = 0
+        self._pool_hits = 0
+        self._request_reuses = 0
+        self._discarded = 0
+        self._request_scopes = 0
+
+    def _connect(self) -> PooledConnection:
+        # Pooled connections move between worker threads, but are only
+        # ever held by one thread at a time
+        conn = sqlite3.connect(self.path, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.pool = self
+        return conn
+
+    def _checkout_locked(self) -> PooledConnection | None:
+        """Count a checkout and pop an idle connection, if any. Caller holds the lock."""
+        conn = self._idle.pop() if self._idle else None
+        self._checkouts += 1
+        if conn is not None:
+            self._pool_hits += 1
+        else:
+            self._created += 1
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Get a connection for the calling thread, reusing the request's if free."""
+        thread = threading.get_ident()
+        scope = _request_scope.get()
+        claim_scope = False
+        with self._lock:
+            if scope is not None and scope.active:
+                conn = scope.conn
+                if conn is not None and (conn.holds == 0 or conn.owner == thread):
+                    conn.holds += 1
+                    conn.owner = thread
+                    self._request_reuses += 1
+                    return conn
+                if not scope.claimed:
+                    scope.claimed = claim_scope = True
+            conn = self._checkout_locked()
+
+        if conn is None:
+            conn = self._connect()
+        conn.holds, conn.owner = 1, thread
+        if claim_scope:
+            conn.scoped = True
+            scope.conn = conn
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """Drop one hold; an unheld connection is rolled back and, unless it
+        belongs to an open request scope, returned to the pool."""
+        with self._lock:
+            conn.holds = max(conn.holds - 1, 0)
+            if conn.holds:
+                return
+            conn.owner = None
+        if conn.in_transaction:
+            conn.rollback()
+        if not conn.scoped:
+            self._return(conn)
+
+    def _return(self, conn: PooledConnection):
+        conn.set_trace_callback(None)
+        conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._in_use -= 1
+            keep = len(self._idle) < self.max_idle
+            if keep:
+                self._idle.append(conn)
+            else:
+                self._discarded += 1
+        if not keep:
+            conn.close_connection()
+
+    def open_scope(self) -> _RequestScope:
+        with self._lock:
+            self._request_scopes += 1
+        return _RequestScope()
+
+    def close_scope(self, scope: _RequestScope):
+        """End a request scope and return its connection to the pool."""
+        scope.active = False
+        conn, scope.conn = scope.conn, None
+        if conn is None:
+            return
+        conn.scoped = False
+        with self._lock:
+            conn.holds = 0
+            conn.owner = None
+        if conn.in_transaction:
+            conn.rollback()
+        self._return(conn)
+
+    def close_all(self):
+        """Close every idle connection (application shutdown)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close_connection()
+
+    def stats(self) -> dict:
+        with self._lock:
+            opened = self._checkouts + self._request_reuses
+            return {
+                "connections_created": self._created,
+                "checkouts": self._checkouts,
+                "pool_hits": self._pool_hits,
+                "request_reuses": self._request_reuses,
+                "reuse_rate": round(1 - self._created / opened, 4) if opened else 0.0,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "idle": len(self._idle),
+                "max_idle": self.max_idle,
+                "discarded": self._discarded,
+                "request_scopes": self._request_scopes,
+            }
+
+
+class WriterLane:
+    """Serializes write transactions within the process.
+
+    SQLite allows one writer at a time. Queueing writers on a lock here,
+    instead of letting them contend inside SQLite, keeps BEGIN IMMEDIATE
+    from spinning on busy_timeout; busy_timeout still covers writers in
+    other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._transactions = 0
+        self._rollbacks = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @contextmanager
+    def transaction(self):
+        # A nested write on the same thread joins the outer transaction
+        outer = getattr(self._local, "conn", None)
+        if outer is not None:
+            yield outer
+            return
+
+        started = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - started
+            conn = get_db()
+            self._local.conn = conn
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                with self._stats_lock:
+                    self._rollbacks += 1
+                raise
+            finally:
+                self._local.conn = None
+                conn.close()
+                with self._stats_lock:
+                    self._transactions += 1
+                    self._wait_seconds += waited
+                    self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def active(self) -> bool:
+        """Whether this thread is inside a write transaction."""
+        return getattr(self._local, "conn", None) is not None
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "transactions": self._transactions,
+                "rollbacks": self._rollbacks,
+                "avg_wait_ms": round(self._wait_seconds / self._transactions * 1000, 3)
+                if self._transactions else 0.0,
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+            }
+
+
+_pool = ConnectionPool(DATABASE_PATH, POOL_MAX_IDLE, storage_pragmas())
+_writer = WriterLane()
+
 
 def get_db() -> sqlite3.Connection:
-    """Get a database connection with row factory enabled."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    """Get a pooled database connection with row factory enabled.
+
+    Call close() when done; the connection goes back to the pool.
+    """
+    return _pool.acquire()
+
+
+def write_transaction():
+    """Run a write transaction on the single-writer lane.
+
+    Usage:
+        with write_transaction() as db:
+            db.execute("INSERT ...")
+
+    Commits on success and rolls back on error. Nested calls on the same
+    thread join the outer transaction.
+    """
+    return _writer.transaction()
+
+
+def in_write_transaction() -> bool:
+    """Whether the calling thread is inside write_transaction()."""
+    return _writer.active()
+
+
+async def request_db_scope():
+    """FastAPI dependency: share one pooled connection across a request."""
+    scope = _pool.open_scope()
+    token = _request_scope.set(scope)
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+        _pool.close_scope(scope)
+
+
+def close_pool():
+    """Close idle pooled connections. Called from the FastAPI lifespan on shutdown."""
+    _pool.close_all()
+
+
+def get_pool_stats() -> dict:
+    """Connection pool statistics for monitoring."""
+    return _pool.stats()
+
+
+def get_storage_stats() -> dict:
+    """Active storage profile and single-writer lane statistics for monitoring."""
+    db = get_db()
+    journal_mode = db.execute("PRAGMA journal_mode").fetchone()[0]
+    db.close()
+    return {
+        "profile": STORAGE_PROFILE,
+        "journal_mode": journal_mode,
+        "pragmas": _pool.pragmas,
+        "writer": _writer.stats(),
+    }
+
+
+def _apply_column_migrations(conn: sqlite3.Connection):
+    """Add any columns missing from tables created by an older schema."""
+    for table, column, definition in COLUMN_MIGRATIONS:
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def apply_indexes(conn: sqlite3.Connection):
+    """Bring the index set up to INDEX_VERSION (tracked in PRAGMA user_version)."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= INDEX_VERSION:
+        return
+    for name in RETIRED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for statement in INDEXES.values():
+        conn.execute(statement)
+    conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+
+def _aggregate_delta_sql(row: str, sign: int) -> str:
+    """Statement adding `sign` x the contribution of audit row `row` to analytics_aggregates."""
+    deltas = [
+        f"SELECT '{metric}' AS metric, {sign} * COALESCE({expression.format(row=row)}, 0) AS delta"
+        for metric, expression in AUDIT_AGGREGATES.items()
+    ]
+    for prefix, columns in AUDIT_AGGREGATE_GROUPS.items():
+        key = " || '|' || ".join(f"{row}.{column}" for column in columns)
+        not_null = " AND ".join(f"{row}.{column} IS NOT NULL" for column in columns)
+        deltas.append(f"SELECT '{prefix}:' || {key}, {sign} WHERE {not_null}")
+    return f"""INSERT INTO analytics_aggregates (metric, value)
+        SELECT metric, delta FROM ({" UNION ALL ".join(deltas)}) WHERE delta != 0
+        ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value;"""
+
+
+def _rollup_delta_sql(row: str, sign: int) -> str:
+    """Statement adding `sign` x the contribution of audit row `row` to its rollup buckets."""
+    columns = ", ".join(ROLLUP_METRICS)
+    values = ", ".join(
+        f"{sign} * COALESCE({expression.format(row=row)}, 0)" for expression in ROLLUP_METRICS.values()
+    )
+    buckets = " UNION ALL ".join(
+        f"SELECT '{granularity}' AS granularity, {expression.format(ts=f'{row}.timestamp')} AS bucket"
+        for granularity, expression in ROLLUP_BUCKETS.items()
+    )
+    updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in ROLLUP_METRICS)
+    return f"""INSERT INTO analytics_rollups (granularity, bucket, {columns})
+        SELECT granularity, bucket, {values} FROM ({buckets}) WHERE bucket IS NOT NULL
+        ON CONFLICT(granularity, bucket) DO UPDATE SET {updates};"""
+
+
+def rollup_select_sql(granularity: str) -> str:
+    """Query computing one granularity's rollup rows from scratch over audit_log."""
+    sums = ", ".join(
+        f"COALESCE(SUM({expression.format(row='a')}), 0)" for expression in ROLLUP_METRICS.values()
+    )
+    bucket = ROLLUP_BUCKETS[granularity].format(ts="a.timestamp")
+    return f"""SELECT '{granularity}', {bucket} AS bucket, {sums}
+        FROM audit_log a WHERE a.timestamp IS NOT NULL GROUP BY bucket"""
+
+
+def compute_aggregates(conn: sqlite3.Connection) -> dict[str, float]:
+    """Compute every aggregate metric from scratch over audit_log."""
+    sums = ", ".join(
+        f"COALESCE(SUM({expression.format(row='a')}), 0) AS {metric}"
+        for metric, expression in AUDIT_AGGREGATES.items()
+    )
+    aggregates = dict(conn.execute(f"SELECT {sums} FROM audit_log a").fetchone())
+    for prefix, columns in AUDIT_AGGREGATE_GROUPS.items():
+        names = ", ".join(columns)
+        not_null = " AND ".join(f"{column} IS NOT NULL" for column in columns)
+        for *values, count in conn.execute(
+            f"SELECT {names}, COUNT(*) FROM audit_log WHERE {not_null} GROUP BY {names}"
+        ):
+            aggregates[f"{prefix}:{'|'.join(values)}"] = count
+    return aggregates
+
+
+def rebuild_aggregates(conn: sqlite3.Connection):
+    """Replace analytics_aggregates and analytics_rollups with values recomputed
+    from audit_log (caller commits)."""
+    conn.execute("DELETE FROM analytics_aggregates")
+    conn.executemany(
+        "INSERT INTO analytics_aggregates (metric, value) VALUES (?, ?)",
+        [*compute_aggregates(conn).items(), ("aggregates_version", AGGREGATES_VERSION)],
+    )
+    conn.execute("DELETE FROM analytics_rollups")
+    for granularity in ROLLUP_BUCKETS:
+        conn.execute(
+            f"INSERT INTO analytics_rollups (granularity, bucket, {', '.join(ROLLUP_METRICS)}) "
+            + rollup_select_sql(granularity)
+        )
+
+
+def apply_aggregates(conn: sqlite3.Connection):
+    """Install the audit_log aggregate triggers for AGGREGATES_VERSION, rebuilding the tables."""
+    row = conn.execute(
+        "SELECT value FROM analytics_aggregates WHERE metric = 'aggregates_version'"
+    ).fetchone()
+    if row is not None and row[0] == AGGREGATES_VERSION:
+        return
+    for name in AGGREGATE_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    # Derived data: recreate it with the current metric columns
+    conn.execute("DROP TABLE IF EXISTS analytics_rollups")
+    conn.execute(f"""CREATE TABLE analytics_rollups (
+        granularity TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        {", ".join(f"{column} REAL NOT NULL DEFAULT 0" for column in ROLLUP_METRICS)},
+        PRIMARY KEY (granularity, bucket)
+    ) WITHOUT ROWID""")
+
+    add_new = _aggregate_delta_sql("NEW", 1) + _rollup_delta_sql("NEW", 1)
+    remove_old = _aggregate_delta_sql("OLD", -1) + _rollup_delta_sql("OLD", -1)
+    conn.execute(f"""CREATE TRIGGER audit_log_aggregates_insert AFTER INSERT ON audit_log BEGIN
+        {add_new}
+    END""")
+    conn.execute(f"""CREATE TRIGGER audit_log_aggregates_update
+        AFTER UPDATE OF {", ".join(AUDIT_AGGREGATE_COLUMNS)} ON audit_log BEGIN
+        {remove_old}
+        {add_new}
+    END""")
+    conn.execute(f"""CREATE TRIGGER audit_log_aggregates_delete AFTER DELETE ON audit_log BEGIN
+        {remove_old}
+    END""")
+    rebuild_aggregates(conn)
+
+
+def apply_search(conn: sqlite3.Connection):
+    """Create the review search index and its triggers, indexing existing rows."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_search'"
+    ).fetchone()
+    if exists:
+        return
+    text_columns = ", ".join(SEARCH_SOURCES)
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS review_search_docs (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        source_id TEXT NOT NULL,
+        {", ".join(f"{column} TEXT" for column in SEARCH_SOURCES)},
+        UNIQUE (source, source_id)
+    )""")
+    conn.execute(f"""CREATE VIRTUAL TABLE review_search USING fts5(
+        {text_columns}, content='review_search_docs', content_rowid='id', tokenize='{SEARCH_TOKENIZER}'
+    )""")
+    for source, (table, column) in SEARCH_SOURCES.items():
+        conn.execute(
+            f"INSERT INTO review_search_docs (source, source_id, {source}) "
+            f"SELECT '{source}', id, {column} FROM {table} WHERE {column} != ''"
+        )
+    conn.execute("INSERT INTO review_search (review_search) VALUES ('rebuild')")
+
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_SOURCES)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_SOURCES)
+    conn.execute(f"""CREATE TRIGGER review_search_docs_insert AFTER INSERT ON review_search_docs BEGIN
+        INSERT INTO review_search (rowid, {text_columns}) VALUES (new.id, {new_values});
+    END""")
+    conn.execute(f"""CREATE TRIGGER review_search_docs_delete AFTER DELETE ON review_search_docs BEGIN
+        INSERT INTO review_search (review_search, rowid, {text_columns}) VALUES ('delete', old.id, {old_values});
+    END""")
+    for source, (table, column) in SEARCH_SOURCES.items():
+        add_new = f"""INSERT INTO review_search_docs (source, source_id, {source})
+            SELECT '{source}', NEW.id, NEW.{column} WHERE NEW.{column} != '';"""
+        remove_old = f"DELETE FROM review_search_docs WHERE source = '{source}' AND source_id = OLD.id;"
+        conn.execute(f"""CREATE TRIGGER search_{source}_insert AFTER INSERT ON {table} BEGIN
+            {add_new}
+        END""")
+        conn.execute(f"""CREATE TRIGGER search_{source}_update AFTER UPDATE OF id, {column} ON {table}
+            WHEN NEW.{column} IS NOT OLD.{column} OR NEW.id IS NOT OLD.id BEGIN
+            {remove_old}
+            {add_new}
+        END""")
+        conn.execute(f"""CREATE TRIGGER search_{source}_delete AFTER DELETE ON {table} BEGIN
+            {remove_old}
+        END""")
+
+
+def apply_review_queue(conn: sqlite3.Connection):
+    """Install the review queue membership triggers, setting in_review_queue on existing checks."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (REVIEW_QUEUE_TRIGGERS[0],)
+    ).fetchone()
+    if exists:
+        return
+    conn.execute(f"""CREATE TRIGGER review_queue_check_insert AFTER INSERT ON interaction_checks BEGIN
+        UPDATE interaction_checks SET in_review_queue = 1
+        WHERE id = NEW.id AND {REVIEW_QUEUE_MEMBERSHIP.format(check="NEW")};
+    END""")
+    conn.execute(f"""CREATE TRIGGER review_queue_check_update
+        AFTER UPDATE OF prescription_id, routing_decision ON interaction_checks BEGIN
+        UPDATE interaction_checks SET in_review_queue = ({REVIEW_QUEUE_MEMBERSHIP.format(check="NEW")})
+        WHERE id = NEW.id;
+    END""")
+    conn.execute("""CREATE TRIGGER review_queue_prescription_update AFTER UPDATE OF status ON prescriptions
+        WHEN NEW.status IS NOT OLD.status BEGIN
+        UPDATE interaction_checks
+        SET in_review_queue = (routing_decision = 'routed_to_pharmacist' AND NEW.status = 'in_review')
+        WHERE prescription_id = NEW.id;
+    END""")
+    conn.execute(
+        "UPDATE interaction_checks SET in_review_queue = "
+        f"({REVIEW_QUEUE_MEMBERSHIP.format(check='interaction_checks')})"
+    )
 
 
 def init_db():
-    """Create all tables if they don't exist."""
+    """Create all tables, indexes, aggregate, search and review queue triggers if they don't exist."""
     conn = get_db()
     conn.executescript(SCHEMA)
+    _apply_column_migrations(conn)
+    apply_indexes(conn)
+    apply_review_queue(conn)
+    apply_aggregates(conn)
+    apply_search(conn)
     conn.commit()
     conn.close()
@@ -0,0 +1,380 @@
+"""Write-behind writer for audit trail events.
+
+Masking events and audit entries logged outside a write transaction are
+append-only rows the request never reads back, so the request path only
+queues them: a background thread drains the queue and inserts the rows
+in batched transactions on the writer lane, every EVENT_WRITER_FLUSH_MS
+or EVENT_WRITER_BATCH_ROWS rows, whichever comes first. An event logged
+inside write_transaction() is part of that unit of work (the check
+pipeline's audit entry and masking event): it joins the transaction and
+commits or rolls back with it, never through the queue.
+
+Durability: the FastAPI lifespan starts the writer and stops it on
+shutdown, which drains everything queued. The queue is bounded; when it
+is full, producers wait for room instead of dropping events. A process
+crash loses at most the events queued since the last flush. When the
+writer is not running (scripts, benchmarks, before startup), events are
+written synchronously as before.
+
+A row that fails is retried on its own, with backoff for transient
+errors (a locked or busy database). A row that still fails is logged
+with its SQL and params and appended to the dead-letter file
+EVENT_WRITER_DEAD_LETTER_PATH; `python -m src.event_writer --replay`
+writes those rows once the cause is fixed. /api/metrics reports the
+writer's status as "error" while any row is dead-lettered.
+
+Queued rows are visible to readers once flushed; flush_events() waits
+for everything queued so far, for writers that update those rows.
+
+Usage (from backend/):
+    python -m src.event_writer --replay
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.database import DATABASE_PATH, in_write_transaction, write_transaction
+
+logger = logging.getLogger(__name__)
+
+# Max rows per batched transaction
+EVENT_WRITER_BATCH_ROWS = int(os.getenv("EVENT_WRITER_BATCH_ROWS", "500"))
+
+# Max time a queued event waits for more to batch with
+EVENT_WRITER_FLUSH_MS = int(os.getenv("EVENT_WRITER_FLUSH_MS", "50"))
+
+# Max events queued before producers wait (back-pressure)
+EVENT_WRITER_QUEUE_SIZE = int(os.getenv("EVENT_WRITER_QUEUE_SIZE", "10000"))
+
+# Attempts per failed row on transient errors, doubling the wait from RETRY_BACKOFF_MS
+EVENT_WRITER_RETRIES = int(os.getenv("EVENT_WRITER_RETRIES", "5"))
+EVENT_WRITER_RETRY_BACKOFF_MS = int(os.getenv("EVENT_WRITER_RETRY_BACKOFF_MS", "50"))
+
+# JSON lines of rows that could not be written, kept for --replay
+EVENT_WRITER_DEAD_LETTER_PATH = os.getenv(
+    "EVENT_WRITER_DEAD_LETTER_PATH", str(Path(DATABASE_PATH).with_suffix(".dead-letters.jsonl"))
+)
+
+# Failures kept for /api/metrics
+RECENT_ERRORS = 10
+
+# Queue markers: stop the thread after draining / write what's queued now
+_STOP = object()
+_FLUSH = object()
+
+
+def sqlite_now() -> str:
+    """Current UTC time as written by SQLite's datetime('now').
+
+    Queued rows carry their own timestamp, so a row's time is when the
+    event happened rather than when its batch was flushed.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _is_transient(exc: Exception) -> bool:
+    """A locked or busy database, worth retrying; constraint and SQL errors are not."""
+    return isinstance(exc, sqlite3.OperationalError) and (
+        "locked" in str(exc) or "busy" in str(exc)
+    )
+
+
+class EventWriter:
+    """Bounded queue of INSERTs written in batches by one background thread."""
+
+    def __init__(self, batch_rows: int, flush_ms: int, max_queued: int, dead_letter_path: str):
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_ms / 1000
+        self.max_queued = max_queued
+        self.dead_letter_path = dead_letter_path
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._thread: threading.Thread | None = None
+        # Guards _thread and _producers, so stop() can wait for in-flight enqueues
+        self._state = threading.Condition()
+        self._producers = 0
+        self._stats_lock = threading.Lock()
+        self._enqueued = 0
+        self._written = 0
+        self._retried = 0
+        self._failed = 0
+        self._batches = 0
+        self._backpressure_waits = 0
+        self._peak_depth = 0
+        self._flush_seconds_total = 0.0
+        self._max_flush_seconds = 0.0
+        self._max_lag_seconds = 0.0
+        self._recent_errors: deque = deque(maxlen=RECENT_ERRORS)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        with self._state:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Write everything queued, then stop the thread. Later events are written synchronously."""
+        with self._state:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            # Producers already past the running check still get their events in
+            self._state.wait_for(lambda: self._producers == 0)
+        self._queue.put(_STOP)
+        thread.join()
+
+    def _enter(self) -> bool:
+        """Register a producer if the thread is running, so stop() waits for its put."""
+        with self._state:
+            if self._thread is None:
+                return False
+            self._producers += 1
+            return True
+
+    def _leave(self):
+        with self._state:
+            self._producers -= 1
+            self._state.notify_all()
+
+    def submit(self, sql: str, params: tuple):
+        """Queue one INSERT; waits for room when the queue is full.
+
+        Inside write_transaction() the INSERT joins that transaction instead.
+        """
+        if in_write_transaction() or not self._enter():
+            with write_transaction() as db:
+                db.execute(sql, params)
+            return
+        try:
+            item = (sql, params, time.perf_counter())
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._stats_lock:
+                    self._backpressure_waits += 1
+                self._queue.put(item)
+            depth = self._queue.qsize()
+            with self._stats_lock:
+                self._enqueued += 1
+                self._peak_depth = max(self._peak_depth, depth)
+        finally:
+            self._leave()
+
+    def flush(self):
+        """Wait until every event queued before this call is written.
+
+        Not inside write_transaction(): the writer thread needs the lane.
+        """
+        if not self._enter():
+            return
+        done = threading.Event()
+        try:
+            # Registered as a producer, so this lands ahead of stop()'s _STOP
+            self._queue.put((_FLUSH, done))
+        finally:
+            self._leave()
+        done.wait()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, waiters = [], []
+            item = self._queue.get()
+            deadline = time.perf_counter() + self.flush_seconds
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, tuple) and item[0] is _FLUSH:
+                    waiters.append(item[1])
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_rows:
+                    break
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for done in waiters:
+                done.set()
+
+    def _write(self, batch: list[tuple]):
+        """Insert a batch in one transaction, grouped into one executemany per statement."""
+        statements: dict[str, list[tuple]] = {}
+        for sql, params, _ in batch:
+            statements.setdefault(sql, []).append(params)
+        started = time.perf_counter()
+        failed = 0
+        try:
+            with write_transaction() as db:
+                for sql, rows in statements.items():
+                    db.executemany(sql, rows)
+        except Exception:
+            # Isolate the bad rows so one can't take the batch down with it
+            failed = self._write_one_by_one(batch)
+        finished = time.perf_counter()
+
+        with self._stats_lock:
+            self._batches += 1
+            self._written += len(batch) - failed
+            self._failed += failed
+            self._flush_seconds_total += finished - started
+            self._max_flush_seconds = max(self._max_flush_seconds, finished - started)
+            self._max_lag_seconds = max(self._max_lag_seconds, finished - batch[0][2])
+
+    def _write_one_by_one(self, batch: list[tuple]) -> int:
+        """Write each row in its own transaction; dead-letter the ones that still fail."""
+        failed = 0
+        for sql, params, _ in batch:
+            attempt = 0
+            while True:
+                try:
+                    with write_transaction() as db:
+                        db.execute(sql, params)
+                    break
+                except Exception as exc:
+                    attempt += 1
+                    if _is_transient(exc) and attempt < EVENT_WRITER_RETRIES:
+                        with self._stats_lock:
+                            self._retried += 1
+                        time.sleep(EVENT_WRITER_RETRY_BACKOFF_MS / 1000 * 2 ** (attempt - 1))
+                        continue
+                    failed += 1
+                    self._dead_letter(sql, params, exc)
+                    break
+        return failed
+
+    def _dead_letter(self, sql: str, params: tuple, exc: Exception):
+        error = f"{type(exc).__name__}: {exc}"
+        logger.error("Audit trail event not written (%s): %s %r", error, sql, params)
+        record = {"failed_at": sqlite_now(), "error": error, "sql": sql, "params": list(params)}
+        try:
+            with open(self.dead_letter_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            logger.exception("Could not append to dead-letter file %s", self.dead_letter_path)
+        with self._stats_lock:
+            self._recent_errors.append({"failed_at": record["failed_at"], "error": error})
+
+    def stats(self) -> dict:
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            return {
+                # "error" once any event was dead-lettered: see dead_letter_path
+                "status": "error" if self._failed else "ok",
+                "running": self.running,
+                "queue_depth": depth,
+                "peak_queue_depth": self._peak_depth,
+                "max_queued": self.max_queued,
+                "batch_rows": self.batch_rows,
+                "flush_ms": round(self.flush_seconds * 1000, 3),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "retried": self._retried,
+                "failed": self._failed,
+                "batches": self._batches,
+                "avg_batch_rows": round((self._written + self._failed) / self._batches, 1)
+                if self._batches else 0.0,
+                "avg_flush_latency_ms": round(self._flush_seconds_total / self._batches * 1000, 3)
+                if self._batches else 0.0,
+                "max_flush_latency_ms": round(self._max_flush_seconds * 1000, 3),
+                # Oldest event in a batch: enqueue to commit
+                "max_event_lag_ms": round(self._max_lag_seconds * 1000, 3),
+                "backpressure_waits": self._backpressure_waits,
+                "dead_letter_path": self.dead_letter_path,
+                "recent_errors": list(self._recent_errors),
+            }
+
+
+_writer = EventWriter(
+    EVENT_WRITER_BATCH_ROWS, EVENT_WRITER_FLUSH_MS, EVENT_WRITER_QUEUE_SIZE, EVENT_WRITER_DEAD_LETTER_PATH
+)
+
+
+def enqueue_event(sql: str, params: tuple):
+    """Queue an audit trail INSERT for the write-behind writer.
+
+    Joins the caller's write_transaction() if there is one, and writes
+    synchronously while the writer is stopped.
+    """
+    _writer.submit(sql, params)
+
+
+def flush_events():
+    """Wait until every queued event is written."""
+    _writer.flush()
+
+
+def start_event_writer():
+    """Start the background writer. Called from the FastAPI lifespan on startup."""
+    _writer.start()
+
+
+def stop_event_writer():
+    """Drain the queue and stop the writer. Called from the FastAPI lifespan on shutdown."""
+    _writer.stop()
+
+
+def get_event_writer_stats() -> dict:
+    """Queue depth, batch, flush-latency and failure statistics for monitoring."""
+    return _writer.stats()
+
+
+def replay_dead_letters(path: str = EVENT_WRITER_DEAD_LETTER_PATH) -> tuple[int, int]:
+    """Write the dead-lettered events in `path`, keeping the ones that fail again.
+
+    Returns:
+        (written, still_failing)
+    """
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    remaining = []
+    for record in records:
+        try:
+            with write_transaction() as db:
+                db.execute(record["sql"], record["params"])
+        except Exception as exc:
+            remaining.append({**record, "error": f"{type(exc).__name__}: {exc}"})
+    # Swap the file in whole: an interrupted replay leaves it as it was
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in remaining)
+    os.replace(tmp, path)
+    return len(records) - len(remaining), len(remaining)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay audit trail events the event writer could not write.")
+    parser.add_argument("--replay", action="store_true", help="write the dead-lettered events")
+    parser.add_argument("--path", default=EVENT_WRITER_DEAD_LETTER_PATH)
+    args = parser.parse_args()
+
+    if not args.replay:
+        parser.print_help()
+        return 0
+    written, failing = replay_dead_letters(args.path)
+    print(f"Wrote {written} dead-lettered events; {failing} still failing in {args.path}")
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
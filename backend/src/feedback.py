@@ -8,7 +8,7 @@ and would power a retraining pipeline at scale.
 import json
 import uuid
 
-from src.database import get_db
+from src.database import get_db, write_transaction
 
 
 def save_review(
@@ -31,31 +31,28 @@ def save_review(
         The saved review as a dict.
     """
     review_id = str(uuid.uuid4())
-    db = get_db()
-
     agrees_int = None
     if agrees_with_ai is not None:
         agrees_int = 1 if agrees_with_ai else 0
 
-    db.execute(
-        """INSERT INTO pharmacist_reviews
-        (id, interaction_check_id, decision, agrees_with_ai, feedback_text, time_to_decision_seconds)
-        VALUES (?, ?, ?, ?, ?, ?)""",
-        (
-            review_id,
-            interaction_check_id,
-            decision,
-            agrees_int,
-            feedback_text,
-            time_to_decision_seconds,
-        ),
-    )
-    db.commit()
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO pharmacist_reviews
+            (id, interaction_check_id, decision, agrees_with_ai, feedback_text, time_to_decision_seconds)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            (
+                review_id,
+                interaction_check_id,
+                decision,
+                agrees_int,
+                feedback_text,
+                time_to_decision_seconds,
+            ),
+        )
 
-    row = db.execute(
-        "SELECT * FROM pharmacist_reviews WHERE id = ?", (review_id,)
-    ).fetchone()
-    db.close()
+        row = db.execute(
+            "SELECT * FROM pharmacist_reviews WHERE id = ?", (review_id,)
+        ).fetchone()
 
     return dict(row)
 
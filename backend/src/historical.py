@@ -0,0 +1,302 @@
+"""Historical routing records for the analytics endpoints.
+
+Loads the historical records once into typed NumPy columns (one array
+per field the analytics read) instead of a list of dicts, and reloads
+them when the file's mtime changes. The ThresholdSimulator built over a
+load is cached with it, so a request only pays for the sweep.
+
+HISTORICAL_RECORDS_PATH may point at the bundled JSON file or at a
+columnar copy made by the converter below:
+
+    <name>.arrow      Arrow IPC file (needs pyarrow)
+    <name>.columns/   one .npy file per column plus meta.json
+
+Columnar copies are memory-mapped and used without copying. Their rows
+are stored in simulation_order() together with the simulator's running
+count of dangerous records, so the ThresholdSimulator over them is
+built from views of the mapped pages too. JSON is parsed in full.
+
+Convert (from backend/; writes .arrow if pyarrow is installed, else .columns):
+    python -m src.historical data/historical_records.json [DEST]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from src.knowledge_base import DATA_DIR
+from src.threshold_simulator import ThresholdSimulator, risk_codes, simulation_order
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow files are optional; .npy bundles need only NumPy
+    pa = None
+
+HISTORICAL_RECORDS_PATH = Path(
+    os.getenv("HISTORICAL_RECORDS_PATH", DATA_DIR / "historical_records.json")
+)
+
+# recommendation_code indexes into this tuple
+RECOMMENDATIONS = ("auto_approve", "pharmacist_review", "reject")
+
+# Column name -> dtype, in on-disk order
+COLUMNS = {
+    "confidence": np.float64,
+    "risk_code": np.int8,
+    "recommendation_code": np.int8,
+    "auto_approved": np.bool_,
+    "dangerous": np.bool_,
+    "decision_seconds": np.float32,
+}
+
+# Simulator index stored after the record columns in columnar files
+CUMSUM_COLUMN = "dangerous_cumsum"
+
+COLUMNAR_FORMAT_VERSION = 1
+ARROW_SUFFIX = ".arrow"
+BUNDLE_SUFFIX = ".columns"
+BUNDLE_META = "meta.json"
+
+
+class HistoricalDataset:
+    """Historical records as parallel typed columns, one entry per record."""
+
+    def __init__(
+        self,
+        confidence: np.ndarray,
+        risk_code: np.ndarray,
+        recommendation_code: np.ndarray,
+        auto_approved: np.ndarray,
+        dangerous: np.ndarray,
+        decision_seconds: np.ndarray,
+        dangerous_cumsum: np.ndarray | None = None,
+    ):
+        """
+        Args:
+            confidence: AI confidence score (float64).
+            risk_code: AI risk level as an index into RISK_ORDER (int8).
+            recommendation_code: AI recommendation as an index into RECOMMENDATIONS (int8).
+            auto_approved: True where the record was auto-approved rather than routed.
+            dangerous: Ground truth - True where the prescription was actually dangerous.
+            decision_seconds: Pharmacist time to decision (float32, NaN if never reviewed).
+            dangerous_cumsum: Running count of `dangerous` (int64) when the rows
+                are in simulation_order(), as in columnar files.
+        """
+        self.confidence = confidence
+        self.risk_code = risk_code
+        self.recommendation_code = recommendation_code
+        self.auto_approved = auto_approved
+        self.dangerous = dangerous
+        self.decision_seconds = decision_seconds
+        self.dangerous_cumsum = dangerous_cumsum
+        self.size = len(confidence)
+        self.auto_approved_count = int(np.count_nonzero(auto_approved))
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> "HistoricalDataset":
+        """Build from historical record dicts (historical_records.json)."""
+        n = len(records)
+        recommendation_lookup = {value: code for code, value in enumerate(RECOMMENDATIONS)}
+        return cls(
+            confidence=np.fromiter((r["confidence_score"] for r in records), np.float64, n),
+            risk_code=risk_codes(r["risk_level"] for r in records),
+            recommendation_code=np.fromiter(
+                (recommendation_lookup[r["recommendation"]] for r in records), np.int8, n
+            ),
+            auto_approved=np.fromiter(
+                (r["routing_decision"] == "auto_approved" for r in records), bool, n
+            ),
+            dangerous=np.fromiter((r["ground_truth_dangerous"] for r in records), bool, n),
+            decision_seconds=np.fromiter(
+                (
+                    np.nan if r["time_to_decision_seconds"] is None else r["time_to_decision_seconds"]
+                    for r in records
+                ),
+                np.float32,
+                n,
+            ),
+        )
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes addressed by the columns (mapped pages count only once read)."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    @cached_property
+    def simulator(self) -> ThresholdSimulator:
+        """Threshold simulator over these records, built on first use."""
+        return ThresholdSimulator(
+            confidence=self.confidence,
+            risk_code=self.risk_code,
+            ai_approves=self.recommendation_code == RECOMMENDATIONS.index("auto_approve"),
+            dangerous=self.dangerous,
+            dangerous_cumsum=self.dangerous_cumsum,
+        )
+
+
+# ── Columnar files ──────────────────────────────────────────────────────
+
+
+def _file_columns(dataset: HistoricalDataset) -> dict[str, np.ndarray]:
+    """The dataset's columns in simulation order, plus the dangerous running count."""
+    order = simulation_order(
+        dataset.confidence,
+        dataset.risk_code,
+        dataset.recommendation_code == RECOMMENDATIONS.index("auto_approve"),
+    )
+    columns = {
+        name: np.ascontiguousarray(np.asarray(column)[order], dtype=COLUMNS[name])
+        for name, column in dataset.columns.items()
+    }
+    columns[CUMSUM_COLUMN] = np.cumsum(columns["dangerous"], dtype=np.int64)
+    return columns
+
+
+def _load_bundle(path: Path) -> HistoricalDataset:
+    meta = json.loads((path / BUNDLE_META).read_text())
+    if meta.get("format") != COLUMNAR_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported column bundle format {meta.get('format')}")
+    return HistoricalDataset(
+        **{name: np.load(path / f"{name}.npy", mmap_mode="r") for name in (*COLUMNS, CUMSUM_COLUMN)}
+    )
+
+
+def _save_bundle(dataset: HistoricalDataset, path: Path):
+    path.mkdir(parents=True, exist_ok=True)
+    # Write each file beside its final name and rename it into place, so a
+    # process still mapping the previous files keeps reading intact data.
+    # meta.json goes last; its mtime is what triggers a reload.
+    for name, column in _file_columns(dataset).items():
+        tmp = path / f"{name}.npy.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, column)
+        os.replace(tmp, path / f"{name}.npy")
+    tmp = path / f"{BUNDLE_META}.tmp"
+    tmp.write_text(json.dumps({
+        "format": COLUMNAR_FORMAT_VERSION,
+        "records": dataset.size,
+        "columns": [*COLUMNS, CUMSUM_COLUMN],
+        "order": "simulation",
+    }))
+    os.replace(tmp, path / BUNDLE_META)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Arrow historical files need pyarrow (pip install pyarrow)")
+
+
+def _load_arrow(path: Path) -> HistoricalDataset:
+    _require_pyarrow()
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    columns = {}
+    for name in (*COLUMNS, CUMSUM_COLUMN):
+        chunked = table.column(name)
+        if chunked.num_chunks == 1:
+            array = chunked.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            array = chunked.to_numpy()
+        # Booleans are stored as uint8: Arrow packs bools into bits, which can't be mapped
+        columns[name] = array.view(np.bool_) if COLUMNS.get(name) is np.bool_ else array
+    return HistoricalDataset(**columns)
+
+
+def _save_arrow(dataset: HistoricalDataset, path: Path):
+    _require_pyarrow()
+    table = pa.table(
+        {
+            name: column.view(np.uint8) if column.dtype == np.bool_ else column
+            for name, column in _file_columns(dataset).items()
+        }
+    ).replace_schema_metadata({"format": str(COLUMNAR_FORMAT_VERSION), "order": "simulation"})
+    tmp = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp, path)
+
+
+def save_historical_dataset(dataset: HistoricalDataset, dest: Path):
+    """Write a dataset to `dest` as an .arrow file or a .columns bundle."""
+    if dest.suffix == ARROW_SUFFIX:
+        _save_arrow(dataset, dest)
+    else:
+        _save_bundle(dataset, dest)
+
+
+def convert_historical_records(source: Path, dest: Path) -> HistoricalDataset:
+    """Convert `source` (any supported format) to a columnar file at `dest`."""
+    dataset = load_historical_dataset(source)
+    save_historical_dataset(dataset, dest)
+    return dataset
+
+
+# ── Loading ─────────────────────────────────────────────────────────────
+
+
+def _mtime_ns(path: Path) -> int:
+    return (path / BUNDLE_META if path.is_dir() else path).stat().st_mtime_ns
+
+
+def load_historical_dataset(path: Path) -> HistoricalDataset:
+    """Load historical records from JSON, an Arrow file or a .npy bundle (uncached)."""
+    if path.is_dir():
+        return _load_bundle(path)
+    if path.suffix == ARROW_SUFFIX:
+        return _load_arrow(path)
+    with open(path, "rb") as f:
+        return HistoricalDataset.from_records(json.load(f))
+
+
+_lock = threading.Lock()
+
+# (path, mtime_ns, dataset) - replaced as a whole so readers never see a mix
+_snapshot: tuple[Path, int, HistoricalDataset] | None = None
+
+
+def get_historical_dataset() -> HistoricalDataset:
+    """Get the historical records, reloading only if the file changed on disk."""
+    global _snapshot
+    path = HISTORICAL_RECORDS_PATH
+    mtime_ns = _mtime_ns(path)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[:2] == (path, mtime_ns):
+        return snapshot[2]
+
+    with _lock:
+        if _snapshot is None or _snapshot[:2] != (path, mtime_ns):
+            _snapshot = (path, mtime_ns, load_historical_dataset(path))
+        return _snapshot[2]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convert historical records to a columnar file.")
+    parser.add_argument("source", type=Path, help="JSON file, .arrow file or .columns bundle")
+    parser.add_argument(
+        "dest", type=Path, nargs="?",
+        help=f"{ARROW_SUFFIX} file or {BUNDLE_SUFFIX} directory "
+             f"(default: source with {ARROW_SUFFIX} if pyarrow is installed, else {BUNDLE_SUFFIX})",
+    )
+    args = parser.parse_args()
+
+    dest = args.dest or args.source.with_suffix(ARROW_SUFFIX if pa is not None else BUNDLE_SUFFIX)
+    if dest.resolve() == args.source.resolve():
+        parser.error("source and dest are the same path")
+    dataset = convert_historical_records(args.source, dest)
+    print(f"Wrote {dataset.size} records ({dataset.nbytes / 1e6:.1f} MB of columns) to {dest}")
+    print(f"Serve it with HISTORICAL_RECORDS_PATH={dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,30 +2,25 @@
 
 Sends masked patient data to Claude Sonnet with the drug interaction
 knowledge base as context. Returns structured risk assessment.
+Checks that the local rule engine can resolve deterministically, or
+that repeat an already-analyzed masked regimen, never reach the network.
 """
 
+import asyncio
 import json
-import os
-from pathlib import Path
+import time
 
-import anthropic
 from dotenv import load_dotenv
 
-load_dotenv()
-
-DATA_DIR = Path(__file__).parent.parent / "data"
-
-# Load interaction knowledge base once at module level
-_interactions_kb: list[dict] | None = None
+from src.knowledge_base import get_versioned_knowledge_base
+from src.llm_client import get_async_client, record_usage
+from src.result_cache import get_cached_result, store_result
+from src.rule_engine import resolve_locally
 
+ENGINE_NAME = "llm"
+MODEL_NAME = "claude-sonnet-4-20250514"
 
-def _get_knowledge_base() -> list[dict]:
-    """Load and cache the drug interaction knowledge base."""
-    global _interactions_kb
-    if _interactions_kb is None:
-        with open(DATA_DIR / "interactions.json") as f:
-            _interactions_kb = json.load(f)
-    return _interactions_kb
+load_dotenv()
 
 
 SYSTEM_PROMPT = """You are a medication interaction safety analyst for a pharmacy system.
@@ -88,26 +83,35 @@ You MUST respond with valid JSON matching this exact structure:
 - Always provide detailed reasoning explaining your analysis step by step.
 - Respond ONLY with the JSON object. No markdown, no code fences, no extra text."""
 
+# System prompt blocks for the current KB version. The prompt and KB are
+# identical for every check, so they are sent as a cacheable prefix.
+_system_blocks: tuple[str, list[dict]] | None = None
 
-def check_interactions(masked_payload: dict) -> dict:
-    """Send masked patient data to Claude for interaction analysis.
 
-    Args:
-        masked_payload: The masked patient data (no PII) with current
-                       medications and new prescription.
+def _get_system_blocks() -> list[dict]:
+    """Build the cacheable system prompt once per knowledge base version."""
+    global _system_blocks
+    version, knowledge_base = get_versioned_knowledge_base()
+    cached = _system_blocks
+    if cached is not None and cached[0] == version:
+        return cached[1]
 
-    Returns:
-        Parsed dict matching the InteractionCheckResult schema fields:
-        risk_level, confidence_score, interactions_found, recommendation, reasoning.
-    """
-    client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    knowledge_base = _get_knowledge_base()
+    blocks = [
+        {
+            "type": "text",
+            "text": SYSTEM_PROMPT.format(
+                knowledge_base=json.dumps(knowledge_base, indent=2)
+            ),
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    _system_blocks = (version, blocks)
+    return blocks
 
-    system = SYSTEM_PROMPT.format(
-        knowledge_base=json.dumps(knowledge_base, indent=2)
-    )
 
-    user_message = f"""Analyze the following prescription for potential drug interactions:
+def _build_user_message(masked_payload: dict) -> str:
+    """Format the masked payload as the per-check user message."""
+    return f"""Analyze the following prescription for potential drug interactions:
 
 Patient ID: {masked_payload['patient_id']}
 Age Range: {masked_payload['age_range']}
@@ -123,15 +127,9 @@ New Prescription:
 Identify all potential interactions between the NEW prescription and EACH current medication.
 Also check if the new prescription conflicts with the patient's allergy categories."""
 
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2000,
-        system=system,
-        messages=[{"role": "user", "content": user_message}],
-    )
-
-    response_text = response.content[0].text
 
+def _parse_response(response_text: str) -> dict:
+    """Parse and validate Claude's JSON answer."""
     # Strip markdown code fences if Claude includes them despite instructions
     cleaned = response_text.strip()
     if cleaned.startswith("```"):
@@ -150,5 +148,56 @@ Also check if the new prescription conflicts with the patient's allergy categori
 
     # Clamp confidence score to valid range
     result["confidence_score"] = max(0.0, min(1.0, float(result["confidence_score"])))
+    result["engine"] = ENGINE_NAME
+
+    return result
+
+
+async def _ask_claude_async(masked_payload: dict) -> dict:
+    """Run the interaction analysis on Claude without blocking the event loop."""
+    client = get_async_client()
+
+    response = await client.messages.create(
+        model=MODEL_NAME,
+        max_tokens=2000,
+        system=_get_system_blocks(),
+        messages=[{"role": "user", "content": _build_user_message(masked_payload)}],
+    )
+
+    record_usage(response.usage)
+
+    return _parse_response(response.content[0].text)
+
+
+async def check_interactions_async(masked_payload: dict) -> dict:
+    """Analyze masked patient data for interactions without blocking the event loop.
+
+    Tries the local rule engine first, then the result cache, and only
+    then sends the masked data to Claude on the AsyncAnthropic client.
+    The result cache may read and write SQLite, so it runs in a worker
+    thread like the rest of the pipeline's database work.
+
+    Args:
+        masked_payload: The masked patient data (no PII) with current
+                       medications and new prescription.
+
+    Returns:
+        Parsed dict matching the InteractionCheckResult schema fields:
+        risk_level, confidence_score, interactions_found, recommendation, reasoning,
+        plus engine ("rules", "cache" or "llm") recording which engine produced it.
+    """
+    local_result = resolve_locally(masked_payload)
+    if local_result is not None:
+        return local_result
+
+    cached_result = await asyncio.to_thread(get_cached_result, masked_payload)
+    if cached_result is not None:
+        return cached_result
+
+    started = time.perf_counter()
+    result = await _ask_claude_async(masked_payload)
+    await asyncio.to_thread(
+        store_result, masked_payload, result, latency_seconds=time.perf_counter() - started
+    )
 
     return result
@@ -0,0 +1,200 @@
+"""Background interaction check jobs for SafeRx.
+
+Instead of holding the HTTP request open until Claude answers, a client
+can submit a check job and get a job id back immediately. Jobs are
+stored in SQLite (so they survive a restart) and run on a bounded pool
+of asyncio workers. Progress follows the prescription status
+(pending -> checking -> in_review/approved) and is available by polling
+or as a push stream of job snapshots.
+
+The queue does not know how a check is performed: it is given a runner
+coroutine (prescription_id -> interaction check id), so it can be run
+offline with a stubbed checker.
+"""
+
+import asyncio
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+
+from dotenv import load_dotenv
+
+from src.database import get_db, write_transaction
+
+load_dotenv()
+
+# Number of checks run concurrently by the job workers
+JOB_WORKERS = int(os.getenv("CHECK_JOB_WORKERS", "4"))
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+CheckRunner = Callable[[str], Awaitable[str]]
+
+
+def _get_job(job_id: str) -> dict | None:
+    db = get_db()
+    row = db.execute(
+        """SELECT j.*, p.status AS prescription_status
+        FROM check_jobs j
+        JOIN prescriptions p ON p.id = j.prescription_id
+        WHERE j.id = ?""",
+        (job_id,),
+    ).fetchone()
+    db.close()
+    return dict(row) if row else None
+
+
+def _insert_job(prescription_id: str) -> tuple[str, bool]:
+    """Create a queued job, or reuse one already queued/running for this prescription.
+
+    Returns:
+        (job_id, created) - created is False when an active job was reused,
+        so client retries do not duplicate work.
+    """
+    # Check and insert on the writer lane so concurrent submits cannot both insert
+    with write_transaction() as db:
+        existing = db.execute(
+            """SELECT id FROM check_jobs
+            WHERE prescription_id = ? AND status IN ('queued', 'running')""",
+            (prescription_id,),
+        ).fetchone()
+        if existing:
+            return existing["id"], False
+
+        job_id = f"JOB-{uuid.uuid4().hex[:8].upper()}"
+        db.execute(
+            "INSERT INTO check_jobs (id, prescription_id, status) VALUES (?, ?, 'queued')",
+            (job_id, prescription_id),
+        )
+    return job_id, True
+
+
+def _mark_running(job_id: str) -> str:
+    """Mark a job running and its prescription checking. Returns the prescription id."""
+    with write_transaction() as db:
+        row = db.execute("SELECT prescription_id FROM check_jobs WHERE id = ?", (job_id,)).fetchone()
+        db.execute(
+            "UPDATE check_jobs SET status = 'running', updated_at = datetime('now') WHERE id = ?",
+            (job_id,),
+        )
+        db.execute(
+            "UPDATE prescriptions SET status = 'checking' WHERE id = ?",
+            (row["prescription_id"],),
+        )
+    return row["prescription_id"]
+
+
+def _mark_completed(job_id: str, interaction_check_id: str):
+    with write_transaction() as db:
+        db.execute(
+            """UPDATE check_jobs SET status = 'completed', interaction_check_id = ?,
+            updated_at = datetime('now') WHERE id = ?""",
+            (interaction_check_id, job_id),
+        )
+
+
+def _mark_failed(job_id: str, prescription_id: str, error: str):
+    """Record the failure and put the prescription back to pending for a retry."""
+    with write_transaction() as db:
+        db.execute(
+            """UPDATE check_jobs SET status = 'failed', error = ?,
+            updated_at = datetime('now') WHERE id = ?""",
+            (error, job_id),
+        )
+        db.execute(
+            "UPDATE prescriptions SET status = 'pending' WHERE id = ? AND status = 'checking'",
+            (prescription_id,),
+        )
+
+
+def _unfinished_job_ids() -> list[str]:
+    """Jobs that were queued or interrupted mid-run by a restart."""
+    db = get_db()
+    rows = db.execute(
+        "SELECT id FROM check_jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+    ).fetchall()
+    db.close()
+    return [row["id"] for row in rows]
+
+
+class CheckJobQueue:
+    """SQLite-backed job queue drained by a bounded pool of asyncio workers."""
+
+    def __init__(self, runner: CheckRunner, workers: int = JOB_WORKERS):
+        self.runner = runner
+        self.workers = workers
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    async def start(self):
+        """Re-enqueue unfinished jobs from SQLite and start the workers."""
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(_unfinished_job_ids):
+            self._queue.put_nowait(job_id)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"check-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancel the workers. Interrupted jobs stay 'running' and resume on next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, prescription_id: str) -> dict:
+        """Queue a check for a prescription and return the job snapshot."""
+        job_id, created = await asyncio.to_thread(_insert_job, prescription_id)
+        if created:
+            self._queue.put_nowait(job_id)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> dict | None:
+        return await asyncio.to_thread(_get_job, job_id)
+
+    async def events(self, job_id: str):
+        """Yield job snapshots as the job progresses, ending at a terminal status."""
+        updates: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(updates)
+        try:
+            job = await self.get(job_id)
+            while job is not None:
+                yield job
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+                job = await updates.get()
+        finally:
+            self._subscribers[job_id].discard(updates)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    async def _publish(self, job_id: str):
+        if job_id not in self._subscribers:
+            return
+        job = await self.get(job_id)
+        for updates in self._subscribers.get(job_id, ()):
+            updates.put_nowait(job)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        prescription_id = await asyncio.to_thread(_mark_running, job_id)
+        await self._publish(job_id)
+        try:
+            interaction_check_id = await self.runner(prescription_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            detail = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+            await asyncio.to_thread(_mark_failed, job_id, prescription_id, str(detail))
+        else:
+            await asyncio.to_thread(_mark_completed, job_id, interaction_check_id)
+        await self._publish(job_id)
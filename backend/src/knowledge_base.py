@@ -0,0 +1,52 @@
+"""Drug interaction knowledge base loading for SafeRx.
+
+Loads data/interactions.json once and reloads it when the file changes
+on disk. Each load is tagged with a content hash (the KB version) so
+anything derived from the KB - the cached system prompt, the local rule
+index, cached check results - can be rebuilt or invalidated per version.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+KNOWLEDGE_BASE_PATH = DATA_DIR / "interactions.json"
+
+_lock = threading.Lock()
+
+# (mtime_ns, version, rules) - replaced as a whole so readers never see a mix
+_snapshot: tuple[int, str, list[dict]] | None = None
+
+
+def _load() -> tuple[int, str, list[dict]]:
+    """Return the current KB snapshot, reloading if the file's mtime changed."""
+    global _snapshot
+    mtime_ns = KNOWLEDGE_BASE_PATH.stat().st_mtime_ns
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[0] == mtime_ns:
+        return snapshot
+
+    with _lock:
+        if _snapshot is None or _snapshot[0] != mtime_ns:
+            raw = KNOWLEDGE_BASE_PATH.read_bytes()
+            version = hashlib.sha256(raw).hexdigest()[:16]
+            _snapshot = (mtime_ns, version, json.loads(raw))
+        return _snapshot
+
+
+def get_knowledge_base() -> list[dict]:
+    """Get the current interaction rules."""
+    return _load()[2]
+
+
+def get_kb_version() -> str:
+    """Get a content hash identifying the current KB version."""
+    return _load()[1]
+
+
+def get_versioned_knowledge_base() -> tuple[str, list[dict]]:
+    """Get the KB version and its rules from the same load."""
+    _, version, rules = _load()
+    return version, rules
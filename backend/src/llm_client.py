@@ -0,0 +1,153 @@
+"""Process-wide Anthropic client management for SafeRx.
+
+Creating an Anthropic client per interaction check opens a fresh HTTP
+connection pool (and a new TLS handshake) for every prescription. This
+module keeps a single pooled async client for the whole process, tracks how often requests reuse a keep-alive connection, and
+closes the pool on application shutdown. Token usage reported by the API is accumulated
+here too, split by prompt-cache hit vs. miss, for the cost model.
+"""
+
+import os
+import threading
+
+import anthropic
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connection pool settings - can be overridden via environment variables
+MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS", "60"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("ANTHROPIC_TIMEOUT_SECONDS", "60"))
+
+
+class ClientManager:
+    """Owns the shared Anthropic client and its connection metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._async_client: anthropic.AsyncAnthropic | None = None
+        self._requests = 0
+        self._connections_opened = 0
+        self._clients_created = 0
+        self._usage = {
+            outcome: {
+                "calls": 0,
+                "input_tokens": 0,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 0,
+                "output_tokens": 0,
+            }
+            for outcome in ("cache_hit", "cache_miss")
+        }
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+
+    def _trace(self, event_name: str, info: dict):
+        """httpcore trace callback: a TCP connect means a new pooled connection."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections_opened += 1
+
+    async def _on_async_request(self, request: httpx.Request):
+        """httpx request hook: count the request and trace connection setup."""
+        with self._lock:
+            self._requests += 1
+        request.extensions["trace"] = self._async_trace
+
+    async def _async_trace(self, event_name: str, info: dict):
+        self._trace(event_name, info)
+
+    def get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Return the shared async client, creating it on first use.
+
+        Must be called from the event loop that serves requests; the
+        lifespan handler closes it on shutdown.
+        """
+        with self._lock:
+            if self._async_client is None:
+                http_client = anthropic.DefaultAsyncHttpxClient(
+                    limits=self._limits(),
+                    timeout=REQUEST_TIMEOUT_SECONDS,
+                    event_hooks={"request": [self._on_async_request]},
+                )
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    http_client=http_client,
+                )
+                self._clients_created += 1
+            return self._async_client
+
+    async def close(self):
+        """Close the shared client and release its pooled connections."""
+        with self._lock:
+            async_client, self._async_client = self._async_client, None
+        if async_client is not None:
+            await async_client.close()
+
+    def record_usage(self, usage):
+        """Accumulate token usage, split by whether the prompt cache was hit."""
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        bucket = self._usage["cache_hit" if cache_read > 0 else "cache_miss"]
+        with self._lock:
+            bucket["calls"] += 1
+            bucket["input_tokens"] += usage.input_tokens or 0
+            bucket["cache_read_input_tokens"] += cache_read
+            bucket["cache_creation_input_tokens"] += cache_write
+            bucket["output_tokens"] += usage.output_tokens or 0
+
+    def usage(self) -> dict:
+        """Token usage since process start, keyed by cache_hit / cache_miss."""
+        with self._lock:
+            return {outcome: dict(totals) for outcome, totals in self._usage.items()}
+
+    def stats(self) -> dict:
+        """Connection reuse metrics since process start."""
+        with self._lock:
+            reused = max(self._requests - self._connections_opened, 0)
+            return {
+                "requests": self._requests,
+                "connections_opened": self._connections_opened,
+                "connections_reused": reused,
+                "reuse_rate": round(reused / self._requests, 4) if self._requests else 0.0,
+                "clients_created": self._clients_created,
+                "max_connections": MAX_CONNECTIONS,
+                "max_keepalive_connections": MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry_seconds": KEEPALIVE_EXPIRY_SECONDS,
+            }
+
+
+_manager = ClientManager()
+
+
+def get_async_client() -> anthropic.AsyncAnthropic:
+    """Get the process-wide pooled AsyncAnthropic client."""
+    return _manager.get_async_client()
+
+
+async def close_clients():
+    """Close pooled clients. Called from the FastAPI lifespan on shutdown."""
+    await _manager.close()
+
+
+def get_connection_stats() -> dict:
+    """Get reused vs. newly opened connection counts for monitoring."""
+    return _manager.stats()
+
+
+def record_usage(usage):
+    """Record the token usage reported on a Messages API response."""
+    _manager.record_usage(usage)
+
+
+def get_usage_stats() -> dict:
+    """Get token usage split by prompt-cache hits and misses."""
+    return _manager.usage()
@@ -9,7 +9,7 @@ import json
 import uuid
 from datetime import datetime, date
 
-from src.database import get_db
+from src.event_writer import enqueue_event, sqlite_now
 
 
 def _calculate_age(dob_str: str) -> int:
@@ -55,7 +55,11 @@ def _categorize_allergies(allergies: list[str]) -> list[str]:
     return categories
 
 
-def mask_patient_data(patient: dict, prescription: dict) -> dict:
+# Fields removed or generalized by mask_patient_data(), recorded on masking events
+MASKED_FIELDS = ["name", "date_of_birth", "weight_kg", "allergies", "prescriber"]
+
+
+def mask_patient_data(patient: dict, prescription: dict, log_event: bool = True) -> dict:
     """Mask patient PHI for AI processing.
 
     Returns both raw and masked payloads for the UI comparison view.
@@ -63,6 +67,9 @@ def mask_patient_data(patient: dict, prescription: dict) -> dict:
     Args:
         patient: Full patient record (from database, with medications).
         prescription: New prescription being submitted.
+        log_event: Record the masking event, queued for the event writer
+            (src/event_writer.py). The check pipeline passes False and logs
+            it inside the check's write transaction, which it joins.
 
     Returns:
         Dict with 'raw' and 'masked' keys containing the respective payloads.
@@ -125,11 +132,12 @@ def mask_patient_data(patient: dict, prescription: dict) -> dict:
     }
 
     # Log the masking event
-    log_masking_event(
-        prescription_id=prescription.get("id", "pending"),
-        event_type="mask",
-        fields_affected=["name", "date_of_birth", "weight_kg", "allergies", "prescriber"],
-    )
+    if log_event:
+        log_masking_event(
+            prescription_id=prescription.get("id", "pending"),
+            event_type="mask",
+            fields_affected=MASKED_FIELDS,
+        )
 
     return {"raw": raw, "masked": masked}
 
@@ -137,21 +145,21 @@ def mask_patient_data(patient: dict, prescription: dict) -> dict:
 def log_masking_event(prescription_id: str, event_type: str, fields_affected: list[str]):
     """Record a masking or de-masking event in the audit trail.
 
+    The row is queued for the event writer (see src/event_writer.py).
+
     Args:
         prescription_id: The prescription this event relates to.
         event_type: Either 'mask' or 'demask'.
         fields_affected: List of field names that were masked/de-masked.
     """
-    db = get_db()
-    db.execute(
-        """INSERT INTO masking_events (id, prescription_id, event_type, fields_affected)
-        VALUES (?, ?, ?, ?)""",
+    enqueue_event(
+        """INSERT INTO masking_events (id, prescription_id, event_type, fields_affected, created_at)
+        VALUES (?, ?, ?, ?, ?)""",
         (
             str(uuid.uuid4()),
             prescription_id,
             event_type,
             json.dumps(fields_affected),
+            sqlite_now(),
         ),
     )
-    db.commit()
-    db.close()
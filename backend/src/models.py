@@ -33,6 +33,19 @@ class RoutingDecision(str, Enum):
     ROUTED_TO_PHARMACIST = "routed_to_pharmacist"
 
 
+class CheckEngine(str, Enum):
+    RULES = "rules"
+    CACHE = "cache"
+    LLM = "llm"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class ReviewDecision(str, Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
@@ -46,6 +59,22 @@ class InteractionSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+class RollupGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+class SearchSource(str, Enum):
+    FEEDBACK = "feedback"
+    REASONING = "reasoning"
+
+
 # --- Patient ---
 
 class PatientMedication(BaseModel):
@@ -94,6 +123,17 @@ class Prescription(BaseModel):
     created_at: str
 
 
+class BulkCheckMode(str, Enum):
+    NONE = "none"
+    INLINE = "inline"
+    JOB = "job"
+
+
+class BulkPrescriptionCreate(BaseModel):
+    prescriptions: list[PrescriptionCreate] = Field(min_length=1, max_length=1000)
+    check_mode: BulkCheckMode = BulkCheckMode.INLINE
+
+
 # --- Masking ---
 
 class RawPayload(BaseModel):
@@ -142,11 +182,42 @@ class InteractionCheckResult(BaseModel):
     recommendation: Recommendation
     reasoning: str
     routing_decision: RoutingDecision
+    engine: CheckEngine = CheckEngine.LLM
     masked_payload: MaskedPayload
     raw_payload: RawPayload
     created_at: str
 
 
+# --- Background Check Jobs ---
+
+class CheckJob(BaseModel):
+    id: str
+    prescription_id: str
+    status: JobStatus
+    prescription_status: PrescriptionStatus
+    interaction_check_id: str | None = None
+    error: str | None = None
+    created_at: str
+    updated_at: str
+    result: InteractionCheckResult | None = None
+
+
+# --- Bulk Submission ---
+
+class BulkPrescriptionResult(BaseModel):
+    index: int
+    prescription: Prescription | None = None
+    interaction_check: InteractionCheckResult | None = None
+    job_id: str | None = None
+    error: str | None = None
+
+
+class BulkPrescriptionResponse(BaseModel):
+    items: list[BulkPrescriptionResult]
+    submitted_count: int
+    failed_count: int
+
+
 # --- Pharmacist Review ---
 
 class ReviewCreate(BaseModel):
@@ -175,6 +246,21 @@ class QueueItem(BaseModel):
     review: PharmacistReview | None = None
 
 
+class QueueItemSummary(BaseModel):
+    """Lightweight queue row for list views; full detail is in /api/queue/{check_id}."""
+    check_id: str
+    prescription_id: str
+    patient_id: str
+    patient_name: str
+    medication_name: str
+    dosage: str
+    risk_level: RiskLevel
+    confidence_score: float
+    recommendation: Recommendation
+    engine: CheckEngine
+    created_at: str
+
+
 # --- Audit Log ---
 
 class AuditEntry(BaseModel):
@@ -193,6 +279,29 @@ class AuditEntry(BaseModel):
     final_status: str
 
 
+# --- Search ---
+
+class ReviewSearchHit(BaseModel):
+    """A pharmacist feedback (audit entry) or AI reasoning (interaction check) match."""
+    source: SearchSource
+    id: str
+    prescription_id: str | None = None
+    medication_name: str | None = None
+    risk_level: str | None = None
+    pharmacist_decision: str | None = None
+    timestamp: str | None = None
+    snippet: str
+    score: float
+
+
+class ReviewSearchResponse(BaseModel):
+    query: str
+    source: SearchSource | None = None
+    hits: list[ReviewSearchHit]
+    # Only the newest SEARCH_RANK_WINDOW matches were ranked
+    truncated: bool = False
+
+
 # --- Analytics ---
 
 class AnalyticsSummary(BaseModel):
@@ -206,6 +315,22 @@ class AnalyticsSummary(BaseModel):
     risk_distribution: dict[str, int]
 
 
+class AnalyticsTimeseriesResponse(BaseModel):
+    """AnalyticsSummary metrics per bucket; each list has one entry per bucket."""
+    granularity: RollupGranularity
+    start: str
+    end: str
+    buckets: list[str]
+    total_prescriptions: list[int]
+    auto_approved_count: list[int]
+    pharmacist_reviewed_count: list[int]
+    auto_approve_rate: list[float]
+    override_rate: list[float]
+    average_confidence: list[float | None]
+    average_time_to_decision_seconds: list[float | None]
+    risk_distribution: dict[str, list[int]]
+
+
 class ThresholdSimulationResult(BaseModel):
     threshold: float
     auto_approved_count: int
@@ -220,6 +345,25 @@ class ThresholdSimulationResponse(BaseModel):
     simulations: list[ThresholdSimulationResult]
 
 
+class ThresholdSweepCell(BaseModel):
+    """One gate combination of a sweep; arrays are aligned with the sweep thresholds."""
+    max_risk_level: RiskLevel
+    require_ai_approval: bool
+    auto_approved_count: list[int]
+    routed_to_pharmacist_count: list[int]
+    estimated_false_negatives: list[int]
+    false_negative_rate: list[float]
+    pharmacist_hours_per_day: list[float]
+
+
+class ThresholdSweepResponse(BaseModel):
+    current_threshold: float
+    current_max_risk_level: RiskLevel
+    total_records: int
+    thresholds: list[float]
+    cells: list[ThresholdSweepCell]
+
+
 # --- Cost & ROI ---
 
 class CostBreakdown(BaseModel):
@@ -268,8 +412,26 @@ class DataSources(BaseModel):
     historical_record_count: int
 
 
+class PromptCacheCost(BaseModel):
+    """Per-check cost with the system prompt + KB sent as a cached prefix."""
+    cached_prefix_tokens: int
+    uncached_input_tokens_per_check: int
+    cache_write_price_per_million: float
+    cache_read_price_per_million: float
+    cost_per_check_without_caching: float
+    cost_per_check_cache_miss: float
+    cost_per_check_cache_hit: float
+    live_cache_hits: int
+    live_cache_misses: int
+    live_cache_hit_rate: float
+    live_cache_hit_spend: float
+    live_cache_miss_spend: float
+    live_savings_vs_uncached: float
+
+
 class CostROIResponse(BaseModel):
     cost_breakdown: CostBreakdown
     roi_analysis: ROIAnalysis
     projections: list[CostProjection]
     data_sources: DataSources
+    prompt_cache: PromptCacheCost
@@ -0,0 +1,235 @@
+"""Content-addressed cache of AI interaction check results.
+
+The same masked regimen (current medications, new drug/dose/frequency,
+allergy categories, age and weight ranges) is often re-checked for
+different patients. Results are cached under a canonical hash of those
+PHI-free fields - never the patient token - together with the KB
+version, with TTL expiry and LRU eviction. Entries can
+optionally be written through to SQLite so they survive a restart.
+The whole cache is dropped when the knowledge base file changes.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+from src.database import get_db, write_transaction
+from src.knowledge_base import get_kb_version
+
+load_dotenv()
+
+ENGINE_NAME = "cache"
+
+# Cache settings - can be overridden via environment variables
+CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+CACHE_PERSIST = os.getenv("RESULT_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+
+def _normalize(value: str) -> str:
+    return " ".join(str(value).split()).lower()
+
+
+def cache_key(masked_payload: dict, kb_version: str) -> str:
+    """Canonical hash of the PHI-free fields of a masked payload.
+
+    patient_id is excluded, medication and allergy order is ignored,
+    and names are case/whitespace normalized.
+    """
+    def med_key(med: dict) -> list[str]:
+        return [_normalize(med["medication_name"]), _normalize(med["dosage"]), _normalize(med["frequency"])]
+
+    canonical = {
+        "kb_version": kb_version,
+        "age_range": masked_payload["age_range"],
+        "weight_range": masked_payload["weight_range"],
+        "allergy_categories": sorted(_normalize(c) for c in masked_payload["allergy_categories"]),
+        "current_medications": sorted(med_key(m) for m in masked_payload["current_medications"]),
+        "new_prescription": med_key(masked_payload["new_prescription"]),
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache with optional SQLite write-through."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, persist: bool):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist = persist
+        self._lock = threading.Lock()
+        # key -> (created_at, result, source_patient_id, latency_seconds)
+        self._entries: OrderedDict[str, tuple[float, dict, str, float]] = OrderedDict()
+        self._kb_version: str | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._saved_latency_seconds = 0.0
+
+    def _check_kb_version(self, kb_version: str) -> bool:
+        """Drop every entry if the knowledge base changed. Caller holds the lock.
+
+        Returns whether the persisted entries need purging too; the caller
+        does that with _purge_persisted() after releasing the lock.
+        """
+        if self._kb_version == kb_version:
+            return False
+        if self._kb_version is not None:
+            self._invalidations += 1
+        self._entries.clear()
+        self._kb_version = kb_version
+        return self.persist
+
+    def _purge_persisted(self, kb_version: str):
+        with write_transaction() as db:
+            db.execute("DELETE FROM interaction_result_cache WHERE kb_version != ?", (kb_version,))
+
+    def _load_persisted(self, key: str) -> tuple[float, dict, str, float] | None:
+        db = get_db()
+        row = db.execute(
+            "SELECT * FROM interaction_result_cache WHERE key = ?", (key,)
+        ).fetchone()
+        db.close()
+        if not row:
+            return None
+        return (row["created_at"], json.loads(row["result"]), row["source_patient_id"], row["latency_seconds"])
+
+    def _persist(self, key: str, kb_version: str, entry: tuple[float, dict, str, float]):
+        created_at, result, source_patient_id, latency_seconds = entry
+        with write_transaction() as db:
+            db.execute(
+                """INSERT OR REPLACE INTO interaction_result_cache
+                (key, kb_version, result, source_patient_id, latency_seconds, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, kb_version, json.dumps(result), source_patient_id, latency_seconds, created_at),
+            )
+            # Keep the persisted table bounded the same way as the in-memory LRU
+            db.execute(
+                """DELETE FROM interaction_result_cache WHERE key NOT IN (
+                    SELECT key FROM interaction_result_cache ORDER BY created_at DESC LIMIT ?
+                )""",
+                (self.max_entries,),
+            )
+
+    def _delete_persisted(self, key: str):
+        with write_transaction() as db:
+            db.execute("DELETE FROM interaction_result_cache WHERE key = ?", (key,))
+
+    def get(self, masked_payload: dict) -> dict | None:
+        """Return a cached result for this regimen, or None on a miss."""
+        kb_version = get_kb_version()
+        key = cache_key(masked_payload, kb_version)
+        now = time.time()
+
+        # SQLite reads and writes happen outside the lock, so in-memory
+        # lookups never wait behind disk I/O or the writer lane
+        with self._lock:
+            purge = self._check_kb_version(kb_version)
+            entry = self._entries.get(key)
+        if purge:
+            self._purge_persisted(kb_version)
+        if entry is None and self.persist:
+            entry = self._load_persisted(key)
+        expired = entry is not None and now - entry[0] > self.ttl_seconds
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current is not entry:
+                # A put() landed while the lock was released; it is newer
+                # than what we read, so serve it rather than overwrite it
+                entry, expired = current, False
+            if expired:
+                if current is entry:
+                    self._entries.pop(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+            else:
+                # Only re-insert under the KB version the key was hashed for;
+                # an invalidation in between has already dropped this entry
+                if self._kb_version == kb_version:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    self._evict()
+                self._hits += 1
+                self._saved_latency_seconds += entry[3]
+
+        if expired and self.persist:
+            self._delete_persisted(key)
+        if entry is None:
+            return None
+
+        _, result, source_patient_id, _ = entry
+        result = copy.deepcopy(result)
+        # Claude's reasoning may quote the masked token of the patient it analyzed
+        result["reasoning"] = result["reasoning"].replace(source_patient_id, masked_payload["patient_id"])
+        result["engine"] = ENGINE_NAME
+        return result
+
+    def put(self, masked_payload: dict, result: dict, latency_seconds: float):
+        """Cache a fresh AI result and the latency it took to produce."""
+        kb_version = get_kb_version()
+        key = cache_key(masked_payload, kb_version)
+        entry = (time.time(), copy.deepcopy(result), masked_payload["patient_id"], latency_seconds)
+
+        with self._lock:
+            purge = self._check_kb_version(kb_version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+        if purge:
+            self._purge_persisted(kb_version)
+        if self.persist:
+            self._persist(key, kb_version, entry)
+
+    def _evict(self):
+        """Evict least recently used entries over capacity. Caller holds the lock."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self.persist,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "kb_invalidations": self._invalidations,
+                "kb_version": self._kb_version,
+                "saved_llm_latency_seconds": round(self._saved_latency_seconds, 3),
+            }
+
+
+_cache = ResultCache(CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_PERSIST)
+
+
+def get_cached_result(masked_payload: dict) -> dict | None:
+    """Look up a cached AI result for a masked payload."""
+    return _cache.get(masked_payload)
+
+
+def store_result(masked_payload: dict, result: dict, latency_seconds: float):
+    """Cache an AI result for a masked payload."""
+    _cache.put(masked_payload, result, latency_seconds)
+
+
+def get_cache_stats() -> dict:
+    """Hit rate and saved LLM latency for the analytics endpoint."""
+    return _cache.stats()
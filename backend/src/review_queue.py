@@ -0,0 +1,240 @@
+"""Set-based loading of pharmacist review queue items.
+
+Each queue item combines the prescription, the patient with their active
+medications, the AI interaction check and any pharmacist review. These
+are fetched with a constant number of queries regardless of queue depth:
+one JOIN over checks, prescriptions, patients and reviews, plus one
+batched medications query grouped by patient in Python.
+
+The queue API is paged with an opaque keyset cursor over the check's
+(created_at, id), newest first. Queue membership is the trigger-kept
+interaction_checks.in_review_queue flag (see REVIEW_QUEUE_MEMBERSHIP in
+src/database.py), whose partial index is in page order: a page seeks to
+the cursor and reads `limit` entries, so it costs O(page) however deep
+the queue or the review history. List views can ask for a summary
+projection that skips the payloads, reasoning and medications entirely.
+"""
+
+import base64
+import json
+
+from src.database import get_db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Matches idx_interaction_checks_review_queue's WHERE, so queue queries use it
+_QUEUE_FILTER = "ic.in_review_queue = 1"
+
+_QUEUE_SUMMARY_SELECT = """
+    SELECT
+        ic.id AS check_id, ic.prescription_id, p.patient_id,
+        pt.name AS patient_name, p.medication_name, p.dosage,
+        ic.risk_level, ic.confidence_score, ic.recommendation, ic.engine,
+        ic.created_at
+    FROM interaction_checks ic
+    JOIN prescriptions p ON ic.prescription_id = p.id
+    JOIN patients pt ON p.patient_id = pt.id
+"""
+
+_QUEUE_ITEM_SELECT = """
+    SELECT
+        ic.id AS check_id,
+        ic.prescription_id AS check_prescription_id,
+        ic.risk_level, ic.confidence_score, ic.interactions_found,
+        ic.recommendation, ic.reasoning, ic.routing_decision, ic.engine,
+        ic.masked_payload, ic.raw_payload,
+        ic.created_at AS check_created_at,
+        p.id AS rx_id, p.patient_id AS rx_patient_id,
+        p.medication_name AS rx_medication_name, p.dosage AS rx_dosage,
+        p.frequency AS rx_frequency, p.prescriber AS rx_prescriber,
+        p.status AS rx_status, p.created_at AS rx_created_at,
+        pt.name AS patient_name, pt.date_of_birth AS patient_date_of_birth,
+        pt.weight_kg AS patient_weight_kg, pt.allergies AS patient_allergies,
+        r.id AS review_id, r.decision AS review_decision,
+        r.agrees_with_ai AS review_agrees_with_ai,
+        r.feedback_text AS review_feedback_text,
+        r.time_to_decision_seconds AS review_time_to_decision_seconds,
+        r.created_at AS review_created_at
+    FROM interaction_checks ic
+    JOIN prescriptions p ON ic.prescription_id = p.id
+    JOIN patients pt ON p.patient_id = pt.id
+    LEFT JOIN pharmacist_reviews r ON r.interaction_check_id = ic.id
+"""
+
+
+def _medications_by_patient(db, patient_ids: set[str]) -> dict[str, list[dict]]:
+    """Fetch active medications for many patients in one query."""
+    meds: dict[str, list[dict]] = {patient_id: [] for patient_id in patient_ids}
+    if not patient_ids:
+        return meds
+
+    placeholders = ",".join("?" * len(patient_ids))
+    rows = db.execute(
+        f"""SELECT * FROM patient_medications
+        WHERE active = 1 AND patient_id IN ({placeholders})""",
+        list(patient_ids),
+    ).fetchall()
+
+    for med in rows:
+        meds[med["patient_id"]].append({
+            "id": med["id"],
+            "medication_name": med["medication_name"],
+            "dosage": med["dosage"],
+            "frequency": med["frequency"],
+            "prescriber": med["prescriber"],
+            "start_date": med["start_date"],
+        })
+    return meds
+
+
+def _build_items(db, rows) -> list[dict]:
+    """Assemble queue item dicts from joined rows plus one medications query."""
+    meds = _medications_by_patient(db, {row["rx_patient_id"] for row in rows})
+
+    items = []
+    for row in rows:
+        review = None
+        if row["review_id"] is not None:
+            review = {
+                "id": row["review_id"],
+                "interaction_check_id": row["check_id"],
+                "decision": row["review_decision"],
+                "agrees_with_ai": row["review_agrees_with_ai"],
+                "feedback_text": row["review_feedback_text"],
+                "time_to_decision_seconds": row["review_time_to_decision_seconds"],
+                "created_at": row["review_created_at"],
+            }
+
+        items.append({
+            "prescription": {
+                "id": row["rx_id"],
+                "patient_id": row["rx_patient_id"],
+                "medication_name": row["rx_medication_name"],
+                "dosage": row["rx_dosage"],
+                "frequency": row["rx_frequency"],
+                "prescriber": row["rx_prescriber"],
+                "status": row["rx_status"],
+                "created_at": row["rx_created_at"],
+            },
+            "patient": {
+                "id": row["rx_patient_id"],
+                "name": row["patient_name"],
+                "date_of_birth": row["patient_date_of_birth"],
+                "weight_kg": row["patient_weight_kg"],
+                "allergies": json.loads(row["patient_allergies"]),
+                "medications": meds[row["rx_patient_id"]],
+            },
+            "interaction_check": {
+                "id": row["check_id"],
+                "prescription_id": row["check_prescription_id"],
+                "risk_level": row["risk_level"],
+                "confidence_score": row["confidence_score"],
+                "interactions_found": json.loads(row["interactions_found"]),
+                "recommendation": row["recommendation"],
+                "reasoning": row["reasoning"],
+                "routing_decision": row["routing_decision"],
+                "engine": row["engine"],
+                "masked_payload": json.loads(row["masked_payload"]),
+                "raw_payload": json.loads(row["raw_payload"]),
+                "created_at": row["check_created_at"],
+            },
+            "review": review,
+        })
+    return items
+
+
+def encode_cursor(created_at: str, check_id: str) -> str:
+    """Opaque cursor pointing just past the given item (queue or audit page)."""
+    raw = json.dumps([created_at, check_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from encode_cursor(). Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, check_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid page cursor: {cursor}") from exc
+    return str(created_at), str(check_id)
+
+
+def load_review_queue() -> list[dict]:
+    """Load every check routed to a pharmacist whose prescription is still in review.
+
+    Runs two queries no matter how deep the queue is.
+    """
+    db = get_db()
+    rows = db.execute(
+        _QUEUE_ITEM_SELECT
+        + f"WHERE {_QUEUE_FILTER} ORDER BY ic.created_at DESC, ic.id DESC"
+    ).fetchall()
+    items = _build_items(db, rows)
+    db.close()
+    return items
+
+
+def load_review_queue_page(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    summary: bool = False,
+) -> tuple[list[dict], str | None]:
+    """Load one page of the review queue, newest first.
+
+    Args:
+        limit: Page size, clamped to 1..MAX_PAGE_SIZE.
+        cursor: next_cursor from the previous page, or None for the first page.
+        summary: Return the lightweight summary projection instead of full items.
+
+    Returns:
+        (items, next_cursor) - next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    where = _QUEUE_FILTER
+    params: list = []
+    if cursor:
+        where += " AND (ic.created_at, ic.id) < (?, ?)"
+        params.extend(decode_cursor(cursor))
+
+    select = _QUEUE_SUMMARY_SELECT if summary else _QUEUE_ITEM_SELECT
+    # Fetch one extra row to learn whether another page exists
+    query = select + f"WHERE {where} ORDER BY ic.created_at DESC, ic.id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    db = get_db()
+    rows = db.execute(query, params).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if summary:
+        items = [dict(row) for row in rows]
+    else:
+        items = _build_items(db, rows)
+    db.close()
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        if summary:
+            next_cursor = encode_cursor(last["created_at"], last["check_id"])
+        else:
+            next_cursor = encode_cursor(last["check_created_at"], last["check_id"])
+    return items, next_cursor
+
+
+def count_review_queue() -> int:
+    """Number of checks waiting for pharmacist review; counts the partial queue index."""
+    db = get_db()
+    count = db.execute(f"SELECT COUNT(*) FROM interaction_checks ic WHERE {_QUEUE_FILTER}").fetchone()[0]
+    db.close()
+    return count
+
+
+def load_queue_item(check_id: str) -> dict | None:
+    """Load a single queue item by interaction check id, or None if not found."""
+    db = get_db()
+    rows = db.execute(_QUEUE_ITEM_SELECT + "WHERE ic.id = ?", (check_id,)).fetchall()
+    items = _build_items(db, rows)
+    db.close()
+    return items[0] if items else None
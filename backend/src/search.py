@@ -0,0 +1,128 @@
+"""Full-text search over pharmacist feedback and AI reasoning.
+
+search_reviews() backs /api/search. It queries the trigger-maintained
+FTS5 index review_search (see SEARCH_SOURCES in src/database.py), ranks
+matches by bm25 and joins only the top hits back to audit_log or
+interaction_checks for their context. Ranking covers the newest
+SEARCH_RANK_WINDOW matches; when a query has more, the result says it
+was truncated.
+"""
+
+import os
+
+from src.database import SEARCH_SOURCES, get_db
+
+# Matches ranked per query. bm25 scores the newest SEARCH_RANK_WINDOW
+# matching entries, so a term found in half the log doesn't rank half
+# the log; an older, better match is then left out and the result is
+# flagged truncated. 0 ranks every match, at O(matches) per query.
+SEARCH_RANK_WINDOW = int(os.getenv("SEARCH_RANK_WINDOW", "1000"))
+
+# Highlight markers around matched terms in snippets; plain text, so
+# clients can render snippets without escaping HTML
+SNIPPET_MARKERS = ("**", "**")
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+# Newer entries have higher review_search rowids: the newest match left
+# out of the rank window, if any. Walks at most SEARCH_RANK_WINDOW + 1
+# matches in rowid order.
+_WINDOW_CUTOFF_SQL = """SELECT rowid FROM review_search WHERE review_search MATCH :match
+ORDER BY rowid DESC LIMIT 1 OFFSET :window"""
+
+# bm25() in ORDER BY measures faster than the rank column. This stays a
+# top-level query: SQLite then builds snippets only for the rows that
+# make the LIMIT, whereas as a subquery it builds one per ranked match.
+_RANKED_SQL = f"""SELECT rowid, -bm25(review_search) AS score,
+    snippet(review_search, -1, :open, :close, :ellipsis, {SNIPPET_TOKENS}) AS snippet
+FROM review_search
+WHERE review_search MATCH :match AND rowid > :cutoff
+ORDER BY bm25(review_search) LIMIT :limit"""
+
+# Context for the ranked documents from their source rows
+_CONTEXT_SQL = """SELECT d.id AS doc_id, d.source, d.source_id AS id,
+    COALESCE(a.prescription_id, ic.prescription_id) AS prescription_id,
+    COALESCE(a.medication_name, p.medication_name) AS medication_name,
+    COALESCE(a.ai_risk_level, ic.risk_level) AS risk_level,
+    a.pharmacist_decision,
+    COALESCE(a.timestamp, ic.created_at) AS timestamp
+FROM review_search_docs d
+LEFT JOIN audit_log a ON d.source = 'feedback' AND a.id = d.source_id
+LEFT JOIN interaction_checks ic ON d.source = 'reasoning' AND ic.id = d.source_id
+LEFT JOIN prescriptions p ON p.id = ic.prescription_id
+WHERE d.id IN ({placeholders})"""
+
+
+def match_expression(query: str, source: str | None = None) -> str:
+    """FTS5 MATCH expression finding entries with every term in `query`.
+
+    Terms are quoted, so punctuation and FTS5 operators in user input
+    are searched for literally; a trailing * keeps a prefix search.
+    `source` limits the match to that source's column.
+
+    Raises:
+        ValueError: if the query has no terms or the source is unknown.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query has no terms")
+    expression = " ".join(terms)
+    if source is None:
+        return expression
+    if source not in SEARCH_SOURCES:
+        raise ValueError(f"Unknown search source '{source}'; expected one of {sorted(SEARCH_SOURCES)}")
+    return f"{{{source}}} : ({expression})"
+
+
+def search_reviews(query: str, source: str | None = None, limit: int = 20) -> tuple[list[dict], bool]:
+    """Best-matching feedback and reasoning entries for `query`, best first.
+
+    Args:
+        query: Search terms; entries must contain all of them.
+        source: "feedback" (audit_log.pharmacist_feedback) or "reasoning"
+            (interaction_checks.reasoning); None searches both.
+        limit: Max hits to return.
+
+    Returns:
+        (hits, truncated) - one dict per hit: source, id (audit entry or
+        interaction check), snippet, score (higher is better),
+        prescription_id, medication_name, risk_level,
+        pharmacist_decision (feedback only) and timestamp. truncated is
+        True when there were more than SEARCH_RANK_WINDOW matches, so
+        only the newest of them were ranked.
+    """
+    expression = match_expression(query, source)
+    db = get_db()
+    cutoff = None
+    if SEARCH_RANK_WINDOW > 0:
+        cutoff = db.execute(_WINDOW_CUTOFF_SQL, {"match": expression, "window": SEARCH_RANK_WINDOW}).fetchone()
+    open_marker, close_marker = SNIPPET_MARKERS
+    ranked = db.execute(_RANKED_SQL, {
+        "match": expression,
+        "cutoff": cutoff["rowid"] if cutoff else 0,
+        "limit": limit,
+        "open": open_marker,
+        "close": close_marker,
+        "ellipsis": SNIPPET_ELLIPSIS,
+    }).fetchall()
+    context = {}
+    if ranked:
+        rowids = [row["rowid"] for row in ranked]
+        sql = _CONTEXT_SQL.format(placeholders=", ".join("?" * len(rowids)))
+        context = {row["doc_id"]: row for row in db.execute(sql, rowids)}
+    db.close()
+
+    hits = []
+    for row in ranked:
+        # Skip a document deleted between the two queries
+        if row["rowid"] not in context:
+            continue
+        hit = dict(context[row["rowid"]])
+        del hit["doc_id"]
+        hits.append({**hit, "snippet": row["snippet"], "score": row["score"]})
+    return hits, cutoff is not None
@@ -0,0 +1,5 @@
+-- Record which engine produced each interaction check:
+-- 'rules' (deterministic local KB match) or 'llm' (Claude).
+
+ALTER TABLE interaction_checks
+    ADD COLUMN IF NOT EXISTS engine TEXT NOT NULL DEFAULT 'llm';
@@ -0,0 +1,28 @@
+-- Secondary indexes for the hot query predicates.
+-- Mirrors INDEXES (INDEX_VERSION 1) in src/database.py. check_jobs and
+-- interaction_result_cache are SQLite-only, so their indexes are not here.
+
+-- Active medications per patient; covers the medication count in /api/patients
+CREATE INDEX IF NOT EXISTS idx_patient_medications_active
+    ON patient_medications(patient_id, id) WHERE active = true;
+
+-- Review queue keyset paging: newest routed checks first
+CREATE INDEX IF NOT EXISTS idx_interaction_checks_queue
+    ON interaction_checks(routing_decision, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_pharmacist_reviews_check
+    ON pharmacist_reviews(interaction_check_id);
+
+-- update_audit_with_review()
+CREATE INDEX IF NOT EXISTS idx_audit_log_prescription
+    ON audit_log(prescription_id);
+
+-- Audit page ordering, unfiltered and with each filter
+CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp
+    ON audit_log(timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_risk_timestamp
+    ON audit_log(ai_risk_level, timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_status_timestamp
+    ON audit_log(final_status, timestamp);
@@ -0,0 +1,55 @@
+-- Dashboard aggregates over audit_log, maintained by a trigger in the
+-- same transaction as each audit write.
+-- Mirrors AUDIT_AGGREGATES / AUDIT_AGGREGATE_GROUPS (AGGREGATES_VERSION 1)
+-- in src/database.py: each metric is the sum over audit_log of a per-row
+-- contribution; the trigger adds NEW's and subtracts OLD's.
+
+CREATE TABLE IF NOT EXISTS analytics_aggregates (
+    metric TEXT PRIMARY KEY,
+    value DOUBLE PRECISION NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION audit_log_aggregate_deltas(r audit_log, sign DOUBLE PRECISION)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO analytics_aggregates (metric, value)
+    SELECT metric, delta FROM (VALUES
+        ('total', sign),
+        ('auto_approved', sign * (r.pharmacist_decision IS NULL AND r.final_status = 'approved')::INT),
+        ('pharmacist_reviewed', sign * (r.pharmacist_decision IS NOT NULL)::INT),
+        ('overrides', sign * COALESCE((r.ai_pharmacist_agreement = false)::INT, 0)),
+        ('confidence_sum', sign * COALESCE(r.ai_confidence, 0)),
+        ('confidence_count', sign * (r.ai_confidence IS NOT NULL)::INT),
+        ('decision_time_sum', sign * COALESCE(r.time_to_decision_seconds, 0)),
+        ('decision_time_count', sign * (r.time_to_decision_seconds IS NOT NULL)::INT),
+        ('risk:' || r.ai_risk_level, CASE WHEN r.ai_risk_level IS NOT NULL THEN sign END),
+        ('status:' || r.final_status, sign)
+    ) AS deltas(metric, delta)
+    WHERE metric IS NOT NULL AND delta IS NOT NULL AND delta != 0
+    ON CONFLICT (metric) DO UPDATE SET value = analytics_aggregates.value + EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION audit_log_aggregates() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM audit_log_aggregate_deltas(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM audit_log_aggregate_deltas(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS audit_log_aggregates ON audit_log;
+CREATE TRIGGER audit_log_aggregates
+    AFTER INSERT OR DELETE OR UPDATE OF ai_confidence, ai_risk_level, pharmacist_decision,
+        ai_pharmacist_agreement, time_to_decision_seconds, final_status
+    ON audit_log
+    FOR EACH ROW EXECUTE FUNCTION audit_log_aggregates();
+
+-- Build from the rows already in audit_log
+DELETE FROM analytics_aggregates;
+SELECT audit_log_aggregate_deltas(a, 1) FROM audit_log a;
+INSERT INTO analytics_aggregates (metric, value) VALUES ('aggregates_version', 1);
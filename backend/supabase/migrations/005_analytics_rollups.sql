@@ -0,0 +1,91 @@
+-- Hourly and daily buckets of the dashboard metrics for trend charts,
+-- maintained by the audit_log aggregates trigger.
+-- Mirrors ROLLUP_BUCKETS / ROLLUP_METRICS (AGGREGATES_VERSION 2) in
+-- src/database.py: one row per (granularity, bucket), bucketed by the
+-- audit timestamp in UTC, with a column per metric.
+
+CREATE TABLE IF NOT EXISTS analytics_rollups (
+    granularity TEXT NOT NULL,
+    bucket TIMESTAMP NOT NULL,
+    total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    auto_approved DOUBLE PRECISION NOT NULL DEFAULT 0,
+    pharmacist_reviewed DOUBLE PRECISION NOT NULL DEFAULT 0,
+    overrides DOUBLE PRECISION NOT NULL DEFAULT 0,
+    confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    confidence_count DOUBLE PRECISION NOT NULL DEFAULT 0,
+    decision_time_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    decision_time_count DOUBLE PRECISION NOT NULL DEFAULT 0,
+    risk_low DOUBLE PRECISION NOT NULL DEFAULT 0,
+    risk_medium DOUBLE PRECISION NOT NULL DEFAULT 0,
+    risk_high DOUBLE PRECISION NOT NULL DEFAULT 0,
+    risk_critical DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket)
+);
+
+CREATE OR REPLACE FUNCTION audit_log_rollup_deltas(r audit_log, sign DOUBLE PRECISION)
+RETURNS VOID AS $$
+BEGIN
+    IF r.timestamp IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO analytics_rollups AS ro (
+        granularity, bucket, total, auto_approved, pharmacist_reviewed, overrides,
+        confidence_sum, confidence_count, decision_time_sum, decision_time_count,
+        risk_low, risk_medium, risk_high, risk_critical
+    )
+    SELECT granularity, date_trunc(granularity, r.timestamp AT TIME ZONE 'UTC'),
+        sign,
+        sign * (r.pharmacist_decision IS NULL AND r.final_status = 'approved')::INT,
+        sign * (r.pharmacist_decision IS NOT NULL)::INT,
+        sign * COALESCE((r.ai_pharmacist_agreement = false)::INT, 0),
+        sign * COALESCE(r.ai_confidence, 0),
+        sign * (r.ai_confidence IS NOT NULL)::INT,
+        sign * COALESCE(r.time_to_decision_seconds, 0),
+        sign * (r.time_to_decision_seconds IS NOT NULL)::INT,
+        sign * COALESCE((r.ai_risk_level = 'low')::INT, 0),
+        sign * COALESCE((r.ai_risk_level = 'medium')::INT, 0),
+        sign * COALESCE((r.ai_risk_level = 'high')::INT, 0),
+        sign * COALESCE((r.ai_risk_level = 'critical')::INT, 0)
+    FROM (VALUES ('hour'), ('day')) AS g(granularity)
+    ON CONFLICT (granularity, bucket) DO UPDATE SET
+        total = ro.total + EXCLUDED.total,
+        auto_approved = ro.auto_approved + EXCLUDED.auto_approved,
+        pharmacist_reviewed = ro.pharmacist_reviewed + EXCLUDED.pharmacist_reviewed,
+        overrides = ro.overrides + EXCLUDED.overrides,
+        confidence_sum = ro.confidence_sum + EXCLUDED.confidence_sum,
+        confidence_count = ro.confidence_count + EXCLUDED.confidence_count,
+        decision_time_sum = ro.decision_time_sum + EXCLUDED.decision_time_sum,
+        decision_time_count = ro.decision_time_count + EXCLUDED.decision_time_count,
+        risk_low = ro.risk_low + EXCLUDED.risk_low,
+        risk_medium = ro.risk_medium + EXCLUDED.risk_medium,
+        risk_high = ro.risk_high + EXCLUDED.risk_high,
+        risk_critical = ro.risk_critical + EXCLUDED.risk_critical;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION audit_log_aggregates() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM audit_log_aggregate_deltas(OLD, -1);
+        PERFORM audit_log_rollup_deltas(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM audit_log_aggregate_deltas(NEW, 1);
+        PERFORM audit_log_rollup_deltas(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Moving a row to another bucket changes the rollups too
+DROP TRIGGER IF EXISTS audit_log_aggregates ON audit_log;
+CREATE TRIGGER audit_log_aggregates
+    AFTER INSERT OR DELETE OR UPDATE OF timestamp, ai_confidence, ai_risk_level, pharmacist_decision,
+        ai_pharmacist_agreement, time_to_decision_seconds, final_status
+    ON audit_log
+    FOR EACH ROW EXECUTE FUNCTION audit_log_aggregates();
+
+-- Build from the rows already in audit_log
+DELETE FROM analytics_rollups;
+SELECT audit_log_rollup_deltas(a, 1) FROM audit_log a;
+UPDATE analytics_aggregates SET value = 2 WHERE metric = 'aggregates_version';
@@ -0,0 +1,51 @@
+-- Keyset paging and per-filter counts for the audit log API.
+-- Mirrors INDEXES (INDEX_VERSION 2) and AUDIT_AGGREGATE_GROUPS
+-- (AGGREGATES_VERSION 3) in src/database.py: the audit indexes gain id
+-- so pages can seek to (timestamp, id), and the aggregates count every
+-- risk level / final status combination.
+
+DROP INDEX IF EXISTS idx_audit_log_timestamp;
+DROP INDEX IF EXISTS idx_audit_log_risk_timestamp;
+DROP INDEX IF EXISTS idx_audit_log_status_timestamp;
+
+-- Audit keyset paging on (timestamp, id), unfiltered and with each filter
+CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp_id
+    ON audit_log(timestamp, id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_risk_timestamp_id
+    ON audit_log(ai_risk_level, timestamp, id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_status_timestamp_id
+    ON audit_log(final_status, timestamp, id);
+
+CREATE OR REPLACE FUNCTION audit_log_aggregate_deltas(r audit_log, sign DOUBLE PRECISION)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO analytics_aggregates (metric, value)
+    SELECT metric, delta FROM (VALUES
+        ('total', sign),
+        ('auto_approved', sign * (r.pharmacist_decision IS NULL AND r.final_status = 'approved')::INT),
+        ('pharmacist_reviewed', sign * (r.pharmacist_decision IS NOT NULL)::INT),
+        ('overrides', sign * COALESCE((r.ai_pharmacist_agreement = false)::INT, 0)),
+        ('confidence_sum', sign * COALESCE(r.ai_confidence, 0)),
+        ('confidence_count', sign * (r.ai_confidence IS NOT NULL)::INT),
+        ('decision_time_sum', sign * COALESCE(r.time_to_decision_seconds, 0)),
+        ('decision_time_count', sign * (r.time_to_decision_seconds IS NOT NULL)::INT),
+        ('risk:' || r.ai_risk_level, CASE WHEN r.ai_risk_level IS NOT NULL THEN sign END),
+        ('status:' || r.final_status, sign),
+        -- NULL when either column is, like the SQLite trigger
+        ('risk_status:' || r.ai_risk_level || '|' || r.final_status, sign)
+    ) AS deltas(metric, delta)
+    WHERE metric IS NOT NULL AND delta IS NOT NULL AND delta != 0
+    ON CONFLICT (metric) DO UPDATE SET value = analytics_aggregates.value + EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add the new counts for the rows already in audit_log
+DELETE FROM analytics_aggregates WHERE metric LIKE 'risk_status:%';
+INSERT INTO analytics_aggregates (metric, value)
+SELECT 'risk_status:' || ai_risk_level || '|' || final_status, COUNT(*)
+FROM audit_log
+WHERE ai_risk_level IS NOT NULL AND final_status IS NOT NULL
+GROUP BY ai_risk_level, final_status;
+UPDATE analytics_aggregates SET value = 3 WHERE metric = 'aggregates_version';
@@ -0,0 +1,17 @@
+-- Full-text search over pharmacist feedback and AI reasoning.
+-- Mirrors SEARCH_SOURCES in src/database.py with Postgres full-text
+-- search instead of FTS5: a stored tsvector per source column, kept
+-- current by Postgres on every insert and update, and a GIN index on
+-- each. Rank with ts_rank_cd and build snippets with ts_headline.
+
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS feedback_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', COALESCE(pharmacist_feedback, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_feedback_search
+    ON audit_log USING GIN (feedback_search);
+
+ALTER TABLE interaction_checks ADD COLUMN IF NOT EXISTS reasoning_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', COALESCE(reasoning, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_interaction_checks_reasoning_search
+    ON interaction_checks USING GIN (reasoning_search);
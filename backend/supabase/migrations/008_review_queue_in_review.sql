@@ -0,0 +1,12 @@
+-- Review queue pages driven by the prescriptions still in review.
+-- Mirrors INDEXES (INDEX_VERSION 3) in src/database.py: the queue filter
+-- is indexed on prescriptions.status, so a page costs the open queue
+-- rather than every check ever routed to a pharmacist.
+
+DROP INDEX IF EXISTS idx_interaction_checks_queue;
+
+CREATE INDEX IF NOT EXISTS idx_prescriptions_in_review
+    ON prescriptions(id) WHERE status = 'in_review';
+
+CREATE INDEX IF NOT EXISTS idx_interaction_checks_prescription
+    ON interaction_checks(prescription_id, routing_decision, created_at, id);
@@ -0,0 +1,49 @@
+-- Review queue membership denormalised onto interaction_checks.
+-- Mirrors REVIEW_QUEUE_MEMBERSHIP and INDEXES (INDEX_VERSION 4) in
+-- src/database.py: a check is in the queue while it is routed to a
+-- pharmacist and its prescription is in review. Triggers keep the flag
+-- current, and its partial index is in (created_at, id) page order, so
+-- a queue page seeks to the cursor and reads one page without sorting.
+
+ALTER TABLE interaction_checks
+    ADD COLUMN IF NOT EXISTS in_review_queue BOOLEAN NOT NULL DEFAULT false;
+
+CREATE OR REPLACE FUNCTION review_queue_check_membership() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.in_review_queue := NEW.routing_decision = 'routed_to_pharmacist' AND EXISTS (
+        SELECT 1 FROM prescriptions WHERE id = NEW.prescription_id AND status = 'in_review'
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_queue_check_membership ON interaction_checks;
+CREATE TRIGGER review_queue_check_membership
+    BEFORE INSERT OR UPDATE OF prescription_id, routing_decision ON interaction_checks
+    FOR EACH ROW EXECUTE FUNCTION review_queue_check_membership();
+
+CREATE OR REPLACE FUNCTION review_queue_prescription_status() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE interaction_checks
+    SET in_review_queue = (routing_decision = 'routed_to_pharmacist' AND NEW.status = 'in_review')
+    WHERE prescription_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_queue_prescription_status ON prescriptions;
+CREATE TRIGGER review_queue_prescription_status
+    AFTER UPDATE OF status ON prescriptions
+    FOR EACH ROW WHEN (NEW.status IS DISTINCT FROM OLD.status)
+    EXECUTE FUNCTION review_queue_prescription_status();
+
+-- Set the flag on the checks already recorded
+UPDATE interaction_checks ic
+SET in_review_queue = (ic.routing_decision = 'routed_to_pharmacist' AND p.status = 'in_review')
+FROM prescriptions p
+WHERE p.id = ic.prescription_id;
+
+DROP INDEX IF EXISTS idx_prescriptions_in_review;
+
+CREATE INDEX IF NOT EXISTS idx_interaction_checks_review_queue
+    ON interaction_checks(created_at, id) WHERE in_review_queue;
@@ -0,0 +1,30 @@
+"""Shared setup for the backend tests.
+
+Puts the backend on sys.path and points DATABASE_PATH at a throwaway
+SQLite file before any src module reads it.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ["DATABASE_PATH"] = str(Path(tempfile.mkdtemp()) / "test.db")
+
+from src.database import DATABASE_PATH, close_pool, init_db  # noqa: E402
+
+
+@pytest.fixture
+def fresh_db():
+    """An empty database with the full schema, indexes and triggers."""
+    close_pool()
+    for suffix in ("", "-wal", "-shm"):
+        Path(DATABASE_PATH + suffix).unlink(missing_ok=True)
+    init_db()
+    yield DATABASE_PATH
+    close_pool()
@@ -0,0 +1,119 @@
+"""Audit log keyset paging and trigger-maintained per-filter counts."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from src.audit import MAX_AUDIT_PAGE_SIZE, get_audit_count, get_audit_log, get_audit_page
+from src.database import write_transaction
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+STATUSES = ["approved", "rejected", "escalated", "in_review"]
+
+
+@pytest.fixture
+def audit_rows(fresh_db):
+    rng = random.Random(3)
+    rows = [
+        (
+            f"AUD-{i:04d}", f"RX-{i:04d}", rng.choice(RISK_LEVELS), rng.choice(STATUSES),
+            # Few distinct timestamps, so ids have to break the ties
+            f"2025-01-0{rng.randrange(1, 4)} 12:00:00",
+        )
+        for i in range(250)
+    ]
+    with write_transaction() as db:
+        db.executemany(
+            """INSERT INTO audit_log
+            (id, patient_id_masked, prescription_id, medication_name, ai_risk_level, final_status, timestamp)
+            VALUES (?, 'PATIENT_001', ?, 'Testol', ?, ?, ?)""",
+            rows,
+        )
+    return rows
+
+
+def walk_pages(limit: int, **filters) -> list[list[dict]]:
+    pages, cursor = [], None
+    while True:
+        entries, cursor = get_audit_page(limit=limit, cursor=cursor, **filters)
+        pages.append(entries)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("filters", [{}, {"risk_level": "high"}, {"status": "escalated"},
+                                     {"risk_level": "low", "status": "approved"}])
+def test_cursor_pages_match_offset_order(audit_rows, filters):
+    expected = get_audit_log(limit=len(audit_rows), **filters)
+    pages = walk_pages(limit=17, **filters)
+
+    assert [entry for page in pages for entry in page] == expected
+    assert all(len(page) == 17 for page in pages[:-1])
+    assert len({entry["id"] for page in pages for entry in page}) == len(expected)
+
+
+def test_last_full_page_has_no_cursor(audit_rows):
+    entries, cursor = get_audit_page(limit=len(audit_rows))
+    assert len(entries) == len(audit_rows)
+    assert cursor is None
+
+
+def test_rows_added_after_the_first_page_do_not_shift_later_pages(audit_rows):
+    first, cursor = get_audit_page(limit=50)
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO audit_log (id, patient_id_masked, prescription_id, medication_name, final_status, timestamp)
+            VALUES ('AUD-NEW', 'PATIENT_001', 'RX-NEW', 'Testol', 'approved', '2030-01-01 00:00:00')"""
+        )
+    second, _ = get_audit_page(limit=50, cursor=cursor)
+
+    assert second == get_audit_log(limit=50, offset=51)
+    assert not {entry["id"] for entry in first} & {entry["id"] for entry in second}
+
+
+@pytest.mark.parametrize("risk_level", [None, *RISK_LEVELS])
+@pytest.mark.parametrize("status", [None, *STATUSES])
+def test_cached_counts_match_rows(audit_rows, risk_level, status):
+    expected = sum(
+        1 for _, _, risk, final_status, _ in audit_rows
+        if risk_level in (None, risk) and status in (None, final_status)
+    )
+    assert get_audit_count(risk_level=risk_level, status=status) == expected
+
+
+def test_counts_follow_updates_and_deletes(audit_rows):
+    high_before = get_audit_count(risk_level="high")
+    with write_transaction() as db:
+        db.execute("UPDATE audit_log SET ai_risk_level = 'high' WHERE ai_risk_level = 'low'")
+        db.execute("DELETE FROM audit_log WHERE id = 'AUD-0000'")
+    low = sum(1 for row in audit_rows if row[2] == "low")
+    deleted_high = audit_rows[0][2] in ("low", "high")
+
+    assert get_audit_count(risk_level="low") == 0
+    assert get_audit_count(risk_level="high") == high_before + low - deleted_high
+    assert get_audit_count() == len(audit_rows) - 1
+
+
+def test_invalid_cursor_is_a_bad_request(audit_rows):
+    client = TestClient(api.app)
+    assert client.get("/api/audit", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    page = client.get("/api/audit", params={"limit": 100}).json()
+    next_page = client.get("/api/audit", params={"limit": 100, "cursor": page["next_cursor"]}).json()
+    assert [entry["id"] for entry in next_page["entries"]] == [
+        entry["id"] for entry in get_audit_log(limit=100, offset=100)
+    ]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limits_are_clamped(audit_rows, limit):
+    entries, cursor = get_audit_page(limit=limit)
+    assert entries == get_audit_log(limit=1)
+    assert cursor is not None
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"limit": MAX_AUDIT_PAGE_SIZE + 1}, {"offset": -1}])
+def test_out_of_range_paging_is_rejected(audit_rows, params):
+    assert TestClient(api.app).get("/api/audit", params=params).status_code == 422
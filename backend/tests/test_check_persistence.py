@@ -0,0 +1,102 @@
+"""The check pipeline persists each check as one unit of work."""
+
+import asyncio
+import json
+
+import pytest
+
+import api
+import seed
+from src.database import get_db, get_storage_stats, write_transaction
+from src.masking import mask_patient_data
+
+PRESCRIPTION_ID = "RX-TEST-001"
+
+AI_RESULT = {
+    "risk_level": "medium",
+    "confidence_score": 0.8,
+    "interactions_found": [],
+    "recommendation": "pharmacist_review",
+    "reasoning": "Test stub.",
+    "engine": "llm",
+}
+
+
+@pytest.fixture
+def prescription(fresh_db):
+    seed.seed_patients()
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+            VALUES (?, 'PAT-001', 'Testol', '10mg', 'daily', 'Dr. Test', 'pending')""",
+            (PRESCRIPTION_ID,),
+        )
+    return PRESCRIPTION_ID
+
+
+def row_counts() -> dict:
+    db = get_db()
+    counts = {
+        table: db.execute(f"SELECT COUNT(*) FROM {table} WHERE prescription_id = ?", (PRESCRIPTION_ID,)).fetchone()[0]
+        for table in ("interaction_checks", "audit_log", "masking_events")
+    }
+    counts["status"] = db.execute("SELECT status FROM prescriptions WHERE id = ?", (PRESCRIPTION_ID,)).fetchone()[0]
+    db.close()
+    return counts
+
+
+def save(prescription_id: str):
+    patient, prescription = api._load_check_inputs(prescription_id)
+    masking_result = mask_patient_data(patient, prescription, log_event=False)
+    return api._save_check(prescription, masking_result, AI_RESULT, "routed_to_pharmacist")
+
+
+def test_save_check_commits_every_row_once(prescription):
+    before = get_storage_stats()["writer"]["transactions"]
+    result = save(prescription)
+
+    assert get_storage_stats()["writer"]["transactions"] == before + 1
+    assert row_counts() == {"interaction_checks": 1, "audit_log": 1, "masking_events": 1, "status": "in_review"}
+    assert result.prescription_id == prescription
+
+
+def test_failed_save_leaves_no_partial_state(prescription, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("audit write failed")
+
+    monkeypatch.setattr(api, "log_decision", fail)
+    with pytest.raises(RuntimeError):
+        save(prescription)
+
+    assert row_counts() == {"interaction_checks": 0, "audit_log": 0, "masking_events": 0, "status": "pending"}
+
+
+def test_pipeline_marks_checking_and_resets_on_failure(prescription, monkeypatch):
+    statuses = []
+
+    async def fail(masked_payload):
+        statuses.append(row_counts()["status"])
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(api, "check_interactions_async", fail)
+    with pytest.raises(RuntimeError):
+        asyncio.run(api._run_check_pipeline(prescription))
+
+    assert statuses == ["checking"]
+    assert row_counts()["status"] == "pending"
+
+
+def test_pipeline_records_masked_payload(prescription, monkeypatch):
+    async def stub(masked_payload):
+        return dict(AI_RESULT)
+
+    monkeypatch.setattr(api, "check_interactions_async", stub)
+    result = asyncio.run(api._run_check_pipeline(prescription))
+
+    db = get_db()
+    row = db.execute("SELECT masked_payload FROM interaction_checks WHERE id = ?", (result.id,)).fetchone()
+    event = db.execute("SELECT fields_affected FROM masking_events WHERE prescription_id = ?", (prescription,)).fetchone()
+    db.close()
+    assert "name" not in json.loads(row["masked_payload"])
+    assert "name" in json.loads(event["fields_affected"])
+    assert row_counts()["status"] == "in_review"
@@ -0,0 +1,125 @@
+"""Write-behind audit trail writer: drain, transaction joins, back-pressure, dead letters."""
+
+import json
+import threading
+
+import pytest
+
+from src.database import get_db, write_transaction
+from src.event_writer import EventWriter, replay_dead_letters
+
+INSERT = "INSERT INTO masking_events (id, prescription_id, event_type, fields_affected) VALUES (?, ?, 'mask', '[]')"
+
+
+@pytest.fixture
+def writer(fresh_db, tmp_path):
+    # Long flush interval: rows are written by batches filling up, flush() or stop()
+    writer = EventWriter(batch_rows=1000, flush_ms=60_000, max_queued=1000,
+                         dead_letter_path=str(tmp_path / "dead-letters.jsonl"))
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+def event_ids() -> set[str]:
+    db = get_db()
+    ids = {row["id"] for row in db.execute("SELECT id FROM masking_events")}
+    db.close()
+    return ids
+
+
+def test_stop_drains_the_queue(writer):
+    for i in range(100):
+        writer.submit(INSERT, (f"EV-{i}", "RX-1"))
+    assert event_ids() == set()
+
+    writer.stop()
+
+    assert event_ids() == {f"EV-{i}" for i in range(100)}
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"], stats["queue_depth"]) == (100, 0, 0)
+
+
+def test_flush_writes_queued_events(writer):
+    writer.submit(INSERT, ("EV-1", "RX-1"))
+    writer.flush()
+    assert event_ids() == {"EV-1"}
+
+
+def test_stopped_writer_writes_synchronously(writer):
+    writer.stop()
+    writer.submit(INSERT, ("EV-1", "RX-1"))
+    assert event_ids() == {"EV-1"}
+
+
+def test_events_inside_a_transaction_join_it(writer):
+    with pytest.raises(RuntimeError):
+        with write_transaction():
+            writer.submit(INSERT, ("EV-1", "RX-1"))
+            raise RuntimeError("rolled back")
+    writer.flush()
+
+    assert event_ids() == set()
+    assert writer.stats()["enqueued"] == 0
+
+
+def test_full_queue_blocks_producers_until_there_is_room(fresh_db, tmp_path):
+    writer = EventWriter(batch_rows=1, flush_ms=0, max_queued=2, dead_letter_path=str(tmp_path / "dead.jsonl"))
+    writer.start()
+    lane_held, release = threading.Event(), threading.Event()
+
+    def hold_lane():
+        with write_transaction():
+            lane_held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lane)
+    holder.start()
+    lane_held.wait()
+    producer = threading.Thread(target=lambda: [writer.submit(INSERT, (f"EV-{i}", "RX-1")) for i in range(10)])
+    producer.start()
+    producer.join(0.5)
+    # One event is with the blocked writer, two fill the queue, the producer waits
+    assert producer.is_alive()
+
+    release.set()
+    holder.join()
+    producer.join(5)
+    writer.stop()
+    assert not producer.is_alive()
+    assert writer.stats()["backpressure_waits"] > 0
+    assert event_ids() == {f"EV-{i}" for i in range(10)}
+
+
+def test_failed_rows_are_dead_lettered_and_replayable(writer):
+    writer.submit(INSERT, ("EV-1", "RX-1"))
+    writer.submit(INSERT, ("EV-1", "RX-2"))  # duplicate primary key
+    writer.submit(INSERT, ("EV-2", "RX-3"))
+    writer.flush()
+
+    assert event_ids() == {"EV-1", "EV-2"}
+    stats = writer.stats()
+    assert (stats["status"], stats["written"], stats["failed"]) == ("error", 2, 1)
+    assert "UNIQUE constraint failed" in stats["recent_errors"][0]["error"]
+    with open(writer.dead_letter_path) as f:
+        [record] = [json.loads(line) for line in f]
+    assert (record["sql"], record["params"]) == (INSERT, ["EV-1", "RX-2"])
+
+    # Once the conflict is resolved, replay writes the row and empties the file
+    with write_transaction() as db:
+        db.execute("DELETE FROM masking_events WHERE id = 'EV-1'")
+    assert replay_dead_letters(writer.dead_letter_path) == (1, 0)
+    assert event_ids() == {"EV-1", "EV-2"}
+    with open(writer.dead_letter_path) as f:
+        assert f.read() == ""
+
+
+def test_flush_racing_stop_never_hangs(fresh_db, tmp_path):
+    for _ in range(50):
+        writer = EventWriter(batch_rows=10, flush_ms=5, max_queued=100, dead_letter_path=str(tmp_path / "dead.jsonl"))
+        writer.start()
+        flusher = threading.Thread(target=writer.flush)
+        flusher.start()
+        writer.stop()
+        flusher.join(2)
+        assert not flusher.is_alive()
@@ -0,0 +1,231 @@
+"""Background check jobs, run offline with stubbed checkers."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import seed
+from src.database import get_db, write_transaction
+from src.jobs import CheckJobQueue
+
+PRESCRIPTION_ID = "RX-TEST-001"
+
+AI_RESULT = {
+    "risk_level": "medium",
+    "confidence_score": 0.8,
+    "interactions_found": [],
+    "recommendation": "pharmacist_review",
+    "reasoning": "Test stub.",
+    "engine": "llm",
+}
+
+
+@pytest.fixture
+def prescription(fresh_db):
+    seed.seed_patients()
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+            VALUES (?, 'PAT-001', 'Testol', '10mg', 'daily', 'Dr. Test', 'pending')""",
+            (PRESCRIPTION_ID,),
+        )
+    return PRESCRIPTION_ID
+
+
+class StubRunner:
+    """Records the check and marks the prescription in review once `release` is set."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, prescription_id: str) -> str:
+        self.started.set()
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        check_id = f"IC-{prescription_id}"
+        with write_transaction() as db:
+            db.execute(
+                """INSERT INTO interaction_checks (id, prescription_id, risk_level, confidence_score,
+                    interactions_found, recommendation, reasoning, masked_payload, raw_payload, routing_decision)
+                VALUES (?, ?, 'medium', 0.8, '[]', 'pharmacist_review', 'Stub.', '{}', '{}', 'routed_to_pharmacist')""",
+                (check_id, prescription_id),
+            )
+            db.execute("UPDATE prescriptions SET status = 'in_review' WHERE id = ?", (prescription_id,))
+        return check_id
+
+
+async def wait_for_status(jobs: CheckJobQueue, job_id: str, *statuses: str) -> dict:
+    """Poll a job like a client would, until it reaches one of `statuses`."""
+    for _ in range(500):
+        job = await jobs.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+
+def insert_job(job_id: str, status: str):
+    with write_transaction() as db:
+        db.execute(
+            "INSERT INTO check_jobs (id, prescription_id, status) VALUES (?, ?, ?)",
+            (job_id, PRESCRIPTION_ID, status),
+        )
+
+
+def test_job_runs_through_every_status(prescription):
+    async def scenario():
+        runner = StubRunner()
+        jobs = CheckJobQueue(runner, workers=1)
+        await jobs.start()
+        try:
+            job = await jobs.submit(prescription)
+            snapshots = [(job["status"], job["prescription_status"])]
+            await runner.started.wait()
+            job = await jobs.get(job["id"])
+            snapshots.append((job["status"], job["prescription_status"]))
+            runner.release.set()
+            job = await wait_for_status(jobs, job["id"], "completed")
+            snapshots.append((job["status"], job["prescription_status"]))
+        finally:
+            await jobs.stop()
+        return snapshots, job
+
+    snapshots, job = asyncio.run(scenario())
+    assert snapshots == [("queued", "pending"), ("running", "checking"), ("completed", "in_review")]
+    assert job["interaction_check_id"] == f"IC-{prescription}"
+    assert job["error"] is None
+
+
+def test_resubmitting_an_active_job_returns_it(prescription):
+    async def scenario():
+        runner = StubRunner()
+        jobs = CheckJobQueue(runner, workers=1)
+        await jobs.start()
+        try:
+            first = await jobs.submit(prescription)
+            second = await jobs.submit(prescription)
+            runner.release.set()
+            await wait_for_status(jobs, first["id"], "completed")
+        finally:
+            await jobs.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second["id"] == first["id"]
+    db = get_db()
+    assert db.execute("SELECT COUNT(*) FROM check_jobs").fetchone()[0] == 1
+    db.close()
+
+
+def test_failed_job_records_the_error_and_resets_the_prescription(prescription):
+    async def scenario():
+        runner = StubRunner(fail=True)
+        runner.release.set()
+        jobs = CheckJobQueue(runner, workers=1)
+        await jobs.start()
+        try:
+            job = await jobs.submit(prescription)
+            return await wait_for_status(jobs, job["id"], "failed")
+        finally:
+            await jobs.stop()
+
+    job = asyncio.run(scenario())
+    assert (job["error"], job["prescription_status"]) == ("model unavailable", "pending")
+    assert job["interaction_check_id"] is None
+
+
+def test_events_stream_snapshots_until_the_job_finishes(prescription):
+    async def scenario():
+        runner = StubRunner()
+        jobs = CheckJobQueue(runner, workers=1)
+        await jobs.start()
+        try:
+            job = await jobs.submit(prescription)
+            await runner.started.wait()
+            seen = []
+
+            async def consume():
+                async for snapshot in jobs.events(job["id"]):
+                    seen.append(snapshot["status"])
+                    if len(seen) == 1:
+                        runner.release.set()
+
+            await asyncio.wait_for(consume(), timeout=5)
+        finally:
+            await jobs.stop()
+        return seen
+
+    assert asyncio.run(scenario()) == ["running", "completed"]
+
+
+def test_unfinished_jobs_resume_after_a_restart(prescription):
+    async def scenario():
+        # The first process dies mid-check: its job stays 'running'
+        hung = StubRunner()
+        jobs = CheckJobQueue(hung, workers=1)
+        await jobs.start()
+        running = await jobs.submit(prescription)
+        await hung.started.wait()
+        await jobs.stop()
+        interrupted = await jobs.get(running["id"])
+
+        runner = StubRunner()
+        runner.release.set()
+        restarted = CheckJobQueue(runner, workers=1)
+        await restarted.start()
+        try:
+            return interrupted, await wait_for_status(restarted, running["id"], "completed")
+        finally:
+            await restarted.stop()
+
+    interrupted, resumed = asyncio.run(scenario())
+    assert (interrupted["status"], interrupted["prescription_status"]) == ("running", "checking")
+    assert (resumed["status"], resumed["prescription_status"]) == ("completed", "in_review")
+
+
+def test_queued_jobs_persisted_before_a_restart_are_run(prescription):
+    insert_job("JOB-QUEUED", "queued")
+
+    async def scenario():
+        runner = StubRunner()
+        runner.release.set()
+        jobs = CheckJobQueue(runner, workers=1)
+        await jobs.start()
+        try:
+            return await wait_for_status(jobs, "JOB-QUEUED", "completed")
+        finally:
+            await jobs.stop()
+
+    assert asyncio.run(scenario())["interaction_check_id"] == f"IC-{PRESCRIPTION_ID}"
+
+
+def test_api_polls_and_streams_a_job_with_a_stubbed_checker(prescription, monkeypatch):
+    async def stub(masked_payload):
+        return dict(AI_RESULT)
+
+    monkeypatch.setattr(api, "check_interactions_async", stub)
+    with TestClient(api.app) as client:
+        response = client.post(f"/api/prescriptions/{prescription}/check-jobs")
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        with client.stream("GET", f"/api/jobs/{job_id}/events") as stream:
+            events = [
+                json.loads(line.removeprefix("data: "))
+                for line in stream.iter_lines()
+                if line.startswith("data: ")
+            ]
+        polled = client.get(f"/api/jobs/{job_id}").json()
+        assert client.get("/api/jobs/JOB-MISSING").status_code == 404
+
+    assert events[-1]["status"] == "completed"
+    assert events[-1]["result"]["prescription_id"] == prescription
+    assert polled["status"] == "completed"
+    assert polled["result"]["id"] == events[-1]["result"]["id"]
+    assert polled["prescription_status"] == "in_review"
@@ -0,0 +1,167 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot queries.
+
+Builds the schema and index set from src/database.py in an in-memory
+database and fails if a hot query falls back to a full table scan,
+sorts through a temp B-tree where an index should provide the order, or
+stops using the index it is meant to use.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database import SCHEMA, apply_indexes, apply_search
+from src.review_queue import _QUEUE_FILTER, _QUEUE_ITEM_SELECT, _QUEUE_SUMMARY_SELECT
+
+# (name, sql, expected index or indexes)
+HOT_QUERIES = [
+    (
+        "patient active medications",
+        "SELECT * FROM patient_medications WHERE patient_id = ? AND active = 1",
+        "idx_patient_medications_active",
+    ),
+    (
+        "queue medications batch",
+        "SELECT * FROM patient_medications WHERE active = 1 AND patient_id IN (?, ?, ?)",
+        "idx_patient_medications_active",
+    ),
+    (
+        "patient list medication counts",
+        """SELECT p.id, p.name, p.date_of_birth, COUNT(pm.id) as medication_count
+        FROM patients p
+        LEFT JOIN patient_medications pm ON p.id = pm.patient_id AND pm.active = 1
+        GROUP BY p.id
+        ORDER BY p.name""",
+        "idx_patient_medications_active",
+    ),
+    (
+        "review queue page (summary)",
+        _QUEUE_SUMMARY_SELECT
+        + f"WHERE {_QUEUE_FILTER} AND (ic.created_at, ic.id) < (?, ?) "
+        "ORDER BY ic.created_at DESC, ic.id DESC LIMIT ?",
+        "idx_interaction_checks_review_queue",
+    ),
+    (
+        "review queue page (full)",
+        _QUEUE_ITEM_SELECT
+        + f"WHERE {_QUEUE_FILTER} ORDER BY ic.created_at DESC, ic.id DESC LIMIT ?",
+        ("idx_interaction_checks_review_queue", "idx_pharmacist_reviews_check"),
+    ),
+    (
+        "review queue size",
+        f"SELECT COUNT(*) FROM interaction_checks ic WHERE {_QUEUE_FILTER}",
+        "idx_interaction_checks_review_queue",
+    ),
+    (
+        "review queue membership for prescription",
+        "UPDATE interaction_checks SET in_review_queue = ? WHERE prescription_id = ?",
+        "idx_interaction_checks_prescription",
+    ),
+    (
+        "review queue item",
+        _QUEUE_ITEM_SELECT + "WHERE ic.id = ?",
+        ("sqlite_autoindex_interaction_checks_1", "idx_pharmacist_reviews_check"),
+    ),
+    (
+        "review for check",
+        "SELECT * FROM pharmacist_reviews WHERE interaction_check_id = ?",
+        "idx_pharmacist_reviews_check",
+    ),
+    (
+        "audit update with review",
+        "UPDATE audit_log SET final_status = ? WHERE prescription_id = ?",
+        "idx_audit_log_prescription",
+    ),
+    (
+        "audit page",
+        "SELECT * FROM audit_log WHERE 1=1 AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT ?",
+        "idx_audit_log_timestamp_id",
+    ),
+    (
+        "audit page by risk level",
+        """SELECT * FROM audit_log WHERE 1=1 AND ai_risk_level = ? AND (timestamp, id) < (?, ?)
+        ORDER BY timestamp DESC, id DESC LIMIT ?""",
+        "idx_audit_log_risk_timestamp_id",
+    ),
+    (
+        "audit page by status",
+        """SELECT * FROM audit_log WHERE 1=1 AND final_status = ? AND (timestamp, id) < (?, ?)
+        ORDER BY timestamp DESC, id DESC LIMIT ?""",
+        "idx_audit_log_status_timestamp_id",
+    ),
+    (
+        "audit export by time range",
+        "SELECT * FROM audit_log WHERE 1=1 AND timestamp >= ? AND timestamp < ? ORDER BY timestamp DESC, id DESC",
+        "idx_audit_log_timestamp_id",
+    ),
+    (
+        "audit export by risk level and time range",
+        """SELECT * FROM audit_log WHERE 1=1 AND ai_risk_level = ? AND timestamp >= ? AND timestamp < ?
+        ORDER BY timestamp DESC, id DESC""",
+        "idx_audit_log_risk_timestamp_id",
+    ),
+    (
+        "audit count by risk level",
+        "SELECT COUNT(*) as count FROM audit_log WHERE 1=1 AND ai_risk_level = ?",
+        "idx_audit_log_risk_timestamp_id",
+    ),
+    (
+        "search document for source row",
+        "DELETE FROM review_search_docs WHERE source = ? AND source_id = ?",
+        "sqlite_autoindex_review_search_docs_1",
+    ),
+    (
+        "active job for prescription",
+        """SELECT id FROM check_jobs
+        WHERE prescription_id = ? AND status IN ('queued', 'running')""",
+        "idx_check_jobs_active",
+    ),
+    (
+        "unfinished jobs",
+        "SELECT id FROM check_jobs WHERE status IN ('queued', 'running') ORDER BY created_at",
+        "idx_check_jobs_unfinished",
+    ),
+    (
+        "result cache pruning",
+        """DELETE FROM interaction_result_cache WHERE key NOT IN (
+            SELECT key FROM interaction_result_cache ORDER BY created_at DESC LIMIT ?
+        )""",
+        "idx_result_cache_created",
+    ),
+]
+
+# Full scans (and sorts) inherent to the query: it reads every row of the table
+ALLOWED_SCANS = {
+    "patient list medication counts": {"p"},
+    "result cache pruning": {"interaction_result_cache"},
+}
+
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    apply_indexes(conn)
+    apply_search(conn)
+    yield conn
+    conn.close()
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """EXPLAIN QUERY PLAN details for a query with ? placeholders."""
+    params = [None] * sql.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+@pytest.mark.parametrize("name, sql, expected_index", HOT_QUERIES, ids=[query[0] for query in HOT_QUERIES])
+def test_hot_query_uses_its_index(conn, name, sql, expected_index):
+    expected = (expected_index,) if isinstance(expected_index, str) else expected_index
+    plan = explain(conn, sql)
+    allowed = ALLOWED_SCANS.get(name, set())
+    for detail in plan:
+        if detail.startswith("SCAN ") and "INDEX" not in detail:
+            assert detail.split()[1] in allowed, f"full table scan ({detail})"
+        if name not in ALLOWED_SCANS:
+            assert "USE TEMP B-TREE FOR ORDER BY" not in detail, "sorts in a temp B-tree instead of using an index"
+    for index in expected:
+        assert any(index in detail for detail in plan), f"does not use {index} ({'; '.join(plan)})"
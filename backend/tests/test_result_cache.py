@@ -0,0 +1,66 @@
+"""Result cache lookups racing writes made while SQLite is read."""
+
+import pytest
+
+from src.result_cache import ResultCache
+
+MASKED = {
+    "patient_id": "PT-AAAA",
+    "age_range": "60-69",
+    "weight_range": "70-79kg",
+    "allergy_categories": [],
+    "current_medications": [{"medication_name": "Warfarin", "dosage": "5mg", "frequency": "daily"}],
+    "new_prescription": {"medication_name": "Aspirin", "dosage": "81mg", "frequency": "daily"},
+}
+
+
+def result(reasoning: str) -> dict:
+    return {
+        "risk_level": "medium",
+        "confidence_score": 0.8,
+        "interactions_found": [],
+        "recommendation": "pharmacist_review",
+        "reasoning": reasoning,
+        "engine": "llm",
+    }
+
+
+@pytest.fixture
+def cache(fresh_db):
+    """A persistent cache whose in-memory LRU starts empty."""
+    cache = ResultCache(ttl_seconds=3600, max_entries=8, persist=True)
+    ResultCache(ttl_seconds=3600, max_entries=8, persist=True).put(MASKED, result("stale"), 1.0)
+    return cache
+
+
+def race_with(cache: ResultCache, monkeypatch, write):
+    """Run `write` after get() has read the persisted row but before it re-inserts it."""
+    load = cache._load_persisted
+
+    def load_then_write(key):
+        entry = load(key)
+        write()
+        return entry
+
+    monkeypatch.setattr(cache, "_load_persisted", load_then_write)
+
+
+def test_persisted_row_is_loaded_into_memory(cache):
+    assert cache.get(MASKED)["reasoning"] == "stale"
+    assert cache.stats()["entries"] == 1
+
+
+def test_put_during_a_persisted_read_is_not_overwritten(cache, monkeypatch):
+    race_with(cache, monkeypatch, lambda: cache.put(MASKED, result("fresh"), 2.0))
+
+    assert cache.get(MASKED)["reasoning"] == "fresh"
+    monkeypatch.undo()
+    assert cache.get(MASKED)["reasoning"] == "fresh"
+
+
+def test_kb_change_during_a_persisted_read_drops_the_entry(cache, monkeypatch):
+    race_with(cache, monkeypatch, lambda: cache._check_kb_version("new-kb-version"))
+
+    cache.get(MASKED)
+    assert cache.stats()["entries"] == 0
+
@@ -0,0 +1,124 @@
+"""Review queue membership triggers and keyset pages."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import seed
+from src.database import REVIEW_QUEUE_TRIGGERS, apply_review_queue, get_db, write_transaction
+from src.review_queue import count_review_queue, load_queue_item, load_review_queue, load_review_queue_page
+
+
+@pytest.fixture
+def queue(fresh_db):
+    """Ten prescriptions in review with a routed check each, plus one auto-approved."""
+    seed.seed_patients()
+    with write_transaction() as db:
+        for i in range(11):
+            db.execute(
+                """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+                VALUES (?, 'PAT-001', 'Testol', '10mg', 'daily', 'Dr. Test', ?)""",
+                (f"RX-{i:02d}", "approved" if i == 10 else "in_review"),
+            )
+            add_check(db, f"IC-{i:02d}", f"RX-{i:02d}", "auto_approved" if i == 10 else "routed_to_pharmacist",
+                      # Pairs of checks share a timestamp, so ids break the ties
+                      f"2025-01-01 12:00:{i // 2:02d}")
+
+
+def add_check(db, check_id: str, prescription_id: str, routing_decision: str, created_at: str):
+    db.execute(
+        """INSERT INTO interaction_checks (id, prescription_id, risk_level, confidence_score, interactions_found,
+            recommendation, reasoning, masked_payload, raw_payload, routing_decision, created_at)
+        VALUES (?, ?, 'medium', 0.8, '[]', 'pharmacist_review', 'Test.', '{}', '{}', ?, ?)""",
+        (check_id, prescription_id, routing_decision, created_at),
+    )
+
+
+def queued_ids() -> list[str]:
+    return [item["interaction_check"]["id"] for item in load_review_queue()]
+
+
+def test_queue_holds_routed_checks_of_prescriptions_in_review(queue):
+    assert queued_ids() == [f"IC-{i:02d}" for i in reversed(range(10))]
+    assert count_review_queue() == 10
+
+
+def test_membership_follows_prescription_status(queue):
+    with write_transaction() as db:
+        db.execute("UPDATE prescriptions SET status = 'approved' WHERE id = 'RX-03'")
+    assert "IC-03" not in queued_ids()
+
+    with write_transaction() as db:
+        db.execute("UPDATE prescriptions SET status = 'in_review' WHERE id IN ('RX-03', 'RX-10')")
+    # RX-10's check was auto-approved, so only RX-03's returns to the queue
+    assert "IC-03" in queued_ids()
+    assert "IC-10" not in queued_ids()
+
+
+def test_membership_follows_check_routing(queue):
+    with write_transaction() as db:
+        db.execute("UPDATE interaction_checks SET routing_decision = 'auto_approved' WHERE id = 'IC-04'")
+        db.execute("UPDATE interaction_checks SET prescription_id = 'RX-02' WHERE id = 'IC-10'")
+        db.execute("UPDATE interaction_checks SET routing_decision = 'routed_to_pharmacist' WHERE id = 'IC-10'")
+    assert "IC-04" not in queued_ids()
+    assert "IC-10" in queued_ids()
+
+
+def test_check_saved_before_its_prescription_status_joins_the_queue(queue):
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber)
+            VALUES ('RX-NEW', 'PAT-001', 'Testol', '10mg', 'daily', 'Dr. Test')"""
+        )
+        add_check(db, "IC-NEW", "RX-NEW", "routed_to_pharmacist", "2025-01-02 00:00:00")
+        assert "IC-NEW" not in queued_ids()
+        db.execute("UPDATE prescriptions SET status = 'in_review' WHERE id = 'RX-NEW'")
+    assert queued_ids()[0] == "IC-NEW"
+
+
+def test_flag_matches_the_queue_definition(queue):
+    with write_transaction() as db:
+        db.execute("UPDATE prescriptions SET status = 'rejected' WHERE id IN ('RX-01', 'RX-07')")
+        db.execute("UPDATE interaction_checks SET routing_decision = 'auto_approved' WHERE id = 'IC-05'")
+    db = get_db()
+    expected = {row["id"] for row in db.execute(
+        """SELECT ic.id FROM interaction_checks ic JOIN prescriptions p ON ic.prescription_id = p.id
+        WHERE ic.routing_decision = 'routed_to_pharmacist' AND p.status = 'in_review'"""
+    )}
+    flagged = {row["id"] for row in db.execute("SELECT id FROM interaction_checks WHERE in_review_queue = 1")}
+    db.close()
+    assert flagged == expected
+
+
+@pytest.mark.parametrize("summary", [False, True])
+def test_pages_walk_the_whole_queue(queue, summary):
+    seen, cursor = [], None
+    while True:
+        items, cursor = load_review_queue_page(limit=3, cursor=cursor, summary=summary)
+        seen.extend(item["check_id"] if summary else item["interaction_check"]["id"] for item in items)
+        if cursor is None:
+            break
+    assert seen == queued_ids()
+
+
+def test_queue_item_is_found_after_it_leaves_the_queue(queue):
+    with write_transaction() as db:
+        db.execute("UPDATE prescriptions SET status = 'approved' WHERE id = 'RX-00'")
+    assert load_queue_item("IC-00")["prescription"]["status"] == "approved"
+
+
+def test_first_run_sets_membership_of_existing_checks(queue):
+    db = get_db()
+    for name in REVIEW_QUEUE_TRIGGERS:
+        db.execute(f"DROP TRIGGER {name}")
+    db.execute("UPDATE interaction_checks SET in_review_queue = 0")
+    apply_review_queue(db)
+    db.commit()
+    db.close()
+    assert queued_ids() == [f"IC-{i:02d}" for i in reversed(range(10))]
+
+
+def test_api_pages_report_the_queue_size(queue):
+    page = TestClient(api.app).get("/api/queue", params={"view": "summary", "limit": 4}).json()
+    assert (page["count"], page["total"]) == (4, 10)
+    assert page["next_cursor"] is not None
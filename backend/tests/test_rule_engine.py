@@ -0,0 +1,102 @@
+"""Local rule engine: which checks are resolved without the AI model, and how they route."""
+
+import pytest
+
+from src.knowledge_base import get_knowledge_base
+from src.masking import mask_patient_data
+from src.models import InteractionFound
+from src.router import route_prescription
+from src.rule_engine import resolve_locally
+
+SEVERITY_RANK = ["minor", "moderate", "severe", "critical"]
+
+
+def pair_with_highest_severity(severity: str) -> tuple[str, str]:
+    """A KB drug pair whose most severe rule has `severity`."""
+    highest: dict[frozenset, str] = {}
+    for rule in get_knowledge_base():
+        pair = frozenset((rule["drug_a"].lower(), rule["drug_b"].lower()))
+        highest[pair] = max(highest.get(pair, "minor"), rule["severity"], key=SEVERITY_RANK.index)
+    for rule in get_knowledge_base():
+        if highest[frozenset((rule["drug_a"].lower(), rule["drug_b"].lower()))] == severity:
+            return rule["drug_a"], rule["drug_b"]
+    raise LookupError(f"no {severity} pair in the knowledge base")
+
+
+def payload(new_drug: str, current: list[str] = (), allergies: list[str] = ()) -> dict:
+    patient = {
+        "id": "PAT-001",
+        "name": "Test Patient",
+        "date_of_birth": "1960-01-01",
+        "weight_kg": 70,
+        "allergies": list(allergies),
+        "medications": [
+            {"medication_name": name, "dosage": "10mg", "frequency": "daily"} for name in current
+        ],
+    }
+    prescription = {"medication_name": new_drug, "dosage": "5mg", "frequency": "daily", "prescriber": "Dr. Test"}
+    return mask_patient_data(patient, prescription, log_event=False)["masked"]
+
+
+@pytest.mark.parametrize("severity, risk_level, recommendation", [
+    ("critical", "critical", "reject"),
+    ("severe", "high", "pharmacist_review"),
+])
+@pytest.mark.parametrize("swap", [False, True], ids=["new drug is drug_a", "new drug is drug_b"])
+def test_exact_severe_or_critical_pair_is_resolved(severity, risk_level, recommendation, swap):
+    drug_a, drug_b = pair_with_highest_severity(severity)
+    if swap:
+        drug_a, drug_b = drug_b, drug_a
+
+    # Case and surrounding whitespace don't matter; allergies don't stop the match
+    result = resolve_locally(payload(f" {drug_a.upper()} ", [drug_b.lower(), "Vitamin D"], ["Penicillin"]))
+
+    assert result is not None
+    assert (result["engine"], result["risk_level"], result["recommendation"]) == ("rules", risk_level, recommendation)
+    assert result["confidence_score"] == 1.0
+    assert {frozenset((i["drug_a"].lower(), i["drug_b"].lower())) for i in result["interactions_found"]} == {
+        frozenset((drug_a.lower(), drug_b.lower()))
+    }
+    assert route_prescription(result) == "routed_to_pharmacist"
+
+
+def test_no_medications_and_no_allergies_is_low_risk():
+    result = resolve_locally(payload("Amoxicillin"))
+
+    assert result is not None
+    assert (result["engine"], result["risk_level"], result["recommendation"]) == ("rules", "low", "auto_approve")
+    assert result["interactions_found"] == []
+    assert route_prescription(result) == "auto_approved"
+
+
+@pytest.mark.parametrize("allergies", [["Penicillin"], ["Latex"], ["Some rare drug"]],
+                         ids=["drug class", "environmental", "other medication allergy"])
+def test_any_allergy_category_falls_through_to_the_model(allergies):
+    masked = payload("Amoxicillin", allergies=allergies)
+    assert masked["allergy_categories"]
+    assert resolve_locally(masked) is None
+
+
+@pytest.mark.parametrize("severity", ["moderate", "minor"])
+def test_milder_kb_pairs_fall_through_to_the_model(severity):
+    drug_a, drug_b = pair_with_highest_severity(severity)
+    assert resolve_locally(payload(drug_a, [drug_b])) is None
+
+
+def test_medications_without_a_kb_match_fall_through_to_the_model():
+    assert resolve_locally(payload("Notarealdrugol", ["Alsofakeamine"])) is None
+
+
+@pytest.mark.parametrize("new_drug, current", [
+    ("Amoxicillin", []),
+    (pair_with_highest_severity("critical")[0], [pair_with_highest_severity("critical")[1]]),
+], ids=["low risk", "kb match"])
+def test_result_has_the_check_result_shape(new_drug, current):
+    result = resolve_locally(payload(new_drug, current))
+
+    assert set(result) == {
+        "risk_level", "confidence_score", "interactions_found", "recommendation", "reasoning", "engine",
+    }
+    assert isinstance(result["reasoning"], str) and result["reasoning"]
+    for interaction in result["interactions_found"]:
+        InteractionFound(**interaction)
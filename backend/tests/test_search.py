@@ -0,0 +1,182 @@
+"""Review search: trigger-maintained FTS index, query quoting and source filter."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import seed
+from src.database import get_db, write_transaction
+from src import search
+from src.search import match_expression, search_reviews
+
+PRESCRIPTION_ID = "RX-TEST-001"
+
+
+@pytest.fixture
+def reviews(fresh_db):
+    seed.seed_patients()
+    with write_transaction() as db:
+        db.execute(
+            """INSERT INTO prescriptions (id, patient_id, medication_name, dosage, frequency, prescriber, status)
+            VALUES (?, 'PAT-001', 'Warfarin', '5mg', 'daily', 'Dr. Test', 'in_review')""",
+            (PRESCRIPTION_ID,),
+        )
+        add_feedback(db, "AUD-1", "Bleeding risk too high with aspirin")
+        add_feedback(db, "AUD-2", None)
+        add_reasoning(db, "IC-1", "Warfarin and aspirin together increase bleeding risk.")
+
+
+def add_feedback(db, audit_id: str, feedback: str | None):
+    db.execute(
+        """INSERT INTO audit_log (id, patient_id_masked, prescription_id, medication_name, final_status, pharmacist_feedback)
+        VALUES (?, 'PATIENT_001', ?, 'Warfarin', 'rejected', ?)""",
+        (audit_id, PRESCRIPTION_ID, feedback),
+    )
+
+
+def add_reasoning(db, check_id: str, reasoning: str):
+    db.execute(
+        """INSERT INTO interaction_checks (id, prescription_id, risk_level, confidence_score, interactions_found,
+            recommendation, reasoning, masked_payload, raw_payload, routing_decision)
+        VALUES (?, ?, 'high', 0.9, '[]', 'pharmacist_review', ?, '{}', '{}', 'pharmacist_review')""",
+        (check_id, PRESCRIPTION_ID, reasoning),
+    )
+
+
+def found(query: str, source: str | None = None) -> set[tuple[str, str]]:
+    hits, _ = search_reviews(query, source)
+    return {(hit["source"], hit["id"]) for hit in hits}
+
+
+def check_index_integrity():
+    db = get_db()
+    # FTS5 raises SQLITE_CORRUPT_VTAB if the index and its content table disagree
+    db.execute("INSERT INTO review_search (review_search, rank) VALUES ('integrity-check', 1)")
+    db.close()
+
+
+def test_inserted_rows_are_searchable(reviews):
+    assert found("bleeding") == {("feedback", "AUD-1"), ("reasoning", "IC-1")}
+    # Porter stemming
+    assert found("bleed") == {("feedback", "AUD-1"), ("reasoning", "IC-1")}
+    assert found("too high") == {("feedback", "AUD-1")}
+
+
+def test_updates_and_deletes_keep_the_index_in_step(reviews):
+    with write_transaction() as db:
+        db.execute("UPDATE audit_log SET pharmacist_feedback = 'Duplicate therapy' WHERE id = 'AUD-1'")
+        db.execute("UPDATE audit_log SET pharmacist_feedback = 'Renal dosing needed' WHERE id = 'AUD-2'")
+        db.execute("UPDATE interaction_checks SET reasoning = 'No interactions found.' WHERE id = 'IC-1'")
+
+    assert found("bleeding") == set()
+    assert found("duplicate") == {("feedback", "AUD-1")}
+    assert found("renal") == {("feedback", "AUD-2")}
+    assert found("interactions") == {("reasoning", "IC-1")}
+
+    with write_transaction() as db:
+        db.execute("UPDATE audit_log SET pharmacist_feedback = NULL WHERE id = 'AUD-1'")
+        db.execute("DELETE FROM audit_log WHERE id = 'AUD-2'")
+        db.execute("DELETE FROM interaction_checks WHERE id = 'IC-1'")
+
+    assert found("duplicate") == found("renal") == found("interactions") == set()
+    db = get_db()
+    assert db.execute("SELECT COUNT(*) FROM review_search_docs").fetchone()[0] == 0
+    db.close()
+    check_index_integrity()
+
+
+def test_unrelated_updates_leave_the_document_alone(reviews):
+    db = get_db()
+    before = db.execute("SELECT id FROM review_search_docs WHERE source_id = 'AUD-1'").fetchone()[0]
+    db.close()
+    with write_transaction() as db:
+        db.execute("UPDATE audit_log SET final_status = 'approved' WHERE id = 'AUD-1'")
+    db = get_db()
+    after = db.execute("SELECT id FROM review_search_docs WHERE source_id = 'AUD-1'").fetchone()[0]
+    db.close()
+    assert before == after
+
+
+def test_rolled_back_writes_leave_no_documents(reviews):
+    with pytest.raises(RuntimeError):
+        with write_transaction() as db:
+            add_feedback(db, "AUD-3", "Contraindicated in pregnancy")
+            raise RuntimeError("rolled back")
+    assert found("pregnancy") == set()
+    check_index_integrity()
+
+
+def test_source_filter(reviews):
+    assert found("aspirin", "feedback") == {("feedback", "AUD-1")}
+    assert found("aspirin", "reasoning") == {("reasoning", "IC-1")}
+    # Every term has to be in the one source's text
+    assert found("warfarin bleeding", "feedback") == set()
+
+
+def test_hits_carry_context_and_snippet(reviews):
+    [hit], truncated = search_reviews("aspirin", "reasoning")
+    assert not truncated
+    assert (hit["prescription_id"], hit["medication_name"], hit["risk_level"]) == (PRESCRIPTION_ID, "Warfarin", "high")
+    assert "**aspirin**" in hit["snippet"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("bleeding", '"bleeding"'),
+    ("  warfarin   aspirin ", '"warfarin" "aspirin"'),
+    ('say "no"', '"say" """no"""'),
+    ("bleed*", '"bleed"*'),
+    ("a OR b NOT c", '"a" "OR" "b" "NOT" "c"'),
+    ("col:value (x) ^y -z", '"col:value" "(x)" "^y" "-z"'),
+])
+def test_match_expression_quotes_every_term(query, expected):
+    assert match_expression(query) == expected
+
+
+def test_match_expression_source_filter():
+    assert match_expression("bleed*", "feedback") == '{feedback} : ("bleed"*)'
+
+
+@pytest.mark.parametrize("query, source", [("", None), ("  * ** ", None), ("bleeding", "notes")])
+def test_match_expression_rejects_bad_input(query, source):
+    with pytest.raises(ValueError):
+        match_expression(query, source)
+
+
+def test_operators_in_queries_are_searched_literally(reviews):
+    assert found("aspirin OR renal") == set()
+    assert found('NEAR(aspirin "risk")') == set()
+    assert found("bleed* aspirin") == {("feedback", "AUD-1"), ("reasoning", "IC-1")}
+
+
+def test_api_rejects_bad_queries(reviews):
+    client = TestClient(api.app)
+    assert client.get("/api/search", params={"q": "aspirin", "source": "feedback"}).status_code == 200
+    assert client.get("/api/search", params={"q": "  "}).status_code == 400
+    assert client.get("/api/search", params={"q": "aspirin", "source": "notes"}).status_code == 422
+
+
+@pytest.mark.parametrize("window, truncated", [(0, False), (3, True), (4, False)])
+def test_rank_window_flags_truncated_results(fresh_db, monkeypatch, window, truncated):
+    # The best match is the oldest, then three newer, weaker ones
+    for audit_id, feedback in [
+        ("AUD-OLD", "Aspirin aspirin aspirin"),
+        *((f"AUD-{i}", f"Switched from aspirin after a long discussion about option {i}") for i in range(3)),
+    ]:
+        with write_transaction() as db:
+            add_feedback(db, audit_id, feedback)
+    monkeypatch.setattr(search, "SEARCH_RANK_WINDOW", window)
+
+    hits, was_truncated = search_reviews("aspirin")
+
+    assert was_truncated is truncated
+    assert ("AUD-OLD" in {hit["id"] for hit in hits}) is not truncated
+    assert len(hits) == (3 if truncated else 4)
+    if not truncated:
+        assert hits[0]["id"] == "AUD-OLD"
+
+
+def test_api_reports_truncation(reviews, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_RANK_WINDOW", 1)
+    client = TestClient(api.app)
+    assert client.get("/api/search", params={"q": "aspirin"}).json()["truncated"] is True
+    assert client.get("/api/search", params={"q": "too high"}).json()["truncated"] is False
@@ -36,6 +36,8 @@ export function AuditLog() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [page, setPage] = useState(0);
+  // cursors[i] fetches page i; page 0 needs none
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined]);
   const [riskFilter, setRiskFilter] = useState<string>("all");
   const [statusFilter, setStatusFilter] = useState<string>("all");
 
@@ -46,19 +48,27 @@ export function AuditLog() {
       risk_level: riskFilter === "all" ? undefined : riskFilter,
       status: statusFilter === "all" ? undefined : statusFilter,
       limit: PAGE_SIZE,
-      offset: page * PAGE_SIZE,
+      cursor: cursors[page],
     })
       .then((data) => {
         setEntries(data.entries);
         setTotal(data.total);
+        setCursors((prev) => {
+          const next = prev.slice(0, page + 1);
+          if (data.next_cursor) next.push(data.next_cursor);
+          return next;
+        });
       })
       .catch((err) => setError(err instanceof Error ? err.message : "Failed to load audit log"))
       .finally(() => setLoading(false));
+    // cursors is extended by this effect; re-running on it would refetch
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [page, riskFilter, statusFilter]);
 
   // Reset page when filters change
   useEffect(() => {
     setPage(0);
+    setCursors([undefined]);
   }, [riskFilter, statusFilter]);
 
   const totalPages = Math.ceil(total / PAGE_SIZE);
@@ -211,7 +221,7 @@ export function AuditLog() {
             <Button
               variant="outline"
               size="sm"
-              disabled={page >= totalPages - 1}
+              disabled={page + 1 >= cursors.length}
               onClick={() => setPage(page + 1)}
             >
               <ChevronRight className="h-4 w-4" />
@@ -1,15 +1,28 @@
 import { Badge } from "@/components/ui/badge";
+import { Button } from "@/components/ui/button";
 import { RiskBadge } from "./RiskBadge";
-import { Clock } from "lucide-react";
-import type { QueueItem } from "@/types";
+import { Clock, Loader2 } from "lucide-react";
+import type { QueueItemSummary } from "@/types";
 
 interface ReviewQueueProps {
-  items: QueueItem[];
+  items: QueueItemSummary[];
+  total: number;
   selectedId: string | null;
   onSelect: (checkId: string) => void;
+  hasMore: boolean;
+  loadingMore: boolean;
+  onLoadMore: () => void;
 }
 
-export function ReviewQueue({ items, selectedId, onSelect }: ReviewQueueProps) {
+export function ReviewQueue({
+  items,
+  total,
+  selectedId,
+  onSelect,
+  hasMore,
+  loadingMore,
+  onLoadMore,
+}: ReviewQueueProps) {
   if (items.length === 0) {
     return (
       <div className="rounded-lg border border-dashed p-8 text-center">
@@ -25,14 +38,14 @@ export function ReviewQueue({ items, selectedId, onSelect }: ReviewQueueProps) {
     <div className="space-y-2">
       <div className="flex items-center gap-2 mb-3">
         <h3 className="font-medium text-sm">Pending Reviews</h3>
-        <Badge variant="secondary">{items.length}</Badge>
+        <Badge variant="secondary">{total}</Badge>
       </div>
       {items.map((item) => {
-        const isSelected = item.interaction_check.id === selectedId;
+        const isSelected = item.check_id === selectedId;
         return (
           <button
-            key={item.interaction_check.id}
-            onClick={() => onSelect(item.interaction_check.id)}
+            key={item.check_id}
+            onClick={() => onSelect(item.check_id)}
             className={`w-full text-left rounded-lg border p-3 transition-colors ${
               isSelected
                 ? "border-primary bg-primary/5"
@@ -42,24 +55,36 @@ export function ReviewQueue({ items, selectedId, onSelect }: ReviewQueueProps) {
             <div className="flex items-center justify-between">
               <div>
                 <span className="font-medium text-sm">
-                  {item.prescription.medication_name}{" "}
-                  {item.prescription.dosage}
+                  {item.medication_name}{" "}
+                  {item.dosage}
                 </span>
                 <p className="text-xs text-muted-foreground mt-0.5">
-                  {item.patient.name}
+                  {item.patient_name}
                 </p>
               </div>
               <div className="flex items-center gap-2">
-                <RiskBadge level={item.interaction_check.risk_level} size="sm" />
+                <RiskBadge level={item.risk_level} size="sm" />
               </div>
             </div>
             <div className="flex items-center gap-1 mt-1 text-xs text-muted-foreground">
               <Clock className="h-3 w-3" />
-              {new Date(item.interaction_check.created_at).toLocaleString()}
+              {new Date(item.created_at).toLocaleString()}
             </div>
           </button>
         );
       })}
+      {hasMore && (
+        <Button
+          variant="outline"
+          size="sm"
+          className="w-full"
+          disabled={loadingMore}
+          onClick={onLoadMore}
+        >
+          {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+          Load more ({items.length} of {total})
+        </Button>
+      )}
     </div>
   );
 }
@@ -6,10 +6,15 @@ import type {
   MaskingComparison,
   InteractionCheckResult,
   QueueItem,
+  QueueItemSummary,
   ReviewCreate,
   AuditEntry,
+  ReviewSearchResponse,
+  SearchSource,
   AnalyticsSummary,
+  AnalyticsTimeseries,
   ThresholdSimulationResponse,
+  ThresholdSweepResponse,
   CostROIResponse,
 } from "@/types";
 
@@ -58,11 +63,15 @@ export async function runInteractionCheck(
   });
 }
 
-export async function getReviewQueue(): Promise<{
-  items: QueueItem[];
+export async function getReviewQueue(cursor?: string): Promise<{
+  items: QueueItemSummary[];
   count: number;
+  total: number;
+  next_cursor: string | null;
 }> {
-  return fetchJson("/queue");
+  const searchParams = new URLSearchParams({ view: "summary" });
+  if (cursor) searchParams.set("cursor", cursor);
+  return fetchJson(`/queue?${searchParams}`);
 }
 
 export async function getQueueItem(checkId: string): Promise<QueueItem> {
@@ -83,29 +92,84 @@ export async function getAuditLog(params?: {
   risk_level?: string;
   status?: string;
   limit?: number;
-  offset?: number;
-}): Promise<{ entries: AuditEntry[]; total: number }> {
+  cursor?: string;
+}): Promise<{ entries: AuditEntry[]; total: number; next_cursor: string | null }> {
   const searchParams = new URLSearchParams();
   if (params?.risk_level) searchParams.set("risk_level", params.risk_level);
   if (params?.status) searchParams.set("status", params.status);
   if (params?.limit) searchParams.set("limit", String(params.limit));
-  if (params?.offset) searchParams.set("offset", String(params.offset));
+  if (params?.cursor) searchParams.set("cursor", params.cursor);
   const qs = searchParams.toString();
   return fetchJson(`/audit${qs ? `?${qs}` : ""}`);
 }
 
-export function getAuditExportUrl(): string {
-  return `${BASE}/audit/export`;
+export function getAuditExportUrl(options?: {
+  format?: "csv" | "parquet" | "arrow";
+  gzip?: boolean;
+  start?: string;
+  end?: string;
+  riskLevel?: string;
+  status?: string;
+  medication?: string;
+}): string {
+  const searchParams = new URLSearchParams();
+  if (options?.format) searchParams.set("format", options.format);
+  if (options?.gzip) searchParams.set("gzip", "true");
+  if (options?.start) searchParams.set("start", options.start);
+  if (options?.end) searchParams.set("end", options.end);
+  if (options?.riskLevel) searchParams.set("risk_level", options.riskLevel);
+  if (options?.status) searchParams.set("status", options.status);
+  if (options?.medication) searchParams.set("medication", options.medication);
+  const qs = searchParams.toString();
+  return `${BASE}/audit/export${qs ? `?${qs}` : ""}`;
+}
+
+export async function searchReviews(
+  q: string,
+  params?: { source?: SearchSource; limit?: number }
+): Promise<ReviewSearchResponse> {
+  const searchParams = new URLSearchParams({ q });
+  if (params?.source) searchParams.set("source", params.source);
+  if (params?.limit) searchParams.set("limit", String(params.limit));
+  return fetchJson(`/search?${searchParams}`);
 }
 
 export async function getAnalyticsSummary(): Promise<AnalyticsSummary> {
   return fetchJson("/analytics/summary");
 }
 
+export async function getAnalyticsTimeseries(params: {
+  granularity?: "hour" | "day";
+  start?: string;
+  end?: string;
+} = {}): Promise<AnalyticsTimeseries> {
+  const query = new URLSearchParams({ granularity: params.granularity ?? "day" });
+  if (params.start) query.set("start", params.start);
+  if (params.end) query.set("end", params.end);
+  return fetchJson(`/analytics/timeseries?${query}`);
+}
+
 export async function getThresholdSimulation(): Promise<ThresholdSimulationResponse> {
   return fetchJson("/analytics/threshold-simulation");
 }
 
+export async function getThresholdSweep(params: {
+  start: number;
+  stop: number;
+  step: number;
+  maxRiskLevels?: string[];
+  requireAiApproval?: boolean[];
+}): Promise<ThresholdSweepResponse> {
+  const query = new URLSearchParams({
+    start: String(params.start),
+    stop: String(params.stop),
+    step: String(params.step),
+  });
+  params.maxRiskLevels?.forEach((level) => query.append("max_risk_level", level));
+  params.requireAiApproval?.forEach((gate) => query.append("require_ai_approval", String(gate)));
+  return fetchJson(`/analytics/threshold-sweep?${query}`);
+}
+
 export async function getCostROI(): Promise<CostROIResponse> {
   return fetchJson("/analytics/cost-roi");
 }
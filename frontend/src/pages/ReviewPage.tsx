@@ -1,40 +1,78 @@
-import { useEffect, useState, useCallback } from "react";
+import { useEffect, useState } from "react";
 import { ReviewQueue } from "@/components/review/ReviewQueue";
 import { ReviewCard } from "@/components/review/ReviewCard";
-import { getReviewQueue, submitReview } from "@/lib/api";
+import { getQueueItem, getReviewQueue, submitReview } from "@/lib/api";
 import { Loader2, Shield } from "lucide-react";
-import type { QueueItem } from "@/types";
+import type { QueueItem, QueueItemSummary } from "@/types";
 
 export function ReviewPage() {
-  const [queue, setQueue] = useState<QueueItem[]>([]);
+  const [queue, setQueue] = useState<QueueItemSummary[]>([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedId, setSelectedId] = useState<string | null>(null);
+  const [selectedItem, setSelectedItem] = useState<QueueItem | null>(null);
+  const [detailLoading, setDetailLoading] = useState(false);
   const [reviewLoading, setReviewLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [successMessage, setSuccessMessage] = useState<string | null>(null);
 
-  const loadQueue = useCallback(async () => {
+  // Pages are summaries; cursor continues after the items already listed
+  async function loadPage(cursor?: string) {
     try {
-      const data = await getReviewQueue();
-      setQueue(data.items);
+      const data = await getReviewQueue(cursor);
+      setQueue((prev) => {
+        if (!cursor) return data.items;
+        const listed = new Set(prev.map((item) => item.check_id));
+        return [...prev, ...data.items.filter((item) => !listed.has(item.check_id))];
+      });
+      setTotal(data.total);
+      setNextCursor(data.next_cursor);
       // Auto-select first item if nothing selected
-      if (data.items.length > 0 && !selectedId) {
-        setSelectedId(data.items[0].interaction_check.id);
+      if (data.items.length > 0) {
+        setSelectedId((current) => current ?? data.items[0].check_id);
       }
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load queue");
-    } finally {
-      setLoading(false);
     }
-  }, [selectedId]);
+  }
+
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await loadPage(nextCursor);
+    setLoadingMore(false);
+  }
 
   useEffect(() => {
-    loadQueue();
-  }, [loadQueue]);
+    loadPage().finally(() => setLoading(false));
+    // First page on mount only; loadMore() fetches the rest
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
 
-  const selectedItem = queue.find(
-    (item) => item.interaction_check.id === selectedId
-  );
+  // Full detail (patient, medications, AI analysis) only for the selected item
+  useEffect(() => {
+    if (!selectedId) {
+      setSelectedItem(null);
+      return;
+    }
+    let cancelled = false;
+    setDetailLoading(true);
+    getQueueItem(selectedId)
+      .then((item) => {
+        if (!cancelled) setSelectedItem(item);
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err instanceof Error ? err.message : "Failed to load review");
+      })
+      .finally(() => {
+        if (!cancelled) setDetailLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedId]);
 
   async function handleReview(
     checkId: string,
@@ -56,14 +94,14 @@ export function ReviewPage() {
       );
 
       // Remove from queue and select next item
-      const remaining = queue.filter(
-        (item) => item.interaction_check.id !== checkId
-      );
+      const remaining = queue.filter((item) => item.check_id !== checkId);
       setQueue(remaining);
+      setTotal((count) => Math.max(count - 1, 0));
       if (remaining.length > 0) {
-        setSelectedId(remaining[0].interaction_check.id);
+        setSelectedId(remaining[0].check_id);
       } else {
         setSelectedId(null);
+        await loadMore();
       }
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to submit review");
@@ -110,14 +148,22 @@ export function ReviewPage() {
         <div>
           <ReviewQueue
             items={queue}
+            total={total}
             selectedId={selectedId}
             onSelect={setSelectedId}
+            hasMore={nextCursor !== null}
+            loadingMore={loadingMore}
+            onLoadMore={loadMore}
           />
         </div>
 
         {/* Selected review */}
         <div>
-          {selectedItem ? (
+          {detailLoading ? (
+            <div className="flex items-center justify-center py-12">
+              <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+            </div>
+          ) : selectedItem ? (
             <ReviewCard
               item={selectedItem}
               onReview={handleReview}
@@ -83,6 +83,7 @@ export interface InteractionCheckResult {
   recommendation: "auto_approve" | "pharmacist_review" | "reject";
   reasoning: string;
   routing_decision: "auto_approved" | "routed_to_pharmacist";
+  engine: "rules" | "cache" | "llm";
   masked_payload: MaskedPayload;
   raw_payload: RawPayload;
   created_at: string;
@@ -112,6 +113,20 @@ export interface QueueItem {
   review: PharmacistReview | null;
 }
 
+export interface QueueItemSummary {
+  check_id: string;
+  prescription_id: string;
+  patient_id: string;
+  patient_name: string;
+  medication_name: string;
+  dosage: string;
+  risk_level: InteractionCheckResult["risk_level"];
+  confidence_score: number;
+  recommendation: InteractionCheckResult["recommendation"];
+  engine: InteractionCheckResult["engine"];
+  created_at: string;
+}
+
 export interface AuditEntry {
   id: string;
   timestamp: string;
@@ -128,6 +143,27 @@ export interface AuditEntry {
   final_status: string;
 }
 
+export type SearchSource = "feedback" | "reasoning";
+
+export interface ReviewSearchHit {
+  source: SearchSource;
+  id: string;
+  prescription_id: string | null;
+  medication_name: string | null;
+  risk_level: string | null;
+  pharmacist_decision: string | null;
+  timestamp: string | null;
+  snippet: string;
+  score: number;
+}
+
+export interface ReviewSearchResponse {
+  query: string;
+  source: SearchSource | null;
+  hits: ReviewSearchHit[];
+  truncated: boolean;
+}
+
 export interface AnalyticsSummary {
   total_prescriptions: number;
   auto_approved_count: number;
@@ -139,6 +175,21 @@ export interface AnalyticsSummary {
   risk_distribution: Record<string, number>;
 }
 
+export interface AnalyticsTimeseries {
+  granularity: "hour" | "day";
+  start: string;
+  end: string;
+  buckets: string[];
+  total_prescriptions: number[];
+  auto_approved_count: number[];
+  pharmacist_reviewed_count: number[];
+  auto_approve_rate: number[];
+  override_rate: number[];
+  average_confidence: (number | null)[];
+  average_time_to_decision_seconds: (number | null)[];
+  risk_distribution: Record<string, number[]>;
+}
+
 export interface ThresholdSimulationResult {
   threshold: number;
   auto_approved_count: number;
@@ -153,6 +204,24 @@ export interface ThresholdSimulationResponse {
   simulations: ThresholdSimulationResult[];
 }
 
+export interface ThresholdSweepCell {
+  max_risk_level: "low" | "medium" | "high" | "critical";
+  require_ai_approval: boolean;
+  auto_approved_count: number[];
+  routed_to_pharmacist_count: number[];
+  estimated_false_negatives: number[];
+  false_negative_rate: number[];
+  pharmacist_hours_per_day: number[];
+}
+
+export interface ThresholdSweepResponse {
+  current_threshold: number;
+  current_max_risk_level: "low" | "medium" | "high" | "critical";
+  total_records: number;
+  thresholds: number[];
+  cells: ThresholdSweepCell[];
+}
+
 export interface CostBreakdown {
   model_name: string;
   input_price_per_million: number;
@@ -199,9 +268,26 @@ export interface DataSources {
   historical_record_count: number;
 }
 
+export interface PromptCacheCost {
+  cached_prefix_tokens: number;
+  uncached_input_tokens_per_check: number;
+  cache_write_price_per_million: number;
+  cache_read_price_per_million: number;
+  cost_per_check_without_caching: number;
+  cost_per_check_cache_miss: number;
+  cost_per_check_cache_hit: number;
+  live_cache_hits: number;
+  live_cache_misses: number;
+  live_cache_hit_rate: number;
+  live_cache_hit_spend: number;
+  live_cache_miss_spend: number;
+  live_savings_vs_uncached: number;
+}
+
 export interface CostROIResponse {
   cost_breakdown: CostBreakdown;
   roi_analysis: ROIAnalysis;
   projections: CostProjection[];
   data_sources: DataSources;
+  prompt_cache: PromptCacheCost;
 }